@@ -5,10 +5,12 @@ Generates persons.jsonl, person_xref.parquet, person_aliases.parquet, party_regi
 import csv
 import json
 import os
+import random
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import pandas as pd
 
@@ -19,70 +21,183 @@ from identities.utils import (
     normalize_name, split_name, slugify, 
     generate_person_id, generate_party_id
 )
+from identities.registry_snapshot import RegistrySnapshot, XREF_COLUMNS, ALIAS_COLUMNS
+
+# Testi di esempio conservati per nome nell'inbox (reservoir), oltre al primo
+INBOX_SAMPLE_SIZE = 5
+
+# Il journal dell'inbox viene compattato oltre questo numero di righe per voce
+INBOX_COMPACT_FACTOR = 4
+
+
+def _atomic_write(path: Path, write: Callable[[Path], None]):
+    """
+    Write a file atomically: write() fills a temporary file that replaces path.
+    
+    Args:
+        path: Destination file
+        write: Function writing the content to the given temporary path
+    """
+    temp_file = path.parent / f".tmp_{path.name}"
+    try:
+        write(temp_file)
+        os.replace(temp_file, path)
+    except Exception:
+        # Clean up temp file if it exists
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
+
+
+def _write_jsonl(path: Path, records: List[Dict]):
+    """Write records as JSON lines."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            json.dump(record, f, ensure_ascii=False)
+            f.write('\n')
 
 
 class RegistryBuilder:
     """Builds and maintains the persons registry."""
     
-    def __init__(self, data_dir: str = "public/data"):
-        # Use absolute path to avoid relative path issues
-        self.data_dir = Path(__file__).parent.parent / data_dir
+    def __init__(self, data_dir: str = "public/data", snapshot: Optional[RegistrySnapshot] = None):
+        """
+        Args:
+            data_dir: Registry directory, relative to the repository root
+            snapshot: Registry tables shared with other readers (e.g. the
+                IdentityMatcher); data_dir is ignored when given
+        """
+        if snapshot is None:
+            # Use absolute path to avoid relative path issues
+            snapshot = RegistrySnapshot(Path(__file__).parent.parent / data_dir)
+        self.snapshot = snapshot
+        self.data_dir = snapshot.data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # File paths
-        self.persons_file = self.data_dir / "persons.jsonl"
-        self.xref_file = self.data_dir / "person_xref.parquet"
-        self.aliases_file = self.data_dir / "person_aliases.parquet"
-        self.parties_file = self.data_dir / "party_registry.jsonl"
-        self.inbox_file = self.data_dir / "identities_inbox.jsonl"
-        
-        # Load existing data
-        self.persons = self._load_persons()
-        self.xref = self._load_xref()
-        self.aliases = self._load_aliases()
-        self.parties = self._load_parties()
-        self.inbox = self._load_inbox()
+        self.persons_file = snapshot.persons_file
+        self.xref_file = snapshot.xref_file
+        self.aliases_file = snapshot.aliases_file
+        self.parties_file = snapshot.parties_file
+        self.inbox_file = snapshot.inbox_file
+        self.inbox_journal_file = snapshot.inbox_journal_file
         
-        # Counters for new IDs
-        self.next_person_id = self._get_next_person_id()
-        self.next_party_id = self._get_next_party_id()
-    
-    def _load_persons(self) -> List[Dict]:
-        """Load existing persons from JSONL."""
-        if self.persons_file.exists():
-            with open(self.persons_file, 'r', encoding='utf-8') as f:
-                return [json.loads(line) for line in f if line.strip()]
-        return []
-    
-    def _load_xref(self) -> pd.DataFrame:
-        """Load existing crosswalk from Parquet."""
-        if self.xref_file.exists():
-            return pd.read_parquet(self.xref_file)
-        return pd.DataFrame(columns=[
-            'person_id', 'source', 'source_id', 'url', 'first_seen', 'last_seen'
-        ])
-    
-    def _load_aliases(self) -> pd.DataFrame:
-        """Load existing aliases from Parquet."""
-        if self.aliases_file.exists():
-            return pd.read_parquet(self.aliases_file)
-        return pd.DataFrame(columns=[
-            'person_id', 'alias', 'from', 'to', 'confidence'
-        ])
-    
-    def _load_parties(self) -> List[Dict]:
-        """Load existing parties from JSONL."""
-        if self.parties_file.exists():
-            with open(self.parties_file, 'r', encoding='utf-8') as f:
-                return [json.loads(line) for line in f if line.strip()]
-        return []
-    
-    def _load_inbox(self) -> List[Dict]:
-        """Load existing inbox from JSONL."""
-        if self.inbox_file.exists():
-            with open(self.inbox_file, 'r', encoding='utf-8') as f:
-                return [json.loads(line) for line in f if line.strip()]
-        return []
+        # Tables are read from the snapshot on first use. Crosswalk and aliases
+        # are kept as row lists with keyed indexes; DataFrames are built only
+        # when read or saved
+        self._xref_rows: Optional[List[Dict]] = None
+        self._alias_rows: Optional[List[Dict]] = None
+        # Inbox entries changed since the last save, appended to the journal on save
+        self._inbox_dirty: Dict[str, Dict] = {}
+        self._inbox_rewrite = False
+        # Artifacts changed since the last save ('persons', 'xref', 'aliases', 'parties')
+        self._dirty = set()
+    
+    @property
+    def persons(self) -> List[Dict]:
+        """Persons of the registry (shared with the snapshot)."""
+        return self.snapshot.persons
+    
+    @property
+    def parties(self) -> List[Dict]:
+        """Parties of the registry (shared with the snapshot)."""
+        return self.snapshot.parties
+    
+    @property
+    def inbox(self) -> List[Dict]:
+        """Inbox entries (shared with the snapshot)."""
+        return self.snapshot.inbox
+    
+    @property
+    def xref(self) -> pd.DataFrame:
+        """Crosswalk as a DataFrame (materialized from the row list)."""
+        if self._xref_rows is None:
+            self.xref = self.snapshot.xref
+        if self._xref_frame is None:
+            self._xref_frame = self._materialize(self._xref_rows, self._xref_base)
+        return self._xref_frame
+    
+    @xref.setter
+    def xref(self, frame: pd.DataFrame):
+        self._xref_base = frame.iloc[0:0]
+        self._xref_rows = frame.to_dict('records')
+        # (person_id, source, source_id) -> row
+        self._xref_index: Dict[Tuple, Dict] = {
+            (row['person_id'], row['source'], row['source_id']): row for row in self._xref_rows
+        }
+        self._xref_frame = frame
+    
+    @property
+    def aliases(self) -> pd.DataFrame:
+        """Aliases as a DataFrame (materialized from the row list)."""
+        if self._alias_rows is None:
+            self.aliases = self.snapshot.aliases
+        if self._aliases_frame is None:
+            self._aliases_frame = self._materialize(self._alias_rows, self._aliases_base)
+        return self._aliases_frame
+    
+    @aliases.setter
+    def aliases(self, frame: pd.DataFrame):
+        self._aliases_base = frame.iloc[0:0]
+        self._alias_rows = frame.to_dict('records')
+        # (person_id, alias) pairs already present
+        self._alias_keys = {(row['person_id'], row['alias']) for row in self._alias_rows}
+        self._aliases_frame = frame
+    
+    @staticmethod
+    def _materialize(rows: List[Dict], base: pd.DataFrame) -> pd.DataFrame:
+        """Build a DataFrame from rows with the columns of base."""
+        if not rows:
+            return base.copy()
+        return pd.DataFrame(rows, columns=list(base.columns))
+    
+    @cached_property
+    def _persons_by_slug(self) -> Dict[str, List[Dict]]:
+        """slug -> persons, in registry order."""
+        index: Dict[str, List[Dict]] = {}
+        for person in self.persons:
+            index.setdefault(person['slug'], []).append(person)
+        return index
+    
+    @cached_property
+    def _persons_by_name(self) -> Dict[Tuple[str, str], Dict]:
+        """(nome, cognome) -> first person with that name."""
+        index: Dict[Tuple[str, str], Dict] = {}
+        for person in self.persons:
+            index.setdefault((person['nome'], person['cognome']), person)
+        return index
+    
+    @cached_property
+    def _party_ids(self) -> Set[str]:
+        """IDs of the registered parties."""
+        return {p['party_id'] for p in self.parties}
+    
+    @cached_property
+    def _inbox_index(self) -> Dict[str, Dict]:
+        """norm_name -> inbox entry."""
+        return {item['norm_name']: item for item in self.inbox}
+    
+    def _index_persons(self):
+        """Rebuild the slug and name indexes over self.persons."""
+        self.__dict__.pop('_persons_by_slug', None)
+        self.__dict__.pop('_persons_by_name', None)
+    
+    def _register_person(self, person: Dict):
+        """Add a person (already in self.persons) to the indexes, if built."""
+        if '_persons_by_slug' not in self.__dict__:
+            return
+        self._persons_by_slug.setdefault(person['slug'], []).append(person)
+        self._persons_by_name.setdefault((person['nome'], person['cognome']), person)
+    
+    @cached_property
+    def next_person_id(self) -> int:
+        """Next available person ID counter."""
+        return self._get_next_person_id()
+    
+    @cached_property
+    def next_party_id(self) -> int:
+        """Next available party ID counter."""
+        return self._get_next_party_id()
     
     def _get_next_person_id(self) -> int:
         """Get next available person ID counter."""
@@ -102,18 +217,14 @@ class RegistryBuilder:
     
     def _find_person_by_slug_dob(self, slug: str, dob: Optional[str]) -> Optional[Dict]:
         """Find person by slug and DOB (if available)."""
-        for person in self.persons:
-            if person['slug'] == slug:
-                if dob is None or person.get('dob') == dob:
-                    return person
+        for person in self._persons_by_slug.get(slug, ()):
+            if dob is None or person.get('dob') == dob:
+                return person
         return None
     
     def _find_person_by_name(self, nome: str, cognome: str) -> Optional[Dict]:
         """Find person by exact name match."""
-        for person in self.persons:
-            if person['nome'] == nome and person['cognome'] == cognome:
-                return person
-        return None
+        return self._persons_by_name.get((nome, cognome))
     
     def build_from_seeds(self, force_rebuild: bool = False):
         """Build registry from seed CSV files."""
@@ -123,13 +234,15 @@ class RegistryBuilder:
             print("Force rebuild: clearing existing data...")
             self.persons.clear()
             self.parties.clear()
-            self.xref = pd.DataFrame(columns=[
-                'person_id', 'source', 'source_id', 'url', 'first_seen', 'last_seen'
-            ])
-            self.aliases = pd.DataFrame(columns=[
-                'person_id', 'alias', 'from', 'to', 'confidence'
-            ])
+            self.xref = pd.DataFrame(columns=XREF_COLUMNS)
+            self.aliases = pd.DataFrame(columns=ALIAS_COLUMNS)
             self.inbox.clear()
+            self._dirty.update(('persons', 'xref', 'aliases', 'parties'))
+            self._inbox_index.clear()
+            self._inbox_dirty.clear()
+            self._inbox_rewrite = True
+            self._index_persons()
+            self._party_ids.clear()
         
         # Build parties first
         self._build_parties_from_seed()
@@ -164,16 +277,19 @@ class RegistryBuilder:
                 }
                 
                 # Check if party already exists
-                if not any(p['party_id'] == party['party_id'] for p in self.parties):
+                if party['party_id'] not in self._party_ids:
                     self.parties.append(party)
+                    self._dirty.add('parties')
+                    self._party_ids.add(party['party_id'])
                     print(f"Added party: {party['name']} ({party['acronym']})")
     
-    def _build_persons_from_seed(self):
-        """Build persons registry from seed CSV."""
+    def _build_persons_from_seed(self, seed_file: Optional[Path] = None):
+        """Build persons registry from seed CSV (default: the bundled seeds)."""
         # Try real persons first, fallback to sample
-        seed_file = Path(__file__).parent / "seeds" / "persons_real.csv"
-        if not seed_file.exists():
-            seed_file = Path(__file__).parent / "seeds" / "persons_sample.csv"
+        if seed_file is None:
+            seed_file = Path(__file__).parent / "seeds" / "persons_real.csv"
+            if not seed_file.exists():
+                seed_file = Path(__file__).parent / "seeds" / "persons_sample.csv"
         
         if not seed_file.exists():
             print(f"Warning: {seed_file} not found, skipping persons")
@@ -201,6 +317,8 @@ class RegistryBuilder:
                 }
                 
                 self.persons.append(person)
+                self._dirty.add('persons')
+                self._register_person(person)
                 
                 # Add crosswalk
                 self._add_xref(
@@ -222,109 +340,177 @@ class RegistryBuilder:
         """Add or update crosswalk entry."""
         now = datetime.now(timezone.utc)
         
+        if self._xref_rows is None:
+            self.xref = self.snapshot.xref
+        
         # Check if xref already exists
-        mask = (self.xref['person_id'] == person_id) & (self.xref['source'] == source) & (self.xref['source_id'] == source_id)
+        existing = self._xref_index.get((person_id, source, source_id))
         
-        if mask.any():
+        if existing is not None:
             # Update last_seen
-            self.xref.loc[mask, 'last_seen'] = now
+            existing['last_seen'] = now
         else:
             # Add new xref
-            new_xref = pd.DataFrame([{
+            row = {
                 'person_id': person_id,
                 'source': source,
                 'source_id': source_id,
                 'url': url,
                 'first_seen': now,
                 'last_seen': now
-            }])
-            self.xref = pd.concat([self.xref, new_xref], ignore_index=True)
+            }
+            self._xref_rows.append(row)
+            self._xref_index[(person_id, source, source_id)] = row
+        self._xref_frame = None
+        self._dirty.add('xref')
     
     def _add_alias(self, person_id: str, alias: str, confidence: float):
         """Add alias for person."""
         now = datetime.now(timezone.utc)
         
-        # Check if alias already exists
-        mask = (self.aliases['person_id'] == person_id) & (self.aliases['alias'] == alias)
+        if self._alias_rows is None:
+            self.aliases = self.snapshot.aliases
         
-        if not mask.any():
-            new_alias = pd.DataFrame([{
+        # Check if alias already exists
+        if (person_id, alias) not in self._alias_keys:
+            self._alias_rows.append({
                 'person_id': person_id,
                 'alias': alias,
                 'from': now,
                 'to': None,
                 'confidence': confidence
-            }])
-            self.aliases = pd.concat([self.aliases, new_alias], ignore_index=True)
+            })
+            self._alias_keys.add((person_id, alias))
+            self._aliases_frame = None
+            self._dirty.add('aliases')
     
-    def add_to_inbox(self, raw_name: str, norm_name: str, sample_text: str, source_url: str):
-        """Add unmatched name to inbox."""
+    def add_to_inbox(self, raw_name: str, norm_name: str, sample_text: str, source_url: str,
+                     more_samples: Optional[List[str]] = None):
+        """
+        Add unmatched name to inbox.
+        
+        Each name keeps a hit counter, its first sample text and a uniform
+        reservoir of at most INBOX_SAMPLE_SIZE further distinct samples.
+        
+        Args:
+            raw_name: Name as found in the source
+            norm_name: Normalized name (inbox key)
+            sample_text: Text of the occurrence
+            source_url: URL of the occurrence
+            more_samples: Texts of further occurrences of the same batch, each
+                counted as a hit as if added one by one
+        """
         now = datetime.now(timezone.utc)
+        occurrences = [sample_text] + list(more_samples or [])
         
         # Check if already in inbox
-        existing = next((item for item in self.inbox if item['norm_name'] == norm_name), None)
+        existing = self._inbox_index.get(norm_name)
         
-        if existing:
-            # Update last_seen
-            existing['last_seen'] = now.isoformat()
-            if sample_text not in existing.get('sample_texts', []):
-                if 'sample_texts' not in existing:
-                    existing['sample_texts'] = []
-                existing['sample_texts'].append(sample_text)
-        else:
+        if existing is None:
             # Add new inbox entry
-            inbox_entry = {
+            existing = {
                 'raw_name': raw_name,
                 'norm_name': norm_name,
                 'sample_text': sample_text,
                 'source_url': source_url,
                 'first_seen': now.isoformat(),
-                'last_seen': now.isoformat()
+                'last_seen': now.isoformat(),
+                'hits': 1
             }
-            self.inbox.append(inbox_entry)
+            self.inbox.append(existing)
+            self._inbox_index[norm_name] = existing
+            occurrences = occurrences[1:]
+        
+        # Update last_seen
+        existing['last_seen'] = now.isoformat()
+        samples = existing.setdefault('sample_texts', []) if occurrences else None
+        for text in occurrences:
+            existing['hits'] = existing.get('hits', 1) + 1
+            if text == existing.get('sample_text') or text in samples:
+                continue
+            if len(samples) < INBOX_SAMPLE_SIZE:
+                samples.append(text)
+            else:
+                # Reservoir sampling over the occurrences after the first,
+                # seeded by name and hit so rebuilds keep the same samples
+                rng = random.Random(f"{norm_name}:{existing['hits']}")
+                slot = rng.randrange(existing['hits'] - 1)
+                if slot < INBOX_SAMPLE_SIZE:
+                    samples[slot] = text
+        self._inbox_dirty[norm_name] = existing
     
-    def _save_all(self):
-        """Save all data to files."""
-        # Save persons
-        with open(self.persons_file, 'w', encoding='utf-8') as f:
-            for person in self.persons:
-                json.dump(person, f, ensure_ascii=False)
-                f.write('\n')
+    def _save_inbox(self):
+        """
+        Persist inbox changes.
         
-        # Save xref
-        self.xref.to_parquet(self.xref_file, index=False)
+        Changed entries are appended to the journal; it is rewritten with one
+        line per entry once it exceeds INBOX_COMPACT_FACTOR lines per entry.
+        The published inbox is written by publish_inbox.
+        """
+        if not (self._inbox_dirty or self._inbox_rewrite) and self.inbox_journal_file.exists():
+            return
+        entries = len(self.inbox)
+        if (self._inbox_rewrite or not self.inbox_journal_file.exists() or
+                self.snapshot.inbox_lines + len(self._inbox_dirty) > INBOX_COMPACT_FACTOR * max(entries, 1)):
+            self.compact_inbox()
+            return
+        with open(self.inbox_journal_file, 'a', encoding='utf-8') as f:
+            for entry in self._inbox_dirty.values():
+                json.dump(entry, f, ensure_ascii=False)
+                f.write('\n')
+        self.snapshot.inbox_lines += len(self._inbox_dirty)
+        self._inbox_dirty.clear()
+    
+    def compact_inbox(self):
+        """Rewrite the inbox journal with the current entries only."""
+        _atomic_write(self.inbox_journal_file, lambda path: _write_jsonl(path, self.inbox))
+        self.snapshot.inbox_lines = len(self.inbox)
+        self._inbox_dirty.clear()
+        self._inbox_rewrite = False
+    
+    def publish_inbox(self):
+        """
+        Write the published identities_inbox.jsonl with one line per entry.
         
-        # Save aliases
-        self.aliases.to_parquet(self.aliases_file, index=False)
+        The journal keeps a line per update, so readers of the published
+        file (e.g. the web inbox count) would see entries several times.
+        """
+        self._save_inbox()
+        _atomic_write(self.inbox_file, lambda path: _write_jsonl(path, self.inbox))
+    
+    def _save_all(self):
+        """
+        Save changed data to files.
         
-        # Save parties
-        with open(self.parties_file, 'w', encoding='utf-8') as f:
-            for party in self.parties:
-                json.dump(party, f, ensure_ascii=False)
-                f.write('\n')
+        Only artifacts modified since the last save (or missing on disk) are
+        written, each atomically; the inbox appends to its journal, published
+        by publish_inbox.
+        """
+        artifacts = [
+            ('persons', self.persons_file, lambda path: _write_jsonl(path, self.persons)),
+            ('xref', self.xref_file, lambda path: self.xref.to_parquet(path, index=False)),
+            ('aliases', self.aliases_file, lambda path: self.aliases.to_parquet(path, index=False)),
+            ('parties', self.parties_file, lambda path: _write_jsonl(path, self.parties)),
+        ]
+        written = []
+        for name, path, write in artifacts:
+            if name in self._dirty or not path.exists():
+                _atomic_write(path, write)
+                written.append(path.name)
+        self._dirty.clear()
         
         # Save inbox
-        with open(self.inbox_file, 'w', encoding='utf-8') as f:
-            for entry in self.inbox:
-                json.dump(entry, f, ensure_ascii=False)
-                f.write('\n')
-        
-        print(f"Data saved to {self.data_dir}")
+        self._save_inbox()
         
-        # Verify the file was written
-        if self.persons_file.exists():
-            with open(self.persons_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if lines:
-                    print(f"First line: {lines[0][:100]}...")
-        else:
-            print("persons.jsonl file was not created!")
+        if written:
+            print(f"Data saved to {self.data_dir}: {', '.join(written)}")
 
 
 def main():
     """Main function."""
     builder = RegistryBuilder()
     builder.build_from_seeds()
+    builder.publish_inbox()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+Point-in-time index over SCD2 party memberships.
+Loads party_membership.parquet once and answers "party/group of person X at ts"
+with a binary search over the person's intervals.
+"""
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from ingest.utils.time import local_to_utc
+
+
+def to_utc_timestamp(value: Union[str, datetime, pd.Timestamp, None]) -> Optional[pd.Timestamp]:
+    """
+    Convert a date/time value to a UTC timestamp.
+    
+    Args:
+        value: ISO string, datetime or Timestamp; naive values are taken as
+            Europe/Rome local times, like the interventions' ts_start
+    
+    Returns:
+        UTC Timestamp, or None if the value is missing or unparseable
+    """
+    if value is None or (not isinstance(value, (str, datetime)) and pd.isna(value)):
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(ts):
+        return None
+    return pd.Timestamp(local_to_utc(ts.to_pydatetime())) if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+class MembershipIndex:
+    """Per-person membership intervals sorted by valid_from."""
+    
+    def __init__(self, memberships: pd.DataFrame):
+        # person_id -> parallel lists of interval starts, ends (None = open) and rows
+        self._starts: Dict[str, List[pd.Timestamp]] = {}
+        self._ends: Dict[str, List[Optional[pd.Timestamp]]] = {}
+        self._rows: Dict[str, List[Dict]] = {}
+        
+        intervals: Dict[str, List] = {}
+        for row in memberships.to_dict('records'):
+            valid_from = to_utc_timestamp(row.get('valid_from'))
+            if valid_from is None:
+                continue
+            intervals.setdefault(row['person_id'], []).append(
+                (valid_from, to_utc_timestamp(row.get('valid_to')), row)
+            )
+        
+        for person_id, person_intervals in intervals.items():
+            # Stable sort: rows with the same valid_from keep file order
+            person_intervals.sort(key=lambda interval: interval[0])
+            self._starts[person_id] = [interval[0] for interval in person_intervals]
+            self._ends[person_id] = [interval[1] for interval in person_intervals]
+            self._rows[person_id] = [interval[2] for interval in person_intervals]
+    
+    @classmethod
+    def from_file(cls, membership_file: Path) -> 'MembershipIndex':
+        """Build the index from party_membership.parquet (empty if missing)."""
+        if Path(membership_file).exists():
+            return cls(pd.read_parquet(membership_file))
+        return cls(pd.DataFrame(columns=['person_id', 'valid_from', 'valid_to']))
+    
+    def intervals_frame(self) -> pd.DataFrame:
+        """
+        All intervals as one frame sorted by valid_from, for vectorized joins.
+        
+        Returns:
+            DataFrame with person_id, valid_from, valid_to (UTC, NaT if open),
+            party_id and group_id_aula
+        """
+        records = []
+        for person_id, rows in self._rows.items():
+            for start, end, row in zip(self._starts[person_id], self._ends[person_id], rows):
+                records.append({
+                    'person_id': person_id,
+                    'valid_from': start,
+                    'valid_to': end,
+                    'party_id': row.get('party_id'),
+                    'group_id_aula': row.get('group_id_aula')
+                })
+        frame = pd.DataFrame(records, columns=['person_id', 'valid_from', 'valid_to', 'party_id', 'group_id_aula'])
+        frame['valid_from'] = pd.to_datetime(frame['valid_from'], utc=True).astype('datetime64[ns, UTC]')
+        frame['valid_to'] = pd.to_datetime(frame['valid_to'], utc=True).astype('datetime64[ns, UTC]')
+        return frame.sort_values('valid_from', kind='mergesort').reset_index(drop=True)
+    
+    def __len__(self) -> int:
+        return sum(len(starts) for starts in self._starts.values())
+    
+    def membership_at(self, person_id: str, ts: Union[str, datetime, None] = None) -> Optional[Dict]:
+        """
+        Get the membership of a person at a timestamp.
+        
+        Intervals are assumed not to overlap (SCD2); if they do, the one with
+        the latest valid_from not after ts wins.
+        
+        Args:
+            person_id: Person ID
+            ts: Timestamp to check membership at; None for the current
+                (open-ended) membership
+        
+        Returns:
+            Membership row as dict, or None if not found
+        """
+        starts = self._starts.get(person_id)
+        if not starts:
+            return None
+        ends = self._ends[person_id]
+        rows = self._rows[person_id]
+        
+        ts = to_utc_timestamp(ts)
+        if ts is None:
+            # Current membership: the latest open interval
+            for i in range(len(rows) - 1, -1, -1):
+                if ends[i] is None:
+                    return rows[i]
+            return None
+        
+        i = bisect_right(starts, ts) - 1
+        if i < 0:
+            return None
+        if ends[i] is None or ts <= ends[i]:
+            return rows[i]
+        return None
@@ -0,0 +1,96 @@
+"""
+Lazily loaded registry tables.
+One snapshot is shared by IdentityMatcher and RegistryBuilder: each file of the
+registry is read at most once, on first access, and only if it is used.
+"""
+import json
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pandas as pd
+
+from identities.membership_index import MembershipIndex
+
+# Colonne delle tabelle Parquet del registro
+XREF_COLUMNS = ['person_id', 'source', 'source_id', 'url', 'first_seen', 'last_seen']
+ALIAS_COLUMNS = ['person_id', 'alias', 'from', 'to', 'confidence']
+
+
+def _read_jsonl(path: Path) -> List[Dict]:
+    """Read a JSONL file, empty list if missing."""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    return []
+
+
+class RegistrySnapshot:
+    """Registry tables of a data directory, each loaded on first access."""
+    
+    TABLES = ('persons', 'xref', 'aliases', 'parties', 'inbox', 'memberships')
+    
+    def __init__(self, data_dir: Union[str, Path] = "public/data"):
+        self.data_dir = Path(data_dir)
+        
+        # File paths
+        self.persons_file = self.data_dir / "persons.jsonl"
+        self.xref_file = self.data_dir / "person_xref.parquet"
+        self.aliases_file = self.data_dir / "person_aliases.parquet"
+        self.parties_file = self.data_dir / "party_registry.jsonl"
+        self.inbox_file = self.data_dir / "identities_inbox.jsonl"
+        self.inbox_journal_file = self.data_dir / "identities_inbox.journal.jsonl"
+        self.membership_file = self.data_dir / "party_membership.parquet"
+        
+        # Lines currently in the inbox journal (set when the inbox is loaded)
+        self.inbox_lines = 0
+    
+    def is_loaded(self, table: str) -> bool:
+        """Whether a table has been read (or assigned) already."""
+        return table in self.__dict__
+    
+    @cached_property
+    def persons(self) -> List[Dict]:
+        """Persons from persons.jsonl."""
+        return _read_jsonl(self.persons_file)
+    
+    @cached_property
+    def parties(self) -> List[Dict]:
+        """Parties from party_registry.jsonl."""
+        return _read_jsonl(self.parties_file)
+    
+    @cached_property
+    def xref(self) -> pd.DataFrame:
+        """Crosswalk from person_xref.parquet."""
+        if self.xref_file.exists():
+            return pd.read_parquet(self.xref_file)
+        return pd.DataFrame(columns=XREF_COLUMNS)
+    
+    @cached_property
+    def aliases(self) -> pd.DataFrame:
+        """Aliases from person_aliases.parquet."""
+        if self.aliases_file.exists():
+            return pd.read_parquet(self.aliases_file)
+        return pd.DataFrame(columns=ALIAS_COLUMNS)
+    
+    @cached_property
+    def inbox(self) -> List[Dict]:
+        """
+        Inbox entries from the identities_inbox.journal.jsonl journal.
+        
+        The journal holds one line per update of an entry: the last line of
+        each norm_name wins, in order of first appearance. Without a journal
+        the published identities_inbox.jsonl (one line per entry) is read.
+        """
+        entries: Dict[str, Dict] = {}
+        source = self.inbox_journal_file if self.inbox_journal_file.exists() else self.inbox_file
+        lines = _read_jsonl(source)
+        for entry in lines:
+            entries[entry['norm_name']] = entry
+        self.inbox_lines = len(lines)
+        return list(entries.values())
+    
+    @cached_property
+    def memberships(self) -> MembershipIndex:
+        """Point-in-time index over party_membership.parquet."""
+        return MembershipIndex.from_file(self.membership_file)
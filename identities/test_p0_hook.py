@@ -15,8 +15,10 @@ import pandas as pd
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from identities.build_registry import RegistryBuilder
+from identities.build_registry import RegistryBuilder, INBOX_SAMPLE_SIZE, INBOX_COMPACT_FACTOR
 from identities.build_memberships import MembershipBuilder
+from identities.membership_index import MembershipIndex
+from identities.registry_snapshot import RegistrySnapshot
 from ingest.identity_matcher import IdentityMatcher
 
 
@@ -61,6 +63,84 @@ class TestP0Hook(unittest.TestCase):
             parties = [json.loads(line) for line in f if line.strip()]
         self.assertGreater(len(parties), 0)
     
+    def test_registry_rebuild_is_idempotent(self):
+        """Test that building twice does not duplicate persons or crosswalk rows."""
+        self.registry_builder.build_from_seeds()
+        first_xref = pd.read_parquet(self.test_data_dir / "person_xref.parquet")
+        
+        builder = RegistryBuilder(str(self.test_data_dir))
+        builder.build_from_seeds()
+        xref = pd.read_parquet(self.test_data_dir / "person_xref.parquet")
+        
+        self.assertEqual(len(builder.persons), len(self.registry_builder.persons))
+        self.assertEqual(len(xref), len(first_xref))
+        self.assertTrue((xref['last_seen'] >= first_xref['last_seen']).all())
+        self.assertIs(builder._find_person_by_name('Elly', 'Schlein'), builder.persons[0])
+    
+    def test_inbox_journal(self):
+        """Test inbox hit counters, bounded samples and journal compaction."""
+        inbox_file = self.test_data_dir / "identities_inbox.journal.jsonl"
+        builder = RegistryBuilder(str(self.test_data_dir))
+        for i in range(50):
+            builder.add_to_inbox("PRESIDENTE", "presidente", f"sample {i}", "https://test.camera.it/1")
+        builder._save_all()
+        
+        entry = builder._inbox_index["presidente"]
+        self.assertEqual(entry['hits'], 50)
+        self.assertEqual(entry['sample_text'], "sample 0")
+        self.assertEqual(len(entry['sample_texts']), INBOX_SAMPLE_SIZE)
+        
+        # Later saves append only the changed entries; reload keeps the last line
+        builder = RegistryBuilder(str(self.test_data_dir))
+        builder.add_to_inbox("Mario Bianchi", "mario bianchi", "text", "https://test.camera.it/2")
+        builder.add_to_inbox("PRESIDENTE", "presidente", "sample 50", "https://test.camera.it/1")
+        builder._save_all()
+        with open(inbox_file, 'r') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        reloaded = RegistryBuilder(str(self.test_data_dir))
+        self.assertEqual([e['norm_name'] for e in reloaded.inbox], ["presidente", "mario bianchi"])
+        self.assertEqual(reloaded._inbox_index["presidente"]['hits'], 51)
+        
+        # The journal is compacted once it outgrows the entries
+        for _ in range(2 * INBOX_COMPACT_FACTOR):
+            reloaded.add_to_inbox("PRESIDENTE", "presidente", "again", "https://test.camera.it/1")
+            reloaded._save_all()
+        with open(inbox_file, 'r') as f:
+            self.assertLessEqual(len(f.readlines()), INBOX_COMPACT_FACTOR * 2)
+        
+        # The published inbox has one line per entry, whatever the journal holds
+        reloaded.add_to_inbox("PRESIDENTE", "presidente", "last", "https://test.camera.it/1")
+        reloaded.publish_inbox()
+        with open(self.test_data_dir / "identities_inbox.jsonl", 'r') as f:
+            published = [json.loads(line) for line in f if line.strip()]
+        self.assertEqual([e['norm_name'] for e in published], ["presidente", "mario bianchi"])
+        self.assertEqual(published[0]['hits'], 51 + 2 * INBOX_COMPACT_FACTOR + 1)
+    
+    def test_inbox_samples_are_reproducible(self):
+        """Test that the sample reservoir is the same across builders."""
+        samples = []
+        for run in range(2):
+            builder = RegistryBuilder(str(self.test_data_dir / f"run{run}"))
+            for i in range(100):
+                builder.add_to_inbox("PRESIDENTE", "presidente", f"sample {i}", "https://test.camera.it/1")
+            samples.append(builder._inbox_index["presidente"]['sample_texts'])
+        self.assertEqual(samples[0], samples[1])
+    
+    def test_save_writes_only_dirty_artifacts(self):
+        """Test that saving after an inbox-only change leaves the registry files alone."""
+        self.registry_builder.build_from_seeds()
+        registry_files = ["persons.jsonl", "person_xref.parquet", "person_aliases.parquet", "party_registry.jsonl"]
+        mtimes = {name: (self.test_data_dir / name).stat().st_mtime_ns for name in registry_files}
+        
+        builder = RegistryBuilder(str(self.test_data_dir))
+        builder.add_to_inbox("Unknown Person", "unknown person", "text", "https://test.camera.it/1")
+        builder._save_all()
+        
+        for name in registry_files:
+            self.assertEqual((self.test_data_dir / name).stat().st_mtime_ns, mtimes[name], name)
+        self.assertTrue((self.test_data_dir / "identities_inbox.journal.jsonl").exists())
+        self.assertEqual(list(self.test_data_dir.glob(".tmp_*")), [])
+    
     def test_membership_build_scd2(self):
         """Test that memberships are built with SCD2 logic."""
         # Build registry first
@@ -144,9 +224,7 @@ class TestP0Hook(unittest.TestCase):
         self.assertEqual(stats['match_rate'], 2/3)
         
         # Check that unmatched went to inbox
-        self.assertTrue((self.test_data_dir / "identities_inbox.jsonl").exists())
-        with open(self.test_data_dir / "identities_inbox.jsonl", 'r') as f:
-            inbox = [json.loads(line) for line in f if line.strip()]
+        inbox = RegistrySnapshot(self.test_data_dir).inbox
         self.assertEqual(len(inbox), 1)
         self.assertEqual(inbox[0]['raw_name'], 'Unknown Person')
     
@@ -187,6 +265,132 @@ class TestP0Hook(unittest.TestCase):
             self.assertIsNotNone(identity_info)
             self.assertEqual(identity_info['person_id'], expected_person_id)
 
+    
+    def test_matcher_indexes(self):
+        """Test alias/name indexes: best active alias, swapped names, reload."""
+        self.registry_builder.build_from_seeds()
+        self.identity_matcher.reload()
+        self.assertEqual(self.identity_matcher.match_speaker("Schlein Elly", "u")['person_id'], 'P000001')
+        
+        # Expired aliases are ignored; the highest confidence wins
+        self.identity_matcher.aliases = pd.DataFrame([
+            {'person_id': 'P000001', 'alias': 'la segretaria', 'from': None, 'to': None, 'confidence': 0.6},
+            {'person_id': 'P000002', 'alias': 'la segretaria', 'from': None, 'to': None, 'confidence': 0.9},
+            {'person_id': 'P000003', 'alias': 'la segretaria', 'from': None, 'to': '2020-01-01', 'confidence': 1.0},
+        ])
+        self.identity_matcher.rebuild_indexes()
+        self.assertEqual(self.identity_matcher._match_by_alias('la segretaria'), 'P000002')
+        self.assertIsNone(self.identity_matcher._match_by_alias('elly schlein'))
+
+    
+    def test_membership_at_timestamp(self):
+        """Test that memberships are resolved at the intervention timestamp."""
+        self.registry_builder.build_from_seeds()
+        self.membership_builder.build_sample_memberships()
+        self.identity_matcher.reload()
+        
+        # Berlusconi's membership closed on 2023-06-12
+        past = self.identity_matcher.match_speaker("Silvio Berlusconi", "u", ts="2020-05-04T10:00:00Z")
+        self.assertEqual(past['party_id_at_ts'], 'PARTY004')
+        later = self.identity_matcher.match_speaker("Silvio Berlusconi", "u", ts="2024-01-15T10:00:00Z")
+        self.assertIsNone(later['party_id_at_ts'])
+        
+        # Successive SCD2 intervals, stored out of order
+        index = MembershipIndex(pd.DataFrame([
+            {'person_id': 'P1', 'party_id': 'B', 'valid_from': '2022-01-01T00:00:00Z', 'valid_to': None},
+            {'person_id': 'P1', 'party_id': 'A', 'valid_from': '2018-01-01T00:00:00Z', 'valid_to': '2021-12-31T00:00:00Z'},
+        ]))
+        self.assertEqual(index.membership_at('P1', '2019-06-01T00:00:00Z')['party_id'], 'A')
+        self.assertEqual(index.membership_at('P1', datetime(2023, 1, 1))['party_id'], 'B')
+        self.assertEqual(index.membership_at('P1')['party_id'], 'B')
+        self.assertIsNone(index.membership_at('P1', '2017-01-01'))
+        self.assertIsNone(index.membership_at('P1', '2021-12-31T12:00:00Z'))
+        
+        # Naive times are Rome local: 00:30 on New Year's Day is still 2021 in UTC
+        self.assertIsNone(index.membership_at('P1', '2022-01-01T00:30:00'))
+        self.assertEqual(index.membership_at('P1', '2022-01-01T01:30:00')['party_id'], 'B')
+
+    
+    def test_enrich_frame_matches_per_row(self):
+        """Test that batch enrichment agrees with per-speaker matching."""
+        self.registry_builder.build_from_seeds()
+        self.membership_builder.build_sample_memberships()
+        self.identity_matcher.reload()
+        
+        df = pd.DataFrame({
+            'oratore': ['Silvio Berlusconi', 'Elly Schlein', 'Silvio Berlusconi', 'Unknown Person', 'Elly Schlein'],
+            'ts_start': ['2020-05-04T10:00:00', '2024-01-15T10:00:00Z', '2024-01-15T10:00:00Z',
+                         '2024-01-15T10:00:00Z', ''],
+            'source_url': ['https://test.camera.it/1'] * 5,
+            'text': ['Test intervention text'] * 5
+        })
+        enriched = self.identity_matcher.enrich_frame(df)
+        
+        reference = IdentityMatcher(str(self.test_data_dir))
+        for row in enriched.to_dict('records'):
+            expected = reference.match_speaker(row['oratore'], row['source_url'], ts=row['ts_start'] or None) or {
+                'person_id': None, 'party_id_at_ts': None, 'group_id_aula_at_ts': None
+            }
+            for column, value in expected.items():
+                self.assertEqual(row[column], value)
+        
+        self.assertEqual(self.identity_matcher.get_stats()['matched_count'], 4)
+        self.assertEqual(self.identity_matcher.get_stats()['unmatched_count'], 1)
+        inbox = RegistrySnapshot(self.test_data_dir).inbox
+        self.assertEqual([item['raw_name'] for item in inbox], ['Unknown Person'])
+
+    
+    def test_enrich_frame_inbox_matches_per_row(self):
+        """Test that batch enrichment counts unmatched speakers in the inbox like per-row matching."""
+        import shutil
+        self.registry_builder.build_from_seeds()
+        reference_dir = Path(self.test_dir) / "reference"
+        shutil.copytree(self.test_data_dir, reference_dir)
+        
+        speakers = ['Mario Verdi', 'Elly Schlein', 'Mario Verdi', 'Unknown Person', 'PRESIDENTE'] * 3 + ['Mario Verdi'] * 6
+        df = pd.DataFrame({
+            'oratore': speakers,
+            'ts_start': [''] * len(speakers),
+            'source_url': ['https://test.camera.it/1'] * len(speakers),
+            'text': [f'Testo {i}' for i in range(len(speakers))]
+        })
+        matcher = IdentityMatcher(str(self.test_data_dir))
+        matcher.enrich_frame(df)
+        
+        reference = IdentityMatcher(str(reference_dir))
+        for row in df.to_dict('records'):
+            reference.match_speaker(row['oratore'], row['source_url'], row['text'][:200], ts=None)
+        reference.registry_builder._save_all()
+        
+        self.assertEqual(matcher.get_stats(), reference.get_stats())
+        batch = {e['norm_name']: e for e in RegistrySnapshot(self.test_data_dir).inbox}
+        per_row = {e['norm_name']: e for e in RegistrySnapshot(reference_dir).inbox}
+        self.assertEqual(batch.keys(), per_row.keys())
+        for name, entry in batch.items():
+            self.assertEqual(entry['hits'], per_row[name]['hits'], name)
+            self.assertEqual(entry['sample_text'], per_row[name]['sample_text'], name)
+            self.assertEqual(entry['sample_texts'], per_row[name]['sample_texts'], name)
+        self.assertEqual(batch['mario verdi']['hits'], 12)
+    
+    def test_snapshot_is_lazy_and_shared(self):
+        """Test that registry tables are read on first use, once, by matcher and builder."""
+        self.registry_builder.build_from_seeds()
+        snapshot = RegistrySnapshot(self.test_data_dir)
+        matcher = IdentityMatcher(str(self.test_data_dir), snapshot=snapshot)
+        self.assertFalse(any(snapshot.is_loaded(table) for table in RegistrySnapshot.TABLES))
+        
+        with patch('identities.registry_snapshot.pd.read_parquet', wraps=pd.read_parquet) as read_parquet:
+            matcher.match_speaker("Elly Schlein", "https://test.camera.it/1")
+            matcher.match_speaker("Unknown Person", "https://test.camera.it/1")
+            matcher.match_speaker("Giorgia Meloni", "https://test.camera.it/1")
+            matcher.registry_builder._save_all()
+        
+        # Aliases once (no memberships built); crosswalk and parties never
+        self.assertEqual(read_parquet.call_count, 1)
+        self.assertTrue(snapshot.is_loaded('persons'))
+        self.assertFalse(snapshot.is_loaded('xref'))
+        self.assertFalse(snapshot.is_loaded('parties'))
+        self.assertIs(matcher.registry_builder.persons, matcher.persons)
 
 if __name__ == "__main__":
     unittest.main()
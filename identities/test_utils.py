@@ -3,7 +3,10 @@ Unit tests for identity utilities.
 Tests normalize_name, split_name, and slugify functions.
 """
 import unittest
-from identities.utils import normalize_name, split_name, slugify
+from identities.utils import (
+    normalize_name, split_name, slugify, NameCache, NAME_CACHES, configure_name_cache,
+    name_cache_stats, DEFAULT_NAME_CACHE_SIZE
+)
 
 
 class TestNormalizeName(unittest.TestCase):
@@ -118,5 +121,52 @@ class TestSlugify(unittest.TestCase):
         self.assertEqual(slugify("", ""), "")
 
 
+
+class TestNameCache(unittest.TestCase):
+    """Test the bounded LRU name caches."""
+    
+    def tearDown(self):
+        """Restore the shared caches."""
+        configure_name_cache(DEFAULT_NAME_CACHE_SIZE)
+        for cache in NAME_CACHES.values():
+            cache.clear()
+    
+    def test_lru_eviction_and_counters(self):
+        """Test hits, misses and least-recently-used eviction."""
+        cache = NameCache(maxsize=2)
+        calls = []
+        compute = lambda key: calls.append(key) or key.upper()
+        
+        self.assertEqual(cache.get_or_compute("a", compute), "A")
+        cache.get_or_compute("b", compute)
+        cache.get_or_compute("a", compute)  # "b" is now least recently used
+        cache.get_or_compute("c", compute)  # evicts "b"
+        cache.get_or_compute("a", compute)
+        cache.get_or_compute("b", compute)
+        
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['size']), (2, 4, 2, 2))
+        self.assertEqual(stats['hit_rate'], 0.3333)
+    
+    def test_shared_caches(self):
+        """Test that cached and uncached results agree and stats are reported."""
+        for cache in NAME_CACHES.values():
+            cache.clear()
+        first = normalize_name("On. Giorgia Meloni")
+        self.assertEqual(normalize_name("On. Giorgia Meloni"), first)
+        self.assertEqual(split_name(first), ("giorgia", "meloni"))
+        self.assertEqual(split_name(first), ("giorgia", "meloni"))
+        
+        stats = name_cache_stats()
+        self.assertEqual(stats['normalize_name']['hits'], 1)
+        self.assertEqual(stats['split_name']['hits'], 1)
+        
+        # A zero bound disables caching without changing results
+        configure_name_cache(0)
+        self.assertEqual(normalize_name("On. Giorgia Meloni"), first)
+        self.assertEqual(name_cache_stats()['normalize_name']['size'], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
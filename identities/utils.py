@@ -3,8 +3,10 @@ Utility functions for name normalization and processing.
 Deterministic approach: no fuzzy matching, only exact normalization.
 """
 import re
+import threading
 import unicodedata
-from typing import Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
 from unidecode import unidecode
 
 
@@ -16,6 +18,110 @@ HONORIFICS = {
     'ingegnere', 'ing', 'architetto', 'arch'
 }
 
+# Pattern precompilati: una sola alternanza per tutte le onorificenze
+# (le più lunghe prima, ad es. 'vicepresidente' prima di 'vice')
+HONORIFICS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(h) for h in sorted(HONORIFICS, key=lambda h: (-len(h), h))) + r')\b'
+)
+WHITESPACE_RE = re.compile(r'\s+')
+PUNCTUATION_RE = re.compile(r'[^\w\s-]')
+SLUG_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+HYPHENS_RE = re.compile(r'-+')
+
+# Dimensione predefinita delle cache dei nomi (voci per funzione)
+DEFAULT_NAME_CACHE_SIZE = 4096
+
+
+class NameCache:
+    """Thread-safe bounded LRU memo with hit/miss/eviction counters."""
+    
+    def __init__(self, maxsize: int = DEFAULT_NAME_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[Hashable], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key, also the argument of compute
+            compute: Function producing the value (called outside the lock)
+            
+        Returns:
+            Cached or computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        value = compute(key)
+        
+        with self._lock:
+            if self.maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+    
+    def resize(self, maxsize: int) -> None:
+        """Change the bound (0 disables caching), evicting the oldest entries."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Counters and fill level, as a JSON-serializable dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Cache condivise dal processo (ingest e identities)
+NAME_CACHES = {
+    'normalize_name': NameCache(),
+    'split_name': NameCache()
+}
+
+
+def configure_name_cache(maxsize: int) -> None:
+    """
+    Set the bound of the name caches.
+    
+    Args:
+        maxsize: Entries kept per function (0 disables caching)
+    """
+    for cache in NAME_CACHES.values():
+        cache.resize(maxsize)
+
+
+def name_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of the name caches, keyed by function name."""
+    return {name: cache.stats() for name, cache in NAME_CACHES.items()}
+
 
 def normalize_name(raw: str) -> str:
     """
@@ -30,25 +136,28 @@ def normalize_name(raw: str) -> str:
     if not raw:
         return ""
     
+    return NAME_CACHES['normalize_name'].get_or_compute(raw, _normalize_name)
+
+
+def _normalize_name(raw: str) -> str:
+    """Uncached normalize_name."""
     # Convert to lowercase
     norm = raw.lower()
     
     # Remove accents (unidecode)
     norm = unidecode(norm)
     
-    # Remove honorifics
-    for honorific in HONORIFICS:
-        # Use word boundaries to avoid partial matches
-        norm = re.sub(r'\b' + re.escape(honorific) + r'\b', '', norm)
+    # Remove honorifics (word boundaries avoid partial matches)
+    norm = HONORIFICS_RE.sub('', norm)
     
     # Clean up extra spaces after honorific removal
-    norm = re.sub(r'\s+', ' ', norm)
+    norm = WHITESPACE_RE.sub(' ', norm)
     
     # Remove extra punctuation and normalize spaces
-    norm = re.sub(r'[^\w\s-]', ' ', norm)
+    norm = PUNCTUATION_RE.sub(' ', norm)
     # Convert hyphens to spaces for better name handling
     norm = norm.replace('-', ' ')
-    norm = re.sub(r'\s+', ' ', norm)
+    norm = WHITESPACE_RE.sub(' ', norm)
     
     # Strip leading/trailing whitespace
     norm = norm.strip()
@@ -73,6 +182,11 @@ def split_name(norm: str) -> Tuple[str, str]:
     if not norm:
         return "", ""
     
+    return NAME_CACHES['split_name'].get_or_compute(norm, _split_name)
+
+
+def _split_name(norm: str) -> Tuple[str, str]:
+    """Uncached split_name."""
     tokens = norm.split()
     
     if len(tokens) == 0:
@@ -105,12 +219,12 @@ def slugify(nome: str, cognome: str) -> str:
     full_name = f"{cognome}-{nome}".lower()
     
     # Remove non-alphanumeric characters except hyphens, but preserve spaces
-    slug = re.sub(r'[^a-z0-9\s-]', '', full_name)
+    slug = SLUG_INVALID_RE.sub('', full_name)
     # Convert spaces to hyphens
-    slug = re.sub(r'\s+', '-', slug)
+    slug = WHITESPACE_RE.sub('-', slug)
     
     # Collapse multiple hyphens
-    slug = re.sub(r'-+', '-', slug)
+    slug = HYPHENS_RE.sub('-', slug)
     
     # Remove leading/trailing hyphens
     slug = slug.strip('-')
@@ -4,28 +4,43 @@ Camera dei Deputati HTML Adapter
 Fetches live HTML resoconti from Camera dei Deputati
 """
 
-import re
 import logging
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from datetime import date, datetime
 from bs4 import BeautifulSoup
-from ingest.utils.http import fetch_with_etag
+from ingest.utils.http import fetch_with_etag, ValidatorStore
+from ingest.utils.discovery_cache import DiscoveryCache
+from ingest.utils.listing import iter_listing_pages
+from ingest.utils import patterns
+from ingest.adapters.camera_stream import parse_document
 from ingest.utils.text import split_sentences
-from ingest.utils.ids import intervention_id
+from ingest.utils.ids import content_fingerprint, intervention_id
 from ingest.utils.time import parse_italian_timestamp, extract_session_date
 
 logger = logging.getLogger(__name__)
 
+# Parsing engines: "soup" (BeautifulSoup tree walks) or "stream" (single pass, see camera_stream)
+PARSER_ENGINES = ("soup", "stream")
+
 class CameraHTMLAdapter:
     """Adapter for Camera dei Deputati HTML resoconti"""
     
-    def __init__(self):
+    def __init__(self, discovery_cache: Optional[DiscoveryCache] = None,
+                 validators: Optional[ValidatorStore] = None,
+                 parser_engine: str = "soup"):
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine '{parser_engine}', expected one of {PARSER_ENGINES}")
         self.base_url = "https://www.camera.it"
         self.user_agent = "PP100Bot/0.1 (+https://github.com/ensound/PP100; contact: info@pp100.it)"
+        self.discovery_cache = discovery_cache
+        self.validators = validators
+        self.parser_engine = parser_engine
         
     def discover_latest(self, session) -> Dict[str, str]:
         """
         Discover the latest session and available URLs
+        With a discovery cache, the listing page is revalidated with a conditional
+        GET and the deeper hops are skipped while the top session link is unchanged
         Returns: {"id_seduta": "...", "url_summary": "...", "url_full": "...", "url_xml": "..."}
         """
         try:
@@ -33,34 +48,49 @@ class CameraHTMLAdapter:
             sessions_url = f"{self.base_url}/leg19/207"
             logger.info(f"Discovering latest session from {sessions_url}")
             
-            response = session.get(sessions_url, headers={'User-Agent': self.user_agent})
-            response.raise_for_status()
+            cached = self.discovery_cache.get_fresh("camera") if self.discovery_cache else None
+            # Revalidate only when a cached result can answer a 304
+            listing = fetch_with_etag(
+                session, sessions_url,
+                cached.get("etag") if cached else None,
+                cached.get("last_modified") if cached else None,
+                validators=self.validators,
+                conditional=cached is not None
+            )
+            
+            if listing["status_code"] == 304 and cached:
+                logger.info(f"Sessions list not modified, reusing discovery for session {cached['result']['id_seduta']}")
+                return cached["result"]
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(listing["content"], 'lxml')
             
             # Find the first session shown (most recent)
-            session_link = soup.find('a', href=re.compile(r'idSeduta=\d+'))
+            session_link = soup.find('a', href=patterns.CAMERA_SESSION_HREF_RE)
             if not session_link:
                 raise ValueError("No session links found")
                 
             # Extract session ID from href
             href = session_link.get('href', '')
-            session_id_match = re.search(r'idSeduta=(\d+)', href)
+            session_id_match = patterns.CAMERA_SESSION_ID_RE.search(href)
             if not session_id_match:
                 raise ValueError("Could not extract session ID")
                 
             session_id = session_id_match.group(1)
             logger.info(f"Found session ID: {session_id}")
             
+            if cached and cached.get("top_href") == href:
+                logger.info("Latest session unchanged, reusing cached discovery")
+                self.discovery_cache.touch("camera", listing.get("etag"), listing.get("last_modified"))
+                return cached["result"]
+            
             # Step 2: Get the session page to find "Vai al resoconto" link
             session_url = f"{self.base_url}{href}"
-            response = session.get(session_url, headers={'User-Agent': self.user_agent})
-            response.raise_for_status()
+            page = fetch_with_etag(session, session_url, validators=self.validators, conditional=False)
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(page["content"], 'lxml')
             
             # Find "Vai al resoconto" link
-            resoconto_link = soup.find('a', string=re.compile(r'Vai al resoconto', re.IGNORECASE))
+            resoconto_link = soup.find('a', string=patterns.CAMERA_RESOCONTO_LINK_RE)
             if not resoconto_link:
                 raise ValueError("No 'Vai al resoconto' link found")
                 
@@ -69,13 +99,12 @@ class CameraHTMLAdapter:
                 resoconto_href = f"{self.base_url}{resoconto_href}"
                 
             # Step 3: Get the resoconto page to find Sommario link
-            response = session.get(resoconto_href, headers={'User-Agent': self.user_agent})
-            response.raise_for_status()
+            page = fetch_with_etag(session, resoconto_href, validators=self.validators, conditional=False)
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(page["content"], 'lxml')
             
             # Find Sommario link
-            sommario_link = soup.find('a', string=re.compile(r'Sommario', re.IGNORECASE))
+            sommario_link = soup.find('a', string=patterns.CAMERA_SOMMARIO_LINK_RE)
             if not sommario_link:
                 raise ValueError("No Sommario link found")
                 
@@ -84,18 +113,14 @@ class CameraHTMLAdapter:
                 sommario_href = f"{self.base_url}{sommario_href}"
                 
             # Step 4: Construct URLs
-            url_summary = f"{self.base_url}/leg19/410?idSeduta={session_id}&tipo=sommario"
-            url_full = f"https://documenti.camera.it/apps/commonServices/getDocumento.ashx?idLegislatura=19&idSeduta={session_id}&sezione=assemblea&tipoDoc=sommario"
-            url_xml = f"{self.base_url}/leg19/410?idSeduta={session_id}&tipo=xml"
-            
-            discovery_result = {
-                "id_seduta": session_id,
-                "url_summary": url_summary,
-                "url_full": url_full,
-                "url_xml": url_xml
-            }
+            discovery_result = self._session_urls(session_id)
             
             logger.info(f"Discovery completed: {discovery_result}")
+            if self.discovery_cache:
+                self.discovery_cache.put(
+                    "camera", sessions_url, href, discovery_result,
+                    listing.get("etag"), listing.get("last_modified")
+                )
             return discovery_result
             
         except Exception as e:
@@ -108,6 +133,71 @@ class CameraHTMLAdapter:
                 "url_xml": f"{self.base_url}/leg19/1233?shadow_documento=resoconto_xml"
             }
 
+    def _session_urls(self, session_id: str) -> Dict[str, str]:
+        """Document URLs of a session: {"id_seduta", "url_summary", "url_full", "url_xml"}"""
+        return {
+            "id_seduta": session_id,
+            "url_summary": f"{self.base_url}/leg19/410?idSeduta={session_id}&tipo=sommario",
+            "url_full": f"https://documenti.camera.it/apps/commonServices/getDocumento.ashx?idLegislatura=19&idSeduta={session_id}&sezione=assemblea&tipoDoc=sommario",
+            "url_xml": f"{self.base_url}/leg19/410?idSeduta={session_id}&tipo=xml"
+        }
+
+    def list_sessions(self, session, start: date, end: date) -> List[Dict[str, str]]:
+        """
+        List the sessions held between two dates (inclusive), for backfills
+        The session date is read from the row or list item of each idSeduta link
+        Listing pages (newest first) are followed until one reaches back to start;
+        raises ValueError if the whole listing does not, so no date is skipped silently
+        Returns: [{"key": "camera:<id>", "date": "YYYY-MM-DD", "id_seduta": ..., "url_summary": ..., "url_full": ..., "url_xml": ...}]
+        """
+        sessions_url = f"{self.base_url}/leg19/207"
+        
+        sessions = {}
+        oldest = None
+        for _, soup in iter_listing_pages(session, sessions_url):
+            for link in soup.find_all('a', href=patterns.CAMERA_SESSION_HREF_RE):
+                session_id_match = patterns.CAMERA_SESSION_ID_RE.search(link.get('href', ''))
+                if not session_id_match or session_id_match.group(1) in sessions:
+                    continue
+                container = link.find_parent(['tr', 'li']) or link.parent
+                session_date = extract_session_date(container.get_text(" ", strip=True))
+                if session_date is None:
+                    continue
+                oldest = min(oldest, session_date.date()) if oldest else session_date.date()
+                if not start <= session_date.date() <= end:
+                    continue
+                session_id = session_id_match.group(1)
+                sessions[session_id] = dict(
+                    self._session_urls(session_id), key=f"camera:{session_id}", date=session_date.date().isoformat()
+                )
+            if oldest is not None and oldest <= start:
+                break
+        
+        if oldest is None or oldest > start:
+            raise ValueError(f"Session listing reaches back to {oldest} only, not to {start}")
+        
+        logger.info(f"Listed {len(sessions)} sessions between {start} and {end}")
+        return sorted(sessions.values(), key=lambda s: (s["date"], int(s["id_seduta"])))
+
+    def fetch_document(self, session, document: Dict[str, str]) -> Dict[str, str]:
+        """
+        Fetch the resoconto of a listed session (see list_sessions), unconditionally
+        Returns: {"html": "...", "etag": "...", "last_modified": "...", "url": "..."}
+        """
+        try:
+            url = document["url_full"]
+            result = fetch_with_etag(session, url, conditional=False)
+        except Exception as e:
+            logger.warning(f"Error fetching {document['url_full']}: {e}, falling back to summary URL")
+            url = document["url_summary"]
+            result = fetch_with_etag(session, url, conditional=False)
+        return {
+            "html": result["content"],
+            "etag": result.get("etag"),
+            "last_modified": result.get("last_modified"),
+            "url": url
+        }
+
     def fetch_latest(self, session, last_etag: Optional[str] = None, 
                     last_modified: Optional[str] = None) -> Dict[str, str]:
         """
@@ -122,14 +212,14 @@ class CameraHTMLAdapter:
             url = discovery["url_full"]
             logger.info(f"Fetching from {url}")
             
-            result = fetch_with_etag(session, url, last_etag, last_modified)
+            result = fetch_with_etag(session, url, last_etag, last_modified, validators=self.validators)
             
             if result["status_code"] == 304:
                 logger.info("Document not modified, using cached version")
                 return {
                     "html": "",
-                    "etag": last_etag or "",
-                    "last_modified": last_modified or "",
+                    "etag": result.get("etag") or "",
+                    "last_modified": result.get("last_modified") or "",
                     "url": url,
                     "not_modified": True
                 }
@@ -148,7 +238,17 @@ class CameraHTMLAdapter:
                 url = discovery["url_summary"]
                 logger.info(f"Fallback to summary URL: {url}")
                 
-                result = fetch_with_etag(session, url, last_etag, last_modified)
+                result = fetch_with_etag(session, url, last_etag, last_modified, validators=self.validators)
+                
+                if result["status_code"] == 304:
+                    logger.info("Summary not modified, using cached version")
+                    return {
+                        "html": "",
+                        "etag": result.get("etag") or "",
+                        "last_modified": result.get("last_modified") or "",
+                        "url": url,
+                        "not_modified": True
+                    }
                 
                 return {
                     "html": result["content"],
@@ -161,26 +261,35 @@ class CameraHTMLAdapter:
                 logger.error(f"Fallback also failed: {fallback_error}")
                 raise
 
-    def parse_interventions(self, html: str, source_url: str) -> List[Dict]:
+    def parse_interventions(self, html: str, source_url: str,
+                            session_date: Optional[str] = None) -> List[Dict]:
         """
         Parse interventions from HTML content
+        session_date (YYYY-MM-DD) dates the times found in the text, today if
+        not given (live documents)
         Returns: list of intervention dictionaries
         """
         if not html:
             return []
-            
-        soup = BeautifulSoup(html, 'lxml')
         
-        # Extract session info
-        session_info = self._extract_session_info(soup)
-        
-        # Find intervention blocks
-        intervention_blocks = self._find_intervention_blocks(soup)
+        if self.parser_engine == "stream":
+            # Single forward pass producing pre-rendered blocks
+            document = parse_document(html)
+            session_info = self._session_info_from_title(document["title"])
+            intervention_blocks = document["blocks"]
+        else:
+            soup = BeautifulSoup(html, 'lxml')
+            
+            # Extract session info
+            session_info = self._extract_session_info(soup)
+            
+            # Find intervention blocks
+            intervention_blocks = self._find_intervention_blocks(soup)
         
         interventions = []
         for block in intervention_blocks:
             try:
-                intervention = self._parse_intervention_block(block, session_info, source_url)
+                intervention = self._parse_intervention_block(block, session_info, source_url, session_date)
                 if intervention:
                     interventions.append(intervention)
             except Exception as e:
@@ -192,17 +301,20 @@ class CameraHTMLAdapter:
 
     def _extract_session_info(self, soup: BeautifulSoup) -> Dict[str, str]:
         """Extract session information from the document"""
+        # Try to find session title/date
+        title_elem = soup.find('h1') or soup.find('title')
+        return self._session_info_from_title(title_elem.get_text(strip=True) if title_elem else None)
+
+    def _session_info_from_title(self, title_text: Optional[str]) -> Dict[str, str]:
+        """Build session information from the document title"""
         session_info = {
             "seduta": "Seduta Assemblea",
             "ts_start": None
         }
         
-        # Try to find session title/date
-        title_elem = soup.find('h1') or soup.find('title')
-        if title_elem:
-            title_text = title_elem.get_text(strip=True)
+        if title_text is not None:
             # Extract date if present
-            date_match = re.search(r'(\d{1,2}\s+(?:gennaio|febbraio|marzo|aprile|maggio|giugno|luglio|agosto|settembre|ottobre|novembre|dicembre)\s+\d{4})', title_text, re.IGNORECASE)
+            date_match = patterns.TITLE_DATE_RE.search(title_text)
             if date_match:
                 try:
                     parsed_date = parse_italian_timestamp(date_match.group(1))
@@ -218,7 +330,7 @@ class CameraHTMLAdapter:
         # Camera resoconti often have patterns like "Interviene ... (GRUPPO)"
         
         # Method 1: Look for specific intervention markers
-        intervention_markers = soup.find_all(string=re.compile(r'Interviene\s+', re.IGNORECASE))
+        intervention_markers = soup.find_all(string=patterns.CAMERA_MARKER_RE)
         
         if intervention_markers:
             blocks = []
@@ -260,7 +372,7 @@ class CameraHTMLAdapter:
                 continue
                 
             # Check if this line starts a new intervention
-            speaker_match = re.match(r'^(?:Interviene\s+)?([A-Z][A-Z\s]+?)(?:\s+\(([^)]+)\))?', line)
+            speaker_match = patterns.CAMERA_LINE_SPEAKER_RE.match(line)
             if speaker_match:
                 # Save previous intervention if exists
                 if current_speaker and current_content:
@@ -286,7 +398,8 @@ class CameraHTMLAdapter:
         
         return blocks
 
-    def _parse_intervention_block(self, block: Dict, session_info: Dict, source_url: str) -> Optional[Dict]:
+    def _parse_intervention_block(self, block: Dict, session_info: Dict, source_url: str,
+                                  session_date: Optional[str] = None) -> Optional[Dict]:
         """Parse a single intervention block"""
         try:
             if 'marker' in block:
@@ -294,6 +407,10 @@ class CameraHTMLAdapter:
                 speaker_text = block['marker'].get_text(strip=True)
                 content_elements = block['content']
                 content_text = ' '.join([elem.get_text(strip=True) for elem in content_elements])
+            elif 'speaker_text' in block:
+                # Stream engine: block texts are already rendered
+                speaker_text = block['speaker_text']
+                content_text = block['content_text']
             else:
                 # Method 2: Line-based parsing
                 speaker_text = block['speaker']
@@ -305,7 +422,7 @@ class CameraHTMLAdapter:
                 return None
             
             # Extract timestamp if available
-            timestamp = self._extract_timestamp(content_text)
+            timestamp = self._extract_timestamp(content_text, session_date)
             
             # Generate spans for sentences
             spans = split_sentences(content_text)
@@ -316,7 +433,7 @@ class CameraHTMLAdapter:
                 seduta=session_info["seduta"],
                 ts_start=timestamp or session_info.get("ts_start", ""),
                 oratore=speaker_info['oratore'],
-                text_hash=hash(content_text)
+                text_hash=content_fingerprint(content_text)
             )
             
             intervention = {
@@ -346,24 +463,24 @@ class CameraHTMLAdapter:
         text = text.replace("Interviene", "").strip()
         
         # Extract group in parentheses
-        group_match = re.search(r'\(([^)]+)\)', text)
+        group_match = patterns.GROUP_RE.search(text)
         group = group_match.group(1) if group_match else ""
         
         # Remove group from speaker name
-        speaker_name = re.sub(r'\s*\([^)]+\)\s*', '', text).strip()
+        speaker_name = patterns.GROUP_STRIP_RE.sub('', text).strip()
         
         return {
             "oratore": speaker_name,
             "gruppo": group
         }
 
-    def _extract_timestamp(self, text: str) -> Optional[str]:
+    def _extract_timestamp(self, text: str, session_date: Optional[str] = None) -> Optional[str]:
         """Extract timestamp from intervention text"""
         # Look for time patterns like "Ore 14:30"
-        time_match = re.search(r'Ore\s+(\d{1,2}:\d{2})', text)
+        time_match = patterns.ORE_TIME_RE.search(text)
         if time_match:
             time_str = time_match.group(1)
-            # Convert to full timestamp (assuming today's date)
-            today = datetime.now().strftime("%Y-%m-%d")
-            return f"{today}T{time_str}:00"
+            # Convert to full timestamp (on the session date, else today's)
+            day = session_date or datetime.now().strftime("%Y-%m-%d")
+            return f"{day}T{time_str}:00"
         return None
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Single-pass parsing engine for Camera resoconti
+Produces the same intervention blocks as the BeautifulSoup engine of
+CameraHTMLAdapter from one forward pass over lxml parser events
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+from ingest.utils.patterns import CAMERA_LINE_SPEAKER_RE, CAMERA_MARKER_RE
+
+# Sibling elements collected as intervention content, at most MAX_CONTENT per marker
+CONTENT_TAGS = ("p", "div")
+MAX_CONTENT = 5
+
+# Elements whose strings BeautifulSoup leaves out of get_text()
+NON_TEXT_TAGS = ("script", "style", "template")
+
+# Elements where BeautifulSoup keeps whitespace-only strings as they are
+PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+
+# Whitespace BeautifulSoup collapses in whitespace-only strings
+ASCII_SPACES = {ord(c): None for c in "\x20\x0a\x09\x0c\x0d"}
+
+# Size of the chunks fed to the parser
+FEED_CHUNK_CHARS = 1 << 16
+
+
+class _Frame:
+    """Parser state of an open element"""
+
+    __slots__ = ("element", "text_slot", "preserve", "non_text", "markers", "pending")
+
+    def __init__(self, element, text_slot: int, preserve: bool, non_text: bool):
+        self.element = element
+        self.text_slot = text_slot
+        self.preserve = preserve
+        self.non_text = non_text
+        # Markers among the strings of this element: [slot, speaker_text]
+        self.markers = []
+        # Marker groups waiting for content among the following children.
+        # All groups receive the same siblings, so the oldest fills up first
+        self.pending = deque()
+
+
+def parse_document(html: str) -> Dict[str, Any]:
+    """
+    Parse a Camera resoconto in one forward pass
+
+    Every string of the document gets a slot in a flat list, reserved in
+    document order when the parser reports the element (or comment) it
+    belongs to and filled when its text is complete. Element texts are
+    ranges of that list, so each element is read once, bottom-up, and only
+    when it is needed as intervention content.
+
+    Args:
+        html: HTML document
+
+    Returns:
+        Dictionary with: title (text of the first h1, else of the title
+        element, or None), blocks (list of {'speaker_text', 'content_text'})
+    """
+    parts: List[str] = []
+    tail_slots = {}
+    markers = []
+    # First h1 and title elements (by start tag) and their texts
+    title = {"h1": None, "title": None}
+    title_frames = {}
+    root = _Frame(None, -1, False, False)
+    stack = [root]
+
+    def fill(slot: int, text: Optional[str], frame: _Frame, visible: bool) -> None:
+        """Store a string in its slot and record it if it is a marker"""
+        if not text:
+            return
+        if visible and not frame.preserve and not text.translate(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        parts[slot] = text if visible else ""
+        if CAMERA_MARKER_RE.search(text):
+            marker = [slot, text.strip() if visible else ""]
+            frame.markers.append(marker)
+            markers.append(marker)
+
+    def stripped(start: int, end: int) -> str:
+        return "".join([s.strip() for s in parts[start:end] if s])
+
+    parser = etree.HTMLPullParser(events=("start", "end", "comment", "pi"))
+
+    def consume() -> None:
+        for event, element in parser.read_events():
+            if event == "start":
+                parent = stack[-1]
+                tag = element.tag
+                frame = _Frame(
+                    element,
+                    len(parts),
+                    parent.preserve or tag in PRESERVE_WHITESPACE_TAGS,
+                    parent.non_text or tag in NON_TEXT_TAGS,
+                )
+                if tag in title and tag not in title_frames:
+                    title_frames[tag] = frame
+                stack.append(frame)
+                parts.append("")
+            elif event == "end":
+                frame = stack.pop()
+                parent = stack[-1]
+                element = frame.element
+
+                # Own text, then the tails of the children (comments included)
+                fill(frame.text_slot, element.text, frame, not frame.non_text)
+                for child in element:
+                    slot = tail_slots.pop(child, None)
+                    if slot is not None:
+                        fill(slot, child.tail, frame, not frame.non_text)
+
+                end = len(parts)
+                tag = element.tag
+                if tag in title and title_frames.get(tag) is frame:
+                    title[tag] = stripped(frame.text_slot, end)
+
+                # Content for markers found in earlier siblings
+                if tag in CONTENT_TAGS and parent.pending:
+                    text = stripped(frame.text_slot, end)
+                    if text:
+                        for group in parent.pending:
+                            group["content"].append(text)
+                        while (
+                            parent.pending
+                            and len(parent.pending[0]["content"]) >= MAX_CONTENT
+                        ):
+                            parent.pending.popleft()
+
+                # Markers whose parent is this element wait for its next siblings
+                if frame.markers:
+                    group = {"content": []}
+                    parent.pending.append(group)
+                    for marker in frame.markers:
+                        marker.append(group)
+
+                tail_slots[element] = len(parts)
+                parts.append("")
+                # Children are fully read: release them
+                del element[:]
+            else:
+                # Comments and processing instructions: their text is not part
+                # of get_text() but can still be a marker
+                frame = stack[-1]
+                slot = len(parts)
+                parts.append("")
+                fill(slot, element.text, frame, False)
+                tail_slots[element] = len(parts)
+                parts.append("")
+
+    for start in range(0, len(html), FEED_CHUNK_CHARS):
+        parser.feed(html[start : start + FEED_CHUNK_CHARS])
+        consume()
+    try:
+        document = parser.close()
+    except etree.XMLSyntaxError:
+        # Empty document
+        document = None
+    consume()
+
+    # Strings after the root element
+    slot = tail_slots.pop(document, None) if document is not None else None
+    if slot is not None:
+        fill(slot, document.tail, root, True)
+
+    # Markers in document order; those of the root element have no siblings
+    blocks = []
+    for marker in sorted(markers, key=lambda m: m[0]):
+        if len(marker) < 3:
+            continue
+        slot, text, group = marker
+        if group["content"]:
+            blocks.append(
+                {"speaker_text": text, "content_text": " ".join(group["content"])}
+            )
+
+    if not blocks:
+        blocks = _fallback_blocks("".join(parts))
+
+    return {
+        "title": title["h1"] if title["h1"] is not None else title["title"],
+        "blocks": blocks,
+    }
+
+
+def _fallback_blocks(text_content: str) -> List[Dict[str, str]]:
+    """Line-based segmentation of the document text (BeautifulSoup engine Method 2)"""
+    blocks = []
+    current_speaker = None
+    current_content = []
+
+    for line in text_content.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        speaker_match = CAMERA_LINE_SPEAKER_RE.match(line)
+        if speaker_match:
+            if current_speaker and current_content:
+                blocks.append(
+                    {
+                        "speaker_text": current_speaker,
+                        "content_text": "\n".join(current_content),
+                    }
+                )
+            current_speaker = speaker_match.group(1).strip()
+            current_content = [line]
+        elif current_speaker:
+            current_content.append(line)
+
+    if current_speaker and current_content:
+        blocks.append(
+            {
+                "speaker_text": current_speaker,
+                "content_text": "\n".join(current_content),
+            }
+        )
+
+    return blocks
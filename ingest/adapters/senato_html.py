@@ -4,14 +4,19 @@ Senato della Repubblica HTML Adapter
 Fetches live HTML resoconti from Senato della Repubblica
 """
 
-import re
+import html as html_lib
+import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
-from bs4 import BeautifulSoup
-from ingest.utils.http import fetch_with_etag
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+from bs4 import BeautifulSoup, Tag
+from ingest.utils.http import fetch_with_etag, fetch_range, ValidatorStore
+from ingest.utils.discovery_cache import DiscoveryCache
+from ingest.utils.listing import iter_listing_pages
+from ingest.utils.tail_state import TailState
+from ingest.utils import patterns
 from ingest.utils.text import split_sentences
-from ingest.utils.ids import intervention_id
+from ingest.utils.ids import content_fingerprint, intervention_id
 from ingest.utils.time import parse_italian_timestamp, extract_session_date
 
 logger = logging.getLogger(__name__)
@@ -19,13 +24,20 @@ logger = logging.getLogger(__name__)
 class SenatoHTMLAdapter:
     """Adapter for Senato della Repubblica HTML resoconti"""
     
-    def __init__(self):
+    def __init__(self, discovery_cache: Optional[DiscoveryCache] = None,
+                 validators: Optional[ValidatorStore] = None,
+                 tail_state: Optional[TailState] = None):
         self.base_url = "https://www.senato.it"
         self.user_agent = "PP100Bot/0.1 (+https://github.com/ensound/PP100; contact: info@pp100.it)"
+        self.discovery_cache = discovery_cache
+        self.validators = validators
+        self.tail_state = tail_state
         
     def discover_latest(self, session) -> Dict[str, str]:
         """
         Discover the latest session and available URLs
+        With a discovery cache, the list page is revalidated with a conditional
+        GET and not parsed again when unchanged
         Returns: {"url_html": "...", "url_hot": "...", "url_xml": "..."}
         """
         try:
@@ -33,10 +45,21 @@ class SenatoHTMLAdapter:
             list_url = f"{self.base_url}/lavori/assemblea/resoconti-elenco-cronologico"
             logger.info(f"Discovering latest session from {list_url}")
             
-            response = session.get(list_url, headers={'User-Agent': self.user_agent})
-            response.raise_for_status()
+            cached = self.discovery_cache.get_fresh("senato") if self.discovery_cache else None
+            # Revalidate only when a cached result can answer a 304
+            listing = fetch_with_etag(
+                session, list_url,
+                cached.get("etag") if cached else None,
+                cached.get("last_modified") if cached else None,
+                validators=self.validators,
+                conditional=cached is not None
+            )
+            
+            if listing["status_code"] == 304 and cached:
+                logger.info("Resoconti list not modified, reusing cached discovery")
+                return cached["result"]
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = BeautifulSoup(listing["content"], 'lxml')
             
             # Find the first HTML row (most recent)
             html_rows = soup.find_all('tr')
@@ -55,7 +78,7 @@ class SenatoHTMLAdapter:
                 raise ValueError("No HTML rows found")
             
             # Extract the HTML link
-            html_link = latest_html_row.find('a', href=re.compile(r'show-doc.*tipodoc=Resaula'))
+            html_link = latest_html_row.find('a', href=patterns.SENATO_HTML_HREF_RE)
             if not html_link:
                 raise ValueError("No HTML document link found")
                 
@@ -67,7 +90,7 @@ class SenatoHTMLAdapter:
             url_hot = None
             try:
                 # Look for "Resoconto in corso di seduta" link
-                hot_link = soup.find('a', string=re.compile(r'Resoconto in corso di seduta', re.IGNORECASE))
+                hot_link = soup.find('a', string=patterns.SENATO_HOT_LINK_RE)
                 if hot_link:
                     hot_href = hot_link.get('href', '')
                     if not hot_href.startswith('http'):
@@ -78,7 +101,7 @@ class SenatoHTMLAdapter:
                 logger.info(f"No live session found: {e}")
             
             # Step 3: Extract XML link from the same row
-            xml_link = latest_html_row.find('a', href=re.compile(r'show-doc.*tipodoc=.*xml'))
+            xml_link = latest_html_row.find('a', href=patterns.SENATO_XML_HREF_RE)
             url_xml = None
             if xml_link:
                 xml_href = xml_link.get('href', '')
@@ -93,6 +116,11 @@ class SenatoHTMLAdapter:
             }
             
             logger.info(f"Discovery completed: {discovery_result}")
+            if self.discovery_cache:
+                self.discovery_cache.put(
+                    "senato", list_url, html_href, discovery_result,
+                    listing.get("etag"), listing.get("last_modified")
+                )
             return discovery_result
             
         except Exception as e:
@@ -104,11 +132,74 @@ class SenatoHTMLAdapter:
                 "url_xml": f"{self.base_url}/leg19/1233?shadow_documento=resoconto_xml"
             }
 
+    def list_sessions(self, session, start: date, end: date) -> List[Dict[str, str]]:
+        """
+        List the resoconti of sessions held between two dates (inclusive), for backfills
+        Rows of the chronological list are dated from their own text
+        Listing pages (newest first) are followed until one reaches back to start;
+        raises ValueError if the whole listing does not, so no date is skipped silently
+        Returns: [{"key": "senato:<url_html>", "date": "YYYY-MM-DD", "url_html": ..., "url_xml": ...}]
+        """
+        list_url = f"{self.base_url}/lavori/assemblea/resoconti-elenco-cronologico"
+        
+        documents = {}
+        oldest = None
+        for _, soup in iter_listing_pages(session, list_url):
+            for row in soup.find_all('tr'):
+                html_link = row.find('a', href=patterns.SENATO_HTML_HREF_RE)
+                if not html_link:
+                    continue
+                session_date = extract_session_date(row.get_text(" ", strip=True))
+                if session_date is None:
+                    continue
+                oldest = min(oldest, session_date.date()) if oldest else session_date.date()
+                if not start <= session_date.date() <= end:
+                    continue
+                
+                html_href = html_link.get('href', '')
+                if not html_href.startswith('http'):
+                    html_href = f"{self.base_url}{html_href}"
+                xml_link = row.find('a', href=patterns.SENATO_XML_HREF_RE)
+                xml_href = xml_link.get('href', '') if xml_link else None
+                if xml_href and not xml_href.startswith('http'):
+                    xml_href = f"{self.base_url}{xml_href}"
+                
+                documents.setdefault(html_href, {
+                    "key": f"senato:{html_href}",
+                    "date": session_date.date().isoformat(),
+                    "url_html": html_href,
+                    "url_xml": xml_href
+                })
+            if oldest is not None and oldest <= start:
+                break
+        
+        if oldest is None or oldest > start:
+            raise ValueError(f"Resoconti listing reaches back to {oldest} only, not to {start}")
+        
+        logger.info(f"Listed {len(documents)} resoconti between {start} and {end}")
+        return sorted(documents.values(), key=lambda d: d["date"])
+
+    def fetch_document(self, session, document: Dict[str, str]) -> Dict[str, str]:
+        """
+        Fetch the resoconto of a listed session (see list_sessions), unconditionally
+        Returns: {"html": "...", "etag": "...", "last_modified": "...", "url": "..."}
+        """
+        url = document["url_html"]
+        result = fetch_with_etag(session, url, conditional=False)
+        return {
+            "html": result["content"],
+            "etag": result.get("etag"),
+            "last_modified": result.get("last_modified"),
+            "url": url
+        }
+
     def fetch_latest(self, session, last_etag: Optional[str] = None, 
                     last_modified: Optional[str] = None) -> Dict[str, str]:
         """
         Fetch the latest resoconto with ETag/If-Modified-Since support
         Prefers hotresaula if available, otherwise falls back to regular HTML
+        With a tail state, the live document is only fetched and parsed from
+        the last speaker heading seen (see _fetch_tail)
         Returns: {"html": "...", "etag": "...", "last_modified": "...", "url": "..."}
         """
         try:
@@ -120,14 +211,17 @@ class SenatoHTMLAdapter:
                 url = discovery["url_hot"]
                 logger.info(f"Fetching from live session: {url}")
                 
-                result = fetch_with_etag(session, url, last_etag, last_modified)
+                if self.tail_state is not None:
+                    return self._fetch_tail(session, url)
+                
+                result = fetch_with_etag(session, url, last_etag, last_modified, validators=self.validators)
                 
                 if result["status_code"] == 304:
                     logger.info("Live document not modified, using cached version")
                     return {
                         "html": "",
-                        "etag": last_etag or "",
-                        "last_modified": last_modified or "",
+                        "etag": result.get("etag") or "",
+                        "last_modified": result.get("last_modified") or "",
                         "url": url,
                         "not_modified": True
                     }
@@ -143,14 +237,14 @@ class SenatoHTMLAdapter:
             url = discovery["url_html"]
             logger.info(f"Fetching from regular HTML: {url}")
             
-            result = fetch_with_etag(session, url, last_etag, last_modified)
+            result = fetch_with_etag(session, url, last_etag, last_modified, validators=self.validators)
             
             if result["status_code"] == 304:
                 logger.info("HTML document not modified, using cached version")
                 return {
                     "html": "",
-                    "etag": last_etag or "",
-                    "last_modified": last_modified or "",
+                    "etag": result.get("etag") or "",
+                    "last_modified": result.get("last_modified") or "",
                     "url": url,
                     "not_modified": True
                 }
@@ -166,9 +260,87 @@ class SenatoHTMLAdapter:
             logger.error(f"Error fetching latest: {e}")
             raise
 
-    def parse_interventions(self, html: str, source_url: str) -> List[Dict]:
+    def _fetch_tail(self, session, url: str) -> Dict[str, Any]:
+        """
+        Fetch the part of a live document not parsed yet
+        
+        Asks for the bytes from the last tail offset with a Range request.
+        When the server ignores Range the whole document is downloaded and
+        compared locally with the parsed prefix. If the document did not just
+        grow (anchor or prefix mismatch) it is parsed again from the start.
+        Returns: fetch_latest result plus "tail" (see parse_interventions)
+        """
+        state = self.tail_state.get(url)
+        offset = state["offset"] if state else 0
+        result = fetch_range(session, url, offset, validators=self.validators)
+        
+        if result["status_code"] == 304:
+            logger.info("Live document not modified, using cached version")
+            return {
+                "html": "",
+                "etag": result.get("etag") or "",
+                "last_modified": result.get("last_modified") or "",
+                "url": url,
+                "not_modified": True
+            }
+        
+        tail = None
+        if state and result["status_code"] == 206:
+            anchor = bytes.fromhex(state["anchor"])
+            if result["range_start"] == offset and result["content"].startswith(anchor):
+                tail = self._make_tail(result["content"], None, offset, result["encoding"], state)
+        elif state and result["status_code"] == 200:
+            # Range ignored: diff locally against the prefix parsed last time
+            body = result["content"]
+            prefix = body[:offset]
+            anchor = bytes.fromhex(state["anchor"])
+            if (len(prefix) == offset and body[offset:].startswith(anchor) and
+                    state.get("prefix_digest") in (None, hashlib.sha256(prefix).hexdigest())):
+                tail = self._make_tail(body[offset:], prefix, offset, result["encoding"], state)
+            else:
+                tail = self._make_tail(body, b"", 0, result["encoding"], None)
+        elif result["status_code"] == 200:
+            tail = self._make_tail(result["content"], b"", 0, result["encoding"], None)
+        
+        if tail is None:
+            # Document replaced or shrunk: parse it again from the start
+            logger.info("Live document changed before the tail offset, parsing it fully")
+            result = fetch_range(session, url, 0)
+            tail = self._make_tail(result["content"], b"", 0, result["encoding"], None)
+        elif tail["offset"]:
+            logger.info(f"Tailing live document from byte {tail['offset']} ({len(tail['raw'])} new bytes)")
+        
+        return {
+            "html": tail["raw"].decode(tail["encoding"], errors='replace'),
+            "etag": result.get("etag"),
+            "last_modified": result.get("last_modified"),
+            "url": url,
+            "tail": tail
+        }
+
+    def _make_tail(self, raw: bytes, prefix: Optional[bytes], offset: int,
+                   encoding: str, state: Optional[Dict]) -> Dict[str, Any]:
+        """Build the tail descriptor passed from fetch_latest to parse_interventions"""
+        return {
+            "raw": raw,
+            "prefix": prefix,
+            "offset": offset,
+            "encoding": state.get("encoding", encoding) if state else encoding,
+            "session_info": state.get("session_info") if state else None,
+            "last_intervention": state.get("last_intervention") if state else None
+        }
+
+    def parse_interventions(self, html: str, source_url: str,
+                            tail: Optional[Dict[str, Any]] = None,
+                            session_date: Optional[str] = None) -> List[Dict]:
         """
         Parse interventions from HTML content
+        With a tail (from fetch_latest), html is the live document from the
+        last speaker heading onwards and the tail position is advanced; the
+        first intervention, when it is a longer version of the last one of
+        the previous poll, names that row in "supersedes"
+        session_date (YYYY-MM-DD) dates the times found in the text, today if
+        not given (live documents)
         Returns: list of intervention dictionaries
         """
         if not html:
@@ -176,8 +348,11 @@ class SenatoHTMLAdapter:
             
         soup = BeautifulSoup(html, 'lxml')
         
-        # Extract session info
-        session_info = self._extract_session_info(soup)
+        # Extract session info (the document head is not part of a tail)
+        if tail and tail.get("session_info"):
+            session_info = tail["session_info"]
+        else:
+            session_info = self._extract_session_info(soup)
         
         # Find intervention blocks
         intervention_blocks = self._find_intervention_blocks(soup)
@@ -185,7 +360,7 @@ class SenatoHTMLAdapter:
         interventions = []
         for block in intervention_blocks:
             try:
-                intervention = self._parse_intervention_block(block, session_info, source_url)
+                intervention = self._parse_intervention_block(block, session_info, source_url, session_date)
                 if intervention:
                     interventions.append(intervention)
             except Exception as e:
@@ -193,8 +368,56 @@ class SenatoHTMLAdapter:
                 continue
         
         logger.info(f"Parsed {len(interventions)} interventions")
+        
+        if tail is not None and self.tail_state is not None:
+            previous = tail.get("last_intervention")
+            if (previous and interventions and interventions[0]["oratore"] == previous["oratore"]
+                    and interventions[0]["id"] != previous["id"]):
+                # The intervention cut short by the last poll has grown: its id changed with the text
+                interventions[0]["supersedes"] = previous["id"]
+            self._advance_tail(source_url, tail, soup, session_info,
+                               interventions[-1] if interventions else None)
+        
         return interventions
 
+    def _advance_tail(self, url: str, tail: Dict[str, Any], soup: BeautifulSoup,
+                      session_info: Dict, last_intervention: Optional[Dict]) -> None:
+        """Move the tail position of a live document to its last speaker heading"""
+        headings = self._find_speaker_headings(soup)
+        span = self._locate_heading(tail["raw"], tail["encoding"], headings[-1]) if headings else None
+        if span is None:
+            # Without a heading to resume from, parse everything next time
+            self.tail_state.discard(url)
+            return
+        
+        # The anchor is the heading itself: the text after it may still grow
+        local, end = span
+        prefix_digest = None
+        if tail.get("prefix") is not None:
+            prefix_digest = hashlib.sha256(tail["prefix"] + tail["raw"][:local]).hexdigest()
+        
+        self.tail_state.put(
+            url,
+            offset=tail["offset"] + local,
+            anchor=tail["raw"][local:end].hex(),
+            prefix_digest=prefix_digest,
+            encoding=tail["encoding"],
+            session_info=session_info,
+            last_intervention={
+                "id": last_intervention["id"],
+                "oratore": last_intervention["oratore"]
+            } if last_intervention else None
+        )
+
+    def _locate_heading(self, raw: bytes, encoding: str, heading) -> Optional[Tuple[int, int]]:
+        """Byte span in raw of the opening tag and text of a speaker heading"""
+        target = ' '.join(heading.get_text().split())
+        for match in reversed(list(patterns.SENATO_HEADING_TAG_RE.finditer(raw))):
+            text = html_lib.unescape(match.group('text').decode(encoding, errors='replace'))
+            if ' '.join(text.split()) == target:
+                return match.start(), match.end()
+        return None
+
     def _extract_session_info(self, soup: BeautifulSoup) -> Dict[str, str]:
         """Extract session information from the document"""
         session_info = {
@@ -207,7 +430,7 @@ class SenatoHTMLAdapter:
         if title_elem:
             title_text = title_elem.get_text(strip=True)
             # Extract date if present
-            date_match = re.search(r'(\d{1,2}\s+(?:gennaio|febbraio|marzo|aprile|maggio|giugno|luglio|agosto|settembre|ottobre|novembre|dicembre)\s+\d{4})', title_text, re.IGNORECASE)
+            date_match = patterns.TITLE_DATE_RE.search(title_text)
             if date_match:
                 try:
                     parsed_date = parse_italian_timestamp(date_match.group(1))
@@ -217,35 +440,67 @@ class SenatoHTMLAdapter:
         
         return session_info
 
+    def _find_speaker_headings(self, soup: BeautifulSoup) -> List:
+        """Find speaker heading elements in document order"""
+        return soup.find_all(['h2', 'h3', 'h4', 'strong'], string=patterns.SENATO_HEADING_RE)
+
+    def _segment_by_headings(self, soup: BeautifulSoup, speaker_headings: List) -> List[Dict]:
+        """
+        Assign to every speaker heading the content that follows it in its container
+        
+        The content of a heading is taken from the siblings that follow it,
+        or its enclosing paragraph for <p><strong> headings, up to the next
+        sibling that is or contains a heading. Elements outside the
+        heading's container (page footers, navigation) are never claimed.
+        Within a sibling the first p/div found on each path is content, so
+        each element is visited once.
+        
+        Args:
+            soup: Parsed document
+            speaker_headings: Speaker heading elements in document order
+            
+        Returns:
+            List of {'heading', 'content'} blocks with at least one content element
+        """
+        heading_ids = {id(heading) for heading in speaker_headings}
+        ancestor_ids = set()
+        for heading in speaker_headings:
+            for parent in heading.parents:
+                if id(parent) in ancestor_ids:
+                    break
+                ancestor_ids.add(id(parent))
+        
+        blocks = []
+        for heading in speaker_headings:
+            anchor = heading.find_parent('p') or heading
+            content = []
+            for sibling in anchor.next_siblings:
+                if not isinstance(sibling, Tag):
+                    continue
+                if id(sibling) in heading_ids or id(sibling) in ancestor_ids:
+                    break
+                stack = [sibling]
+                while stack:
+                    node = stack.pop()
+                    if node.name in ('p', 'div'):
+                        if node.get_text(strip=True):
+                            content.append(node)
+                    else:
+                        stack.extend(child for child in reversed(node.contents) if isinstance(child, Tag))
+            if content:
+                blocks.append({'heading': heading, 'content': content})
+        
+        return blocks
+
     def _find_intervention_blocks(self, soup: BeautifulSoup) -> List:
         """Find intervention blocks in the HTML"""
         # Senato resoconti have speaker headings followed by paragraphs
         
         # Method 1: Look for speaker headings
-        speaker_headings = soup.find_all(['h2', 'h3', 'h4', 'strong'], 
-                                       string=re.compile(r'^(PRESIDENTE|ZEDDA|relatore|[A-Z]+\s+[A-Z]+)', re.IGNORECASE))
+        speaker_headings = self._find_speaker_headings(soup)
         
         if speaker_headings:
-            blocks = []
-            for i, heading in enumerate(speaker_headings):
-                # Get the heading text
-                speaker_text = heading.get_text(strip=True)
-                
-                # Find content until next heading
-                content_elements = []
-                current = heading.find_next_sibling()
-                
-                while current and current != (speaker_headings[i + 1] if i + 1 < len(speaker_headings) else None):
-                    if current.name in ['p', 'div'] and current.get_text(strip=True):
-                        content_elements.append(current)
-                    current = current.find_next_sibling()
-                
-                if content_elements:
-                    blocks.append({
-                        'heading': heading,
-                        'content': content_elements
-                    })
-            
+            blocks = self._segment_by_headings(soup, speaker_headings)
             if blocks:
                 return blocks
         
@@ -265,7 +520,7 @@ class SenatoHTMLAdapter:
                 
             # Check if this line starts a new intervention
             # Senato patterns: PRESIDENTE, ZEDDA, NOME COGNOME (GRUPPO), etc.
-            speaker_match = re.match(r'^([A-Z][A-Z\s]+?)(?:\s+\(([^)]+)\))?', line)
+            speaker_match = patterns.SENATO_LINE_SPEAKER_RE.match(line)
             if speaker_match:
                 # Save previous intervention if exists
                 if current_speaker and current_content:
@@ -291,7 +546,8 @@ class SenatoHTMLAdapter:
         
         return blocks
 
-    def _parse_intervention_block(self, block: Dict, session_info: Dict, source_url: str) -> Optional[Dict]:
+    def _parse_intervention_block(self, block: Dict, session_info: Dict, source_url: str,
+                                  session_date: Optional[str] = None) -> Optional[Dict]:
         """Parse a single intervention block"""
         try:
             if 'heading' in block:
@@ -310,7 +566,7 @@ class SenatoHTMLAdapter:
                 return None
             
             # Extract timestamp if available
-            timestamp = self._extract_timestamp(content_text)
+            timestamp = self._extract_timestamp(content_text, session_date)
             
             # Generate spans for sentences
             spans = split_sentences(content_text)
@@ -321,7 +577,7 @@ class SenatoHTMLAdapter:
                 seduta=session_info["seduta"],
                 ts_start=timestamp or session_info.get("ts_start", ""),
                 oratore=speaker_info['oratore'],
-                text_hash=hash(content_text)
+                text_hash=content_fingerprint(content_text)
             )
             
             intervention = {
@@ -350,24 +606,24 @@ class SenatoHTMLAdapter:
         # Senato patterns: "PRESIDENTE", "ZEDDA", "NOME COGNOME (GRUPPO)"
         
         # Extract group in parentheses
-        group_match = re.search(r'\(([^)]+)\)', text)
+        group_match = patterns.GROUP_RE.search(text)
         group = group_match.group(1) if group_match else ""
         
         # Remove group from speaker name
-        speaker_name = re.sub(r'\s*\([^)]+\)\s*', '', text).strip()
+        speaker_name = patterns.GROUP_STRIP_RE.sub('', text).strip()
         
         return {
             "oratore": speaker_name,
             "gruppo": group
         }
 
-    def _extract_timestamp(self, text: str) -> Optional[str]:
+    def _extract_timestamp(self, text: str, session_date: Optional[str] = None) -> Optional[str]:
         """Extract timestamp from intervention text"""
         # Look for time patterns like "Ore 16:30"
-        time_match = re.search(r'Ore\s+(\d{1,2}:\d{2})', text)
+        time_match = patterns.ORE_TIME_RE.search(text)
         if time_match:
             time_str = time_match.group(1)
-            # Convert to full timestamp (assuming today's date)
-            today = datetime.now().strftime("%Y-%m-%d")
-            return f"{today}T{time_str}:00"
+            # Convert to full timestamp (on the session date, else today's)
+            day = session_date or datetime.now().strftime("%Y-%m-%d")
+            return f"{day}T{time_str}:00"
         return None
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Historical backfill for PP100 ingest pipeline
+Rebuilds the daily interventions files of a date range from the sessions
+listed by the adapters, fetching the resoconti with a bounded worker pool
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from ingest.utils.http import create_session
+from ingest.utils.io import (
+    DEFAULT_COMPACT_THRESHOLD,
+    append_parquet_delta,
+    compact_parquet_deltas,
+    ensure_directory,
+)
+from ingest.utils.sentences import write_sentences
+from ingest.utils.text import coherent_interventions
+
+logger = logging.getLogger(__name__)
+
+# Documents fetched at the same time (requests per host are also capped, see
+# set_per_host_concurrency)
+DEFAULT_BACKFILL_WORKERS = 4
+
+# Pause of each worker after a document, to keep the load on the sources low
+DEFAULT_REQUEST_DELAY_S = 1.0
+
+
+class BackfillCheckpoint:
+    """
+    JSON-backed record of the documents already backfilled
+
+    Each entry is keyed by the document key from list_sessions
+    ("camera:<idSeduta>", "senato:<url>") and stores the day partition it
+    was written to. A document is marked only once its interventions are
+    in the partition, so an interrupted backfill resumes from the documents
+    still missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load checkpoint entries from disk, ignoring unreadable files"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("done", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backfill checkpoint {self.path}: {e}")
+            return {}
+
+    def is_done(self, key: str) -> bool:
+        """Whether a document has been backfilled already"""
+        with self._lock:
+            return key in self._entries
+
+    def mark_done(self, key: str, day: str, interventions: int) -> None:
+        """
+        Record a backfilled document
+
+        Args:
+            key: Document key
+            day: Day partition written (YYYY-MM-DD)
+            interventions: Interventions parsed from the document
+        """
+        with self._lock:
+            self._entries[key] = {
+                "day": day,
+                "interventions": interventions,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the checkpoint to disk atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_file = self.path.parent / f".tmp_{self.path.name}"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"done": self._entries}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.path)
+            self._dirty = False
+
+
+def discover_documents(
+    sources: List[Tuple[str, object]], start: date, end: date
+) -> Tuple[List[Tuple[str, object, Dict]], List[str]]:
+    """
+    List the documents of all sources between two dates
+
+    Args:
+        sources: (source_name, adapter) pairs
+        start: First day (inclusive)
+        end: Last day (inclusive)
+
+    Returns:
+        Tuple of (source_name, adapter, document) triples sorted by day and
+        source order, and names of the sources whose listing failed
+    """
+    documents = []
+    failed = []
+    session = create_session()
+    try:
+        for order, (source_name, adapter) in enumerate(sources):
+            try:
+                listed = adapter.list_sessions(session, start, end)
+            except Exception as e:
+                logger.error(f"{source_name}: listing failed: {e}")
+                failed.append(source_name)
+                continue
+            logger.info(
+                f"{source_name}: {len(listed)} documents between {start} and {end}"
+            )
+            documents.extend(
+                (document["date"], order, source_name, adapter, document)
+                for document in listed
+            )
+    finally:
+        session.close()
+
+    documents.sort(key=lambda d: (d[0], d[1]))
+    return [
+        (source_name, adapter, document)
+        for _, _, source_name, adapter, document in documents
+    ], failed
+
+
+def run_backfill(
+    start: date,
+    end: date,
+    sources: List[Tuple[str, object]],
+    data_dir: str = "public/data",
+    workers: int = DEFAULT_BACKFILL_WORKERS,
+    request_delay: float = DEFAULT_REQUEST_DELAY_S,
+    checkpoint_path: Optional[str] = None,
+    dry_run: bool = False,
+    compact_every: int = DEFAULT_COMPACT_THRESHOLD,
+    schema: Optional[pa.Schema] = None,
+    write_options: Optional[Dict[str, Any]] = None,
+    emit_sentences: bool = False,
+    enrich: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> Dict[str, Any]:
+    """
+    Backfill the daily interventions files of a date range
+
+    Documents are fetched and parsed by up to workers threads, each on its
+    own HTTP session; interventions are appended to their day partition
+    (interventions-YYYY-MM-DD.parquet) from the calling thread as documents
+    complete, and the checkpoint is saved after each one. Touched partitions
+    are compacted at the end, and their sentences files rebuilt if
+    emit_sentences. The manifest is left to the live runs.
+
+    Args:
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        sources: (source_name, adapter) pairs; adapters provide
+            list_sessions, fetch_document and parse_interventions
+        data_dir: Directory of the day partitions
+        workers: Documents fetched at the same time
+        request_delay: Pause in seconds of each worker after a document
+        checkpoint_path: Checkpoint file (default: <data_dir>/backfill_checkpoint.json)
+        dry_run: Fetch and parse without writing partitions or checkpoint
+        compact_every: Delta files kept before compacting a partition
+        schema: Arrow schema of the partitions
+        write_options: Extra keyword arguments for safe_write_parquet
+        emit_sentences: Also write sentences-YYYY-MM-DD.parquet for the touched days
+        enrich: Applied to the interventions of each document that are
+            actually written (e.g. identity enrichment), from the calling thread
+
+    Returns:
+        Dictionary with: documents (listed), skipped (already in the
+        checkpoint), written, failed (document keys), failed_sources,
+        interventions, days (partitions written)
+    """
+    data_path = Path(data_dir)
+    ensure_directory(data_path)
+    checkpoint = BackfillCheckpoint(
+        checkpoint_path or str(data_path / "backfill_checkpoint.json")
+    )
+
+    documents, failed_sources = discover_documents(sources, start, end)
+    pending = [d for d in documents if not checkpoint.is_done(d[2]["key"])]
+    logger.info(
+        f"Backfilling {len(pending)} of {len(documents)} documents "
+        f"with {workers} workers"
+    )
+
+    # requests.Session is not thread-safe: one session per worker thread
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def fetch(source_name: str, adapter, document: Dict) -> List[Dict]:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = create_session()
+            with sessions_lock:
+                sessions.append(session)
+        try:
+            result = adapter.fetch_document(session, document)
+            interventions = adapter.parse_interventions(
+                result["html"], result["url"], session_date=document["date"]
+            )
+            for intervention in interventions:
+                intervention["fetch_etag"] = result.get("etag")
+                intervention["fetch_last_modified"] = result.get("last_modified")
+            return coherent_interventions(interventions)
+        finally:
+            if request_delay > 0:
+                time.sleep(request_delay)
+
+    summary = {
+        "documents": len(documents),
+        "skipped": len(documents) - len(pending),
+        "written": 0,
+        "failed": [],
+        "failed_sources": failed_sources,
+        "interventions": 0,
+        "days": [],
+    }
+    days = set()
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(workers, 1), thread_name_prefix="backfill"
+    )
+    try:
+        futures = {
+            executor.submit(fetch, source_name, adapter, document): (
+                source_name,
+                document,
+            )
+            for source_name, adapter, document in pending
+        }
+        for future in as_completed(futures):
+            source_name, document = futures[future]
+            try:
+                interventions = future.result()
+            except Exception as e:
+                # Not checkpointed: retried by the next run
+                logger.error(f"{source_name}: {document['key']} failed: {e}")
+                summary["failed"].append(document["key"])
+                continue
+
+            day = document["date"]
+            if interventions and not dry_run:
+                output_path = data_path / f"interventions-{day}.parquet"
+                written = append_parquet_delta(
+                    pd.DataFrame(interventions),
+                    str(output_path),
+                    compact_threshold=compact_every,
+                    schema=schema,
+                    write_options=write_options,
+                    prepare=enrich,
+                )
+                logger.info(
+                    f"{document['key']}: {written['appended']} of "
+                    f"{len(interventions)} interventions to {output_path.name}"
+                )
+                days.add(day)
+
+            summary["written"] += 1
+            summary["interventions"] += len(interventions)
+            if not dry_run:
+                checkpoint.mark_done(document["key"], day, len(interventions))
+                checkpoint.save()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for session in sessions:
+            session.close()
+
+    # Leave every touched partition as a single file
+    for day in sorted(days):
+        compact_parquet_deltas(
+            str(data_path / f"interventions-{day}.parquet"),
+            schema=schema,
+            write_options=write_options,
+        )
+        if emit_sentences:
+            write_sentences(
+                str(data_path / f"interventions-{day}.parquet"),
+                write_options=write_options,
+            )
+    summary["days"] = sorted(days)
+
+    logger.info(
+        f"Backfill complete: {summary['written']} documents, "
+        f"{summary['interventions']} interventions in {len(days)} days, "
+        f"{len(summary['failed'])} failed, {summary['skipped']} already done"
+    )
+    return summary
@@ -2,9 +2,9 @@
 Identity matching module for the ingest pipeline.
 Integrates with the registry to add person_id and membership to interventions.
 """
-import json
 import sys
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -15,47 +15,97 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from identities.utils import normalize_name, split_name
 from identities.build_registry import RegistryBuilder
+from identities.membership_index import MembershipIndex
+from identities.registry_snapshot import RegistrySnapshot
+from ingest.utils.schema import to_utc_timestamps
+from ingest.utils.time import ROME_TZ
 
 
 class IdentityMatcher:
     """Matches speaker names to registry persons and adds membership info."""
     
-    def __init__(self, data_dir: str = "public/data"):
+    def __init__(self, data_dir: str = "public/data", snapshot: Optional[RegistrySnapshot] = None):
+        """
+        Args:
+            data_dir: Registry directory
+            snapshot: Registry tables to read (default: a new snapshot of data_dir)
+        """
         self.data_dir = Path(data_dir)
-        self.registry_builder = RegistryBuilder(str(data_dir))
         
-        # Load registry data
-        self.persons = self._load_persons()
-        self.aliases = self._load_aliases()
-        self.xref = self._load_xref()
+        # Registry tables are loaded on first use and shared with the builder
+        self.snapshot = snapshot if snapshot is not None else RegistrySnapshot(self.data_dir)
+        self.registry_builder = RegistryBuilder(snapshot=self.snapshot)
         
         # Statistics
         self.matched_count = 0
         self.unmatched_count = 0
     
-    def _load_persons(self) -> List[Dict]:
-        """Load persons from registry."""
-        persons_file = self.data_dir / "persons.jsonl"
-        if persons_file.exists():
-            with open(persons_file, 'r', encoding='utf-8') as f:
-                return [json.loads(line) for line in f if line.strip()]
-        return []
+    @property
+    def persons(self) -> List[Dict]:
+        """Persons from the registry."""
+        return self.snapshot.persons
+    
+    @persons.setter
+    def persons(self, persons: List[Dict]):
+        self.snapshot.persons = persons
+    
+    @property
+    def aliases(self) -> pd.DataFrame:
+        """Aliases from the registry."""
+        return self.snapshot.aliases
     
-    def _load_aliases(self) -> pd.DataFrame:
-        """Load aliases from registry."""
-        aliases_file = self.data_dir / "person_aliases.parquet"
-        if aliases_file.exists():
-            return pd.read_parquet(aliases_file)
-        return pd.DataFrame(columns=['person_id', 'alias', 'from', 'to', 'confidence'])
+    @aliases.setter
+    def aliases(self, aliases: pd.DataFrame):
+        self.snapshot.aliases = aliases
     
-    def _load_xref(self) -> pd.DataFrame:
-        """Load crosswalk from registry."""
-        xref_file = self.data_dir / "person_xref.parquet"
-        if xref_file.exists():
-            return pd.read_parquet(xref_file)
-        return pd.DataFrame(columns=['person_id', 'source', 'source_id', 'url', 'first_seen', 'last_seen'])
+    @property
+    def xref(self) -> pd.DataFrame:
+        """Crosswalk from the registry."""
+        return self.snapshot.xref
+    
+    @property
+    def memberships(self) -> MembershipIndex:
+        """Point-in-time membership index."""
+        return self.snapshot.memberships
+    
+    @cached_property
+    def alias_index(self) -> Dict[str, str]:
+        """Active alias -> person_id with the highest confidence (first on ties)."""
+        index: Dict[str, str] = {}
+        if not self.aliases.empty:
+            active = self.aliases[self.aliases['to'].isna()]
+            ranked = active.sort_values('confidence', ascending=False, kind='mergesort', na_position='last')
+            for alias, person_id in zip(ranked['alias'], ranked['person_id']):
+                index.setdefault(alias, person_id)
+        return index
+    
+    @cached_property
+    def name_index(self) -> Dict[Tuple[str, str], str]:
+        """(nome, cognome) lowercased -> first person_id in registry order."""
+        index: Dict[Tuple[str, str], str] = {}
+        for person in self.persons:
+            key = (person['nome'].lower(), person['cognome'].lower())
+            index.setdefault(key, person['person_id'])
+        return index
     
-    def match_speaker(self, raw_name: str, source_url: str, sample_text: str = "") -> Optional[Dict]:
+    def rebuild_indexes(self) -> None:
+        """
+        Drop the lookup indexes so they are rebuilt from persons and aliases.
+        
+        Call after changing self.persons or self.aliases; reload() re-reads
+        the registry files.
+        """
+        self.__dict__.pop('alias_index', None)
+        self.__dict__.pop('name_index', None)
+    
+    def reload(self) -> None:
+        """Re-read the registry files on next use, for the matcher and its builder."""
+        self.snapshot = RegistrySnapshot(self.snapshot.data_dir)
+        self.registry_builder = RegistryBuilder(snapshot=self.snapshot)
+        self.rebuild_indexes()
+    
+    def match_speaker(self, raw_name: str, source_url: str, sample_text: str = "",
+                      ts: Optional[str] = None) -> Optional[Dict]:
         """
         Match a speaker name to a registry person.
         
@@ -63,6 +113,8 @@ class IdentityMatcher:
             raw_name: Raw speaker name from intervention
             source_url: Source URL for provenance
             sample_text: Sample text for inbox if unmatched
+            ts: Intervention timestamp for the membership lookup (current
+                membership if None)
             
         Returns:
             Dict with person_id, party_id_at_ts, group_id_at_ts, or None if unmatched
@@ -75,25 +127,10 @@ class IdentityMatcher:
         if not norm_name:
             return None
         
-        # Try matching strategies in order of preference
-        
-        # 1. Try alias match first
-        person_id = self._match_by_alias(norm_name)
-        if person_id:
-            self.matched_count += 1
-            return self._get_membership_info(person_id, source_url)
-        
-        # 2. Try exact name match
-        person_id = self._match_by_name(norm_name)
+        person_id = self._resolve_person(norm_name, source_url)
         if person_id:
             self.matched_count += 1
-            return self._get_membership_info(person_id, source_url)
-        
-        # 3. Try crosswalk match (rare, but possible)
-        person_id = self._match_by_xref(norm_name, source_url)
-        if person_id:
-            self.matched_count += 1
-            return self._get_membership_info(person_id, source_url)
+            return self._get_membership_info(person_id, source_url, ts)
         
         # No match found - add to inbox
         self.unmatched_count += 1
@@ -101,23 +138,18 @@ class IdentityMatcher:
         
         return None
     
+    def _resolve_person(self, norm_name: str, source_url: str) -> Optional[str]:
+        """Try matching strategies in order of preference."""
+        # 1. Try alias match first
+        # 2. Try exact name match
+        # 3. Try crosswalk match (rare, but possible)
+        return (self._match_by_alias(norm_name) or
+                self._match_by_name(norm_name) or
+                self._match_by_xref(norm_name, source_url))
+    
     def _match_by_alias(self, norm_name: str) -> Optional[str]:
         """Match by normalized alias."""
-        if self.aliases.empty:
-            return None
-        
-        # Find active aliases
-        active_aliases = self.aliases[self.aliases['to'].isna()]
-        
-        # Look for exact match
-        matches = active_aliases[active_aliases['alias'] == norm_name]
-        
-        if not matches.empty:
-            # Return person_id with highest confidence
-            best_match = matches.loc[matches['confidence'].idxmax()]
-            return best_match['person_id']
-        
-        return None
+        return self.alias_index.get(norm_name)
     
     def _match_by_name(self, norm_name: str) -> Optional[str]:
         """Match by exact name (nome + cognome)."""
@@ -126,24 +158,13 @@ class IdentityMatcher:
         if not nome or not cognome:
             return None
         
-        # Look for exact match
-        for person in self.persons:
-            if (person['nome'].lower() == nome and 
-                person['cognome'].lower() == cognome):
-                return person['person_id']
-        
-        # Try reverse order (sometimes names are swapped)
-        for person in self.persons:
-            if (person['nome'].lower() == cognome and 
-                person['cognome'].lower() == nome):
-                return person['person_id']
-        
-        return None
+        # Look for exact match, then reverse order (sometimes names are swapped)
+        return self.name_index.get((nome, cognome)) or self.name_index.get((cognome, nome))
     
     def _match_by_xref(self, norm_name: str, source_url: str) -> Optional[str]:
         """Match by crosswalk (rare, but possible for some sources)."""
-        if self.xref.empty:
-            return None
+        # self.xref is not read until source-specific IDs are matched: the
+        # crosswalk stays unloaded
         
         # This is a simplified version - in practice, you might have
         # more sophisticated logic based on source-specific IDs
@@ -151,51 +172,27 @@ class IdentityMatcher:
         # For now, return None as this is rarely available
         return None
     
-    def _get_membership_info(self, person_id: str, source_url: str) -> Dict:
+    def _get_membership_info(self, person_id: str, source_url: str, ts: Optional[str] = None) -> Dict:
         """
         Get membership information for a person.
         
         Args:
             person_id: Person ID from registry
             source_url: Source URL for context
+            ts: Timestamp the membership must be valid at (current if None)
             
         Returns:
             Dict with membership info
         """
-        # Load memberships
-        membership_file = self.data_dir / "party_membership.parquet"
-        if not membership_file.exists():
-            return {
-                'person_id': person_id,
-                'party_id_at_ts': None,
-                'group_id_aula_at_ts': None
-            }
-        
-        memberships = pd.read_parquet(membership_file)
-        
-        # Find active membership for this person
-        person_memberships = memberships[memberships['person_id'] == person_id]
-        
-        if person_memberships.empty:
-            return {
-                'person_id': person_id,
-                'party_id_at_ts': None,
-                'group_id_aula_at_ts': None
-            }
-        
-        # Find current membership (valid_to is None)
-        current = person_memberships[person_memberships['valid_to'].isna()]
+        membership = self.memberships.membership_at(person_id, ts)
         
-        if current.empty:
-            # No current membership, return person_id only
+        if membership is None:
             return {
                 'person_id': person_id,
                 'party_id_at_ts': None,
                 'group_id_aula_at_ts': None
             }
         
-        # Return current membership info
-        membership = current.iloc[0]
         return {
             'person_id': person_id,
             'party_id_at_ts': membership['party_id'],
@@ -222,8 +219,9 @@ class IdentityMatcher:
             source_url = intervention.get('source_url', '')
             sample_text = intervention.get('text', '')[:200]  # First 200 chars for inbox
             
-            # Try to match speaker
-            identity_info = self.match_speaker(speaker, source_url, sample_text)
+            # Try to match speaker, with the membership valid when they spoke
+            identity_info = self.match_speaker(speaker, source_url, sample_text,
+                                               intervention.get('ts_start'))
             
             # Create enriched intervention
             enriched_intervention = intervention.copy()
@@ -247,6 +245,101 @@ class IdentityMatcher:
         
         return enriched
     
+    def enrich_frame(self, df: pd.DataFrame, speaker_column: str = 'oratore',
+                     ts_column: str = 'ts_start') -> pd.DataFrame:
+        """
+        Enrich an interventions frame with identity information in batch.
+        
+        Each distinct speaker is normalized and matched once; memberships are
+        joined back with an as-of merge on the intervention timestamp (rows
+        without a parseable timestamp get the current membership).
+        
+        Args:
+            df: Interventions frame (columns speaker_column, ts_column,
+                source_url and text)
+            speaker_column: Column with the raw speaker name
+            ts_column: Column with the intervention timestamp
+            
+        Returns:
+            Copy of df with person_id, party_id_at_ts, group_id_aula_at_ts
+        """
+        enriched = df.copy()
+        # Positional index for the joins below; df's index is restored at the end
+        enriched.index = pd.RangeIndex(len(enriched))
+        blank = pd.Series('', index=enriched.index, dtype=object)
+        speakers = enriched[speaker_column].fillna('').astype(str) if speaker_column in enriched else blank
+        source_urls = enriched['source_url'].fillna('').astype(str) if 'source_url' in enriched else blank
+        texts = enriched['text'].fillna('').astype(str).str[:200] if 'text' in enriched else blank
+        
+        # One row per distinct speaker, normalized and matched once;
+        # blank speakers are neither matched nor unmatched, as in match_speaker
+        names = pd.DataFrame({'oratore': speakers, 'source_url': source_urls}).drop_duplicates('oratore')
+        names['norm_name'] = [normalize_name(name) if name.strip() else '' for name in names['oratore']]
+        names['person_id'] = pd.Series([
+            self._resolve_person(norm_name, source_url) if norm_name else None
+            for norm_name, source_url in zip(names['norm_name'], names['source_url'])
+        ], index=names.index, dtype=object)
+        names = names.set_index('oratore')
+        attempted = speakers.map(names['norm_name']).ne('')
+        person_ids = speakers.map(names['person_id'])
+        matched = person_ids.notna()
+        
+        # Every unmatched row counts in the inbox, as in match_speaker, with one entry update per speaker
+        unmatched = attempted & ~matched
+        for raw_name, samples in texts[unmatched].groupby(speakers[unmatched], sort=False):
+            samples = samples.tolist()
+            self.registry_builder.add_to_inbox(raw_name, names.at[raw_name, 'norm_name'], samples[0],
+                                               names.at[raw_name, 'source_url'], samples[1:])
+        
+        enriched['person_id'] = person_ids.astype(object)
+        enriched['party_id_at_ts'] = pd.Series(None, index=enriched.index, dtype=object)
+        enriched['group_id_aula_at_ts'] = pd.Series(None, index=enriched.index, dtype=object)
+        if matched.any():
+            # Membership at ts: as-of join on valid_from, then drop closed intervals
+            if ts_column in enriched:
+                # Naive start times are Rome local times, as in the interventions files
+                ts = to_utc_timestamps(enriched[ts_column], ROME_TZ)
+            else:
+                ts = pd.Series(pd.NaT, index=enriched.index, dtype='datetime64[ns, UTC]')
+            left = pd.DataFrame({
+                'person_id': person_ids[matched],
+                'ts': ts[matched].astype('datetime64[ns, UTC]')
+            })
+            timed = left[left['ts'].notna()].rename_axis('row').reset_index().sort_values('ts', kind='mergesort')
+            intervals = self.memberships.intervals_frame()
+            if not timed.empty and not intervals.empty:
+                joined = pd.merge_asof(
+                    timed, intervals, left_on='ts', right_on='valid_from',
+                    by='person_id', direction='backward'
+                )
+                valid = joined['valid_from'].notna() & (joined['valid_to'].isna() | (joined['ts'] <= joined['valid_to']))
+                memberships = joined[valid].set_index('row')
+                enriched.loc[memberships.index, 'party_id_at_ts'] = memberships['party_id']
+                enriched.loc[memberships.index, 'group_id_aula_at_ts'] = memberships['group_id_aula']
+            
+            # No timestamp: current membership, once per person
+            untimed = left.loc[left['ts'].isna(), 'person_id']
+            current = pd.DataFrame(
+                [self._get_membership_info(person_id, '') for person_id in untimed.unique()],
+                columns=['person_id', 'party_id_at_ts', 'group_id_aula_at_ts']
+            ).set_index('person_id')
+            enriched.loc[untimed.index, 'party_id_at_ts'] = untimed.map(current['party_id_at_ts'])
+            enriched.loc[untimed.index, 'group_id_aula_at_ts'] = untimed.map(current['group_id_aula_at_ts'])
+        
+        # Memberships without a party or group are None, not NaN
+        for column in ['person_id', 'party_id_at_ts', 'group_id_aula_at_ts']:
+            enriched[column] = enriched[column].astype(object).where(enriched[column].notna(), None)
+        enriched.index = df.index
+        
+        self.matched_count += int(matched.sum())
+        self.unmatched_count += int(unmatched.sum())
+        
+        # Save updated inbox
+        if unmatched.any():
+            self.registry_builder._save_all()
+        
+        return enriched
+    
     def get_stats(self) -> Dict:
         """Get matching statistics."""
         return {
@@ -7,26 +7,49 @@ Main CLI for running the ingest pipeline
 import argparse
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, date
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ingest.adapters.camera_html import CameraHTMLAdapter
+from ingest.adapters.camera_html import CameraHTMLAdapter, PARSER_ENGINES
 from ingest.adapters.senato_html import SenatoHTMLAdapter
-from ingest.utils.http import create_session
+from ingest.utils.http import (
+    create_session, document_digest, set_per_host_concurrency, set_raw_store,
+    DEFAULT_PER_HOST_CONCURRENCY, ValidatorStore
+)
+from ingest.utils.raw_store import RawStore, DEFAULT_RAW_STORE_DIR
 from ingest.utils.io import (
-    safe_write_parquet, read_manifest, create_default_manifest,
-    update_manifest, ensure_directory, get_file_size_mb
+    append_parquet_delta, read_manifest, create_default_manifest,
+    update_manifest, ensure_directory, DEFAULT_COMPACT_THRESHOLD,
+    DEFAULT_COMPRESSION_LEVEL, DEFAULT_ROW_GROUP_SIZE
 )
-from ingest.utils.text import test_span_coherence
+from ingest.utils.schema import INTERVENTIONS_SCHEMA
+from ingest.utils.sentences import sentences_path, write_sentences
+from ingest.utils.text import coherent_interventions
+from ingest.utils.discovery_cache import DiscoveryCache, DEFAULT_DISCOVERY_TTL_S
+from ingest.utils.tail_state import TailState
+from ingest.backfill import run_backfill, DEFAULT_BACKFILL_WORKERS, DEFAULT_REQUEST_DELAY_S
+from ingest.identity_matcher import IdentityMatcher
+from identities.utils import configure_name_cache, name_cache_stats, DEFAULT_NAME_CACHE_SIZE
 
 # Import at top level to avoid NameError
 from ingest.utils.io import update_manifest
 
+# Sources in merge order: output is deterministic regardless of completion order
+SOURCES = (
+    ("camera", CameraHTMLAdapter),
+    ("senato", SenatoHTMLAdapter),
+)
+
+# Global deadline for fetching all sources, well within the */5 cron slot
+DEFAULT_DEADLINE_S = 240.0
+
 def setup_logging(verbose: bool = False) -> None:
     """Setup logging configuration"""
     level = logging.DEBUG if verbose else logging.INFO
@@ -38,7 +61,15 @@ def setup_logging(verbose: bool = False) -> None:
         ]
     )
 
-def run_ingest(day: str, verbose: bool = False, dry_run: bool = False) -> bool:
+def run_ingest(day: str, verbose: bool = False, dry_run: bool = False,
+               sequential: bool = False, max_workers: Optional[int] = None,
+               deadline: Optional[float] = DEFAULT_DEADLINE_S,
+               discovery_ttl: float = DEFAULT_DISCOVERY_TTL_S,
+               compact_every: int = DEFAULT_COMPACT_THRESHOLD,
+               tail: bool = True, camera_parser: str = "soup",
+               compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+               row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+               digest_gate: bool = True, emit_sentences: bool = False) -> bool:
     """
     Run the complete ingest pipeline
     
@@ -46,6 +77,17 @@ def run_ingest(day: str, verbose: bool = False, dry_run: bool = False) -> bool:
         day: Date string in YYYY-MM-DD format
         verbose: Enable verbose logging
         dry_run: Run in dry-run mode (no file writing, no manifest updates)
+        sequential: Process sources one after the other instead of concurrently
+        max_workers: Max sources processed at the same time (default: one per source)
+        deadline: Global deadline in seconds for fetching all sources (None = no limit)
+        discovery_ttl: Max age in seconds of cached discovery results (0 = no cache)
+        compact_every: Delta files kept before compacting the daily file
+        tail: Parse live documents incrementally from the last speaker heading
+        camera_parser: Camera parsing engine ("soup" or "stream")
+        compression_level: zstd level of the interventions Parquet files
+        row_group_size: Max rows per Parquet row group
+        digest_gate: Skip documents identical to the last one parsed from their URL
+        emit_sentences: Also write the day's sentences-YYYY-MM-DD.parquet
         
     Returns:
         True if successful, False otherwise
@@ -65,68 +107,55 @@ def run_ingest(day: str, verbose: bool = False, dry_run: bool = False) -> bool:
         manifest = create_default_manifest()
         logger.info("Created new manifest")
     
-    # Create HTTP session
-    session = create_session()
+    # Discovery results are cached next to the manifest
+    discovery_cache = None
+    if discovery_ttl > 0:
+        discovery_cache = DiscoveryCache(str(data_dir / "discovery_cache.json"), discovery_ttl)
     
-    # Initialize adapters
-    camera_adapter = CameraHTMLAdapter()
-    senato_adapter = SenatoHTMLAdapter()
+    # Conditional-GET validators are tracked per URL in the manifest. Each
+    # source works on its own copy so that only completed sources persist them
+    source_validators = {
+        source_name: ValidatorStore(manifest.get("validators"))
+        for source_name, _ in SOURCES
+    }
     
-    all_interventions = []
-    sources_used = {}
+    # Live documents are parsed from where the previous run stopped
+    tail_state = TailState(str(data_dir / "tail_state.json")) if tail else None
+    adapter_options = {
+        "camera": {"parser_engine": camera_parser},
+        "senato": {"tail_state": tail_state}
+    }
     
-    # Process Camera dei Deputati
-    logger.info("Processing Camera dei Deputati")
-    try:
-        camera_interventions = process_source(
-            camera_adapter, session, manifest, "camera"
-        )
-        if camera_interventions:
-            all_interventions.extend(camera_interventions)
-            # Get the source URL used
-            sources_used["camera"] = camera_interventions[0].get("source_url", "unknown")
-            logger.info(f"Camera: {len(camera_interventions)} interventions")
-        else:
-            sources_used["camera"] = "no_data"
-            logger.info("Camera: No interventions found")
-    except Exception as e:
-        logger.error(f"Error processing camera: {e}")
-        sources_used["camera"] = "error"
+    sources = [
+        (source_name, adapter_cls(
+            discovery_cache=discovery_cache,
+            validators=source_validators[source_name],
+            **adapter_options.get(source_name, {})
+        ))
+        for source_name, adapter_cls in SOURCES
+    ]
     
-    # Process Senato della Repubblica
-    logger.info("Processing Senato della Repubblica")
-    try:
-        senato_interventions = process_source(
-            senato_adapter, session, manifest, "senato"
-        )
-        if senato_interventions:
-            all_interventions.extend(senato_interventions)
-            # Get the source URL used
-            sources_used["senato"] = senato_interventions[0].get("source_url", "unknown")
-            logger.info(f"Senato: {len(senato_interventions)} interventions")
-        else:
-            sources_used["senato"] = "no_data"
-            logger.info("Senato: No interventions found")
-    except Exception as e:
-        logger.error(f"Error processing senato: {e}")
-        sources_used["senato"] = "error"
+    # Fetch and parse all sources (concurrently unless sequential)
+    outcomes = collect_sources(
+        manifest,
+        max_workers=max_workers,
+        deadline=deadline,
+        sequential=sequential,
+        sources=sources,
+        digest_gate=digest_gate
+    )
+    validators = merge_validators(manifest.get("validators"), source_validators, outcomes)
+    
+    if discovery_cache and not dry_run:
+        discovery_cache.save()
+    
+    # Merge in fixed source order so the output does not depend on timing
+    all_interventions, sources_used, source_status = merge_outcomes(outcomes, manifest.get("sources"))
     
     # Validate spans coherence
     logger.info("Span validation complete")
     if all_interventions:
-        valid_interventions = []
-        for intervention in all_interventions:
-            try:
-                if test_span_coherence(intervention["text"], intervention["spans_frasi"]):
-                    valid_interventions.append(intervention)
-                else:
-                    logger.warning(f"Span coherence failed for intervention {intervention['id']}")
-            except Exception as e:
-                logger.warning(f"Error testing span coherence: {e}")
-                # Keep the intervention anyway
-                valid_interventions.append(intervention)
-        
-        all_interventions = valid_interventions
+        all_interventions = coherent_interventions(all_interventions)
         logger.info(f"Validated {len(all_interventions)} interventions")
     
     # Write interventions to Parquet file
@@ -143,37 +172,345 @@ def run_ingest(day: str, verbose: bool = False, dry_run: bool = False) -> bool:
             # Convert to DataFrame
             df = pd.DataFrame(all_interventions)
             
-            # Write to Parquet
-            safe_write_parquet(df, str(output_path))
+            # Append new or changed interventions to the day's Parquet file;
+            # only those are matched to the registry, once per distinct speaker
+            write_options = {"compression_level": compression_level, "row_group_size": row_group_size}
+            written = append_parquet_delta(
+                df, str(output_path), compact_threshold=compact_every,
+                schema=INTERVENTIONS_SCHEMA,
+                write_options=write_options,
+                prepare=lambda rows: enrich_identities(rows, data_dir)
+            )
+            
+            file_size = written["file"]["bytes"] / (1024 * 1024)
+            target = written["delta"] or output_filename
+            logger.info(f"Wrote {written['appended']} of {len(all_interventions)} interventions to {target} ({file_size:.2f} MB)")
+            if written["compacted"]:
+                logger.info(f"Compacted deltas into {output_filename}")
             
-            file_size = get_file_size_mb(str(output_path))
-            logger.info(f"Wrote {len(all_interventions)} interventions to {output_filename} ({file_size:.2f} MB)")
+            # Sentences are rebuilt only when the day's interventions changed
+            sentences = None
+            if emit_sentences and (written["appended"] or not sentences_path(str(output_path)).exists()):
+                sentences = write_sentences(str(output_path), write_options=write_options)
+                logger.info(f"Wrote {sentences['record_count']} sentences to {sentences['filename']}")
+            
+            save_tail_state(tail_state, outcomes)
             
             # Update manifest with success
             update_manifest(
                 str(manifest_path),
                 interventions_file=f"public/data/{output_filename}",
                 status="ok",
-                sources=sources_used
+                sources=sources_used,
+                source_status=source_status,
+                validators=validators.to_dict(),
+                deltas=written["deltas"],
+                metrics={"name_cache": name_cache_stats()},
+                file_stats=written["file"],
+                sentences_file=f"public/data/{sentences['filename']}" if sentences else None,
+                sentences_stats=sentences
             )
             
             return True
             
         except Exception as e:
             logger.error(f"Error writing Parquet file: {e}")
-            # Update manifest with error
+            # Update manifest with error, keeping the previous validators so
+            # the documents that failed to be written are fetched again
             update_manifest(str(manifest_path), status="error")
             return False
     else:
         logger.info("No valid interventions to write")
         # Update manifest with no data status
         if not dry_run:
-            update_manifest(str(manifest_path), status="no_data")
+            save_tail_state(tail_state, outcomes)
+            # Nothing to write because nothing changed, rather than nothing found
+            unchanged = all(outcomes[name]["status"] in ("not_modified", "unchanged") for name, _ in SOURCES)
+            update_manifest(
+                str(manifest_path),
+                status="unchanged" if unchanged else "no_data",
+                sources=sources_used,
+                source_status=source_status,
+                validators=validators.to_dict(),
+                metrics={"name_cache": name_cache_stats()}
+            )
         else:
             logger.info("Dry-run mode: manifest not updated")
         return True
 
-def process_source(adapter, session, manifest: Dict, source_name: str) -> List[Dict]:
+def enrich_identities(df: pd.DataFrame, data_dir: Path,
+                      matcher: Optional[IdentityMatcher] = None) -> pd.DataFrame:
+    """
+    Add the registry identity of the speakers to the interventions
+    
+    Speaker names are normalized through the shared name cache (see
+    name_cache_stats). Unmatched speakers go to the identities inbox. A
+    registry that cannot be read leaves the identity columns empty instead
+    of failing the run.
+    
+    Args:
+        df: Interventions of the run
+        data_dir: Directory of the registry files
+        matcher: Matcher to reuse across calls (default: a new one on data_dir)
+        
+    Returns:
+        df with person_id, party_id_at_ts and group_id_aula_at_ts
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        matcher = matcher or IdentityMatcher(str(data_dir))
+        enriched = matcher.enrich_frame(df)
+    except Exception as e:
+        logger.warning(f"Identity enrichment failed: {e}")
+        return df
+    
+    stats = matcher.get_stats()
+    logger.info(f"Identities: {stats['matched_count']} matched, {stats['unmatched_count']} unmatched")
+    return enriched
+
+def backfill(start: date, end: date, workers: int = DEFAULT_BACKFILL_WORKERS,
+             request_delay: float = DEFAULT_REQUEST_DELAY_S,
+             checkpoint_path: Optional[str] = None, dry_run: bool = False,
+             compact_every: int = DEFAULT_COMPACT_THRESHOLD, camera_parser: str = "soup",
+             compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+             row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+             emit_sentences: bool = False) -> bool:
+    """
+    Rebuild the daily interventions files of a date range (see ingest.backfill)
+    
+    Args:
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        workers: Documents fetched at the same time
+        request_delay: Pause in seconds of each worker after a document
+        checkpoint_path: Checkpoint file (default: public/data/backfill_checkpoint.json)
+        dry_run: Fetch and parse without writing partitions or checkpoint
+        compact_every: Delta files kept before compacting a partition
+        camera_parser: Camera parsing engine ("soup" or "stream")
+        compression_level: zstd level of the interventions Parquet files
+        row_group_size: Max rows per Parquet row group
+        emit_sentences: Also write the sentences file of every day backfilled
+        
+    Returns:
+        True if every listed document was backfilled, False otherwise
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"Starting backfill from {start} to {end}")
+    
+    # Past resoconti are final: no discovery cache, validators or tailing
+    adapter_options = {"camera": {"parser_engine": camera_parser}}
+    sources = [
+        (source_name, adapter_cls(**adapter_options.get(source_name, {})))
+        for source_name, adapter_cls in SOURCES
+    ]
+    
+    # One matcher for the whole range: the registry is read once and the
+    # speakers repeated across sessions are normalized from the name cache
+    data_dir = Path("public/data")
+    matcher = IdentityMatcher(str(data_dir))
+    
+    summary = run_backfill(
+        start, end, sources,
+        data_dir=str(data_dir),
+        workers=workers,
+        request_delay=request_delay,
+        checkpoint_path=checkpoint_path,
+        dry_run=dry_run,
+        compact_every=compact_every,
+        schema=INTERVENTIONS_SCHEMA,
+        write_options={"compression_level": compression_level, "row_group_size": row_group_size},
+        emit_sentences=emit_sentences,
+        enrich=lambda df: enrich_identities(df, data_dir, matcher)
+    )
+    cache = name_cache_stats()["normalize_name"]
+    logger.info(f"Name cache: {cache['hits']} hits, {cache['misses']} misses (hit rate {cache['hit_rate']:.1%})")
+    return not summary["failed"] and not summary["failed_sources"]
+
+def run_source(source_name: str, adapter, manifest: Dict, digest_gate: bool = True) -> Dict:
+    """
+    Process a single source on its own HTTP session, timing the run
+    
+    Args:
+        source_name: Name of the source
+        adapter: Source adapter instance
+        manifest: Current manifest data
+        digest_gate: Skip a document identical to the last one parsed
+        
+    Returns:
+        Source outcome dictionary (see process_source) with elapsed_s
+    """
+    start = time.monotonic()
+    # requests.Session is not thread-safe: one session per worker
+    session = create_session()
+    try:
+        outcome = process_source(adapter, session, manifest, source_name, digest_gate)
+    finally:
+        session.close()
+    outcome["elapsed_s"] = round(time.monotonic() - start, 3)
+    return outcome
+
+def collect_sources(manifest: Dict, max_workers: Optional[int] = None,
+                    deadline: Optional[float] = DEFAULT_DEADLINE_S,
+                    sequential: bool = False,
+                    sources: Optional[List[Tuple[str, object]]] = None,
+                    digest_gate: bool = True) -> Dict[str, Dict]:
+    """
+    Fetch and parse all sources, concurrently by default
+    
+    Sources still running when the deadline expires are reported with status
+    "timeout" and their results are discarded. Their worker threads cannot be
+    interrupted and finish in the background (bounded by the HTTP timeouts).
+    
+    Args:
+        manifest: Current manifest data
+        max_workers: Max sources processed at the same time (default: one per source)
+        deadline: Global deadline in seconds (None = no limit)
+        sequential: Process sources one after the other
+        sources: (source_name, adapter) pairs, defaults to all known sources
+        digest_gate: Skip documents identical to the last one parsed from their URL
+        
+    Returns:
+        Dictionary mapping source name to its outcome
+    """
+    logger = logging.getLogger(__name__)
+    
+    if sources is None:
+        sources = [(name, adapter_cls()) for name, adapter_cls in SOURCES]
+    
+    outcomes = {}
+    start = time.monotonic()
+    
+    if sequential:
+        for source_name, adapter in sources:
+            if deadline is not None and time.monotonic() - start >= deadline:
+                logger.error(f"{source_name}: deadline of {deadline}s exceeded, skipping")
+                outcomes[source_name] = _timeout_outcome()
+                continue
+            logger.info(f"Processing {source_name}")
+            outcomes[source_name] = run_source(source_name, adapter, manifest, digest_gate)
+        return outcomes
+    
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or len(sources),
+        thread_name_prefix="ingest"
+    )
+    try:
+        futures = {}
+        for source_name, adapter in sources:
+            logger.info(f"Processing {source_name}")
+            futures[executor.submit(run_source, source_name, adapter, manifest, digest_gate)] = source_name
+        
+        done, not_done = wait(futures, timeout=deadline)
+        
+        for future in done:
+            source_name = futures[future]
+            try:
+                outcomes[source_name] = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {source_name}: {e}")
+                outcomes[source_name] = {"status": "error", "url": None, "interventions": []}
+        
+        for future in not_done:
+            source_name = futures[future]
+            future.cancel()
+            logger.error(f"{source_name}: deadline of {deadline}s exceeded, discarding results")
+            outcomes[source_name] = _timeout_outcome()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    logger.info(f"Fetched {len(sources)} sources in {time.monotonic() - start:.2f}s")
+    return outcomes
+
+def merge_outcomes(outcomes: Dict[str, Dict],
+                   previous_sources: Optional[Dict[str, str]] = None) -> Tuple[List[Dict], Dict[str, str], Dict[str, str]]:
+    """
+    Merge the source outcomes of a run in fixed source order
+    
+    Args:
+        outcomes: Outcome of each source (see process_source)
+        previous_sources: Source URLs recorded by the previous run
+        
+    Returns:
+        Tuple of (interventions, source URL or "error"/"no_data" per source,
+        state per source: "ok", "unchanged", "no_data" or "error"). An
+        unchanged source keeps the URL of its document
+    """
+    logger = logging.getLogger(__name__)
+    previous_sources = previous_sources or {}
+    all_interventions = []
+    sources_used = {}
+    source_status = {}
+    
+    for source_name, _ in SOURCES:
+        outcome = outcomes[source_name]
+        interventions = outcome["interventions"]
+        if outcome["status"] in ("error", "timeout"):
+            sources_used[source_name] = "error"
+            source_status[source_name] = "error"
+        elif outcome["status"] in ("not_modified", "unchanged"):
+            sources_used[source_name] = outcome.get("url") or previous_sources.get(source_name, "unknown")
+            source_status[source_name] = "unchanged"
+            logger.info(f"{source_name}: Document unchanged")
+        elif interventions:
+            all_interventions.extend(interventions)
+            # Get the source URL used
+            sources_used[source_name] = interventions[0].get("source_url", "unknown")
+            source_status[source_name] = "ok"
+            logger.info(f"{source_name}: {len(interventions)} interventions")
+        else:
+            sources_used[source_name] = "no_data"
+            source_status[source_name] = "no_data"
+            logger.info(f"{source_name}: No interventions found")
+    
+    return all_interventions, sources_used, source_status
+
+def merge_validators(previous: Optional[Dict], source_validators: Dict[str, ValidatorStore],
+                     outcomes: Dict[str, Dict]) -> ValidatorStore:
+    """
+    Merge per-source validators, keeping the previous entries of failed sources
+    
+    A source that errored or timed out may have fetched a document it never
+    delivered: persisting its validators would turn the next fetch into a 304
+    and the document would never be parsed.
+    
+    Args:
+        previous: Validators from the manifest before the run
+        source_validators: Validator store used by each source
+        outcomes: Outcome of each source
+        
+    Returns:
+        Merged validator store
+    """
+    entries = ValidatorStore(previous).to_dict()
+    for source_name, store in source_validators.items():
+        if outcomes.get(source_name, {}).get("status") in ("error", "timeout"):
+            continue
+        entries.update(store.to_dict())
+    merged = ValidatorStore(entries)
+    merged.prune()
+    return merged
+
+def save_tail_state(tail_state: Optional[TailState], outcomes: Dict[str, Dict]) -> None:
+    """
+    Persist tail positions once the interventions they cover are stored
+    
+    Args:
+        tail_state: Tail state shared with the adapters (None = tailing disabled)
+        outcomes: Outcome of each source
+    """
+    if tail_state is None:
+        return
+    # A failed or late source may have advanced past interventions it never delivered
+    if outcomes.get("senato", {}).get("status") in ("error", "timeout"):
+        return
+    tail_state.save()
+
+def _timeout_outcome() -> Dict:
+    """Outcome for a source that did not complete before the deadline"""
+    return {"status": "timeout", "url": None, "interventions": []}
+
+def process_source(adapter, session, manifest: Dict, source_name: str,
+                   digest_gate: bool = True) -> Dict:
     """
     Process a single source using the adapter
     
@@ -182,45 +519,58 @@ def process_source(adapter, session, manifest: Dict, source_name: str) -> List[D
         session: HTTP session
         manifest: Current manifest data
         source_name: Name of the source for logging
+        digest_gate: Skip a document whose digest matches the last one parsed
+            from its URL (see ValidatorStore.mark_parsed)
         
     Returns:
-        List of intervention dictionaries
+        Dictionary with: status ("ok", "not_modified", "unchanged", "no_data",
+        "error"), url, interventions
     """
     logger = logging.getLogger(__name__)
     
     try:
-        # Get last known ETag and Last-Modified for this source
-        last_etag = None
-        last_modified = None
-        
-        # Try to get from manifest if available
-        if "sources" in manifest and source_name in manifest["sources"]:
-            source_info = manifest["sources"][source_name]
-            if isinstance(source_info, dict):
-                last_etag = source_info.get("etag")
-                last_modified = source_info.get("last_modified")
-        
-        # Fetch latest data
-        result = adapter.fetch_latest(session, last_etag, last_modified)
+        # Conditional headers come from the adapter's per-URL validator store
+        result = adapter.fetch_latest(session)
         
         # Check if not modified
         if result.get("not_modified", False):
             logger.info(f"{source_name}: Document not modified, skipping")
-            return []
+            return {"status": "not_modified", "url": result.get("url"), "interventions": []}
         
-        # Parse interventions
-        interventions = adapter.parse_interventions(result["html"], result["url"])
+        # Servers that ignore conditional headers answer 200 with the same
+        # body: skip it if it matches the last body parsed (tails are partial)
+        validators = getattr(adapter, "validators", None)
+        digest = None
+        if digest_gate and validators is not None and result.get("tail") is None:
+            digest = document_digest(result["html"])
+            if validators.parsed_digest(result["url"]) == digest:
+                logger.info(f"{source_name}: Document unchanged since last parse, skipping")
+                return {"status": "unchanged", "url": result["url"], "interventions": []}
+        
+        # Parse interventions (only the new part of a tailed live document)
+        if result.get("tail") is not None:
+            interventions = adapter.parse_interventions(result["html"], result["url"], tail=result["tail"])
+        else:
+            interventions = adapter.parse_interventions(result["html"], result["url"])
         
         # Add fetch metadata
         for intervention in interventions:
             intervention["fetch_etag"] = result.get("etag")
             intervention["fetch_last_modified"] = result.get("last_modified")
         
-        return interventions
+        # Persisted with the validators only if the run completes
+        if digest is not None:
+            validators.mark_parsed(result["url"], digest)
+        
+        return {
+            "status": "ok" if interventions else "no_data",
+            "url": result["url"],
+            "interventions": interventions
+        }
         
     except Exception as e:
         logger.error(f"Error processing {source_name}: {e}")
-        return []
+        return {"status": "error", "url": None, "interventions": []}
 
 def main():
     """Main CLI entry point"""
@@ -241,21 +591,186 @@ def main():
         action="store_true",
         help="Run in dry-run mode (no file writing, no manifest updates)"
     )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Process sources one after the other instead of concurrently"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Max sources processed at the same time (default: one per source)"
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST_CONCURRENCY,
+        help=f"Max concurrent requests per host (default: {DEFAULT_PER_HOST_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=DEFAULT_DEADLINE_S,
+        help=f"Global deadline in seconds for fetching all sources (default: {DEFAULT_DEADLINE_S:.0f})"
+    )
+    parser.add_argument(
+        "--discovery-ttl",
+        type=float,
+        default=DEFAULT_DISCOVERY_TTL_S,
+        help=f"Max age in seconds of cached discovery results, 0 disables the cache (default: {DEFAULT_DISCOVERY_TTL_S})"
+    )
+    parser.add_argument(
+        "--compact-every",
+        type=int,
+        default=DEFAULT_COMPACT_THRESHOLD,
+        help=f"Delta files kept before compacting the daily file, 1 rewrites it every run (default: {DEFAULT_COMPACT_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--no-tail",
+        action="store_true",
+        help="Parse live documents in full on every run instead of from the last speaker heading"
+    )
+    parser.add_argument(
+        "--camera-parser",
+        choices=PARSER_ENGINES,
+        default="soup",
+        help="Camera parsing engine: BeautifulSoup tree walks or single-pass stream (default: soup)"
+    )
+    parser.add_argument(
+        "--zstd-level",
+        type=int,
+        default=DEFAULT_COMPRESSION_LEVEL,
+        help=f"zstd compression level of the interventions Parquet files (default: {DEFAULT_COMPRESSION_LEVEL})"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help=f"Max rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})"
+    )
+    parser.add_argument(
+        "--emit-sentences",
+        action="store_true",
+        help="Also write sentences-YYYY-MM-DD.parquet, one row per sentence of the day's interventions"
+    )
+    parser.add_argument(
+        "--name-cache-size",
+        type=int,
+        default=DEFAULT_NAME_CACHE_SIZE,
+        help=f"Entries of the name normalization caches, 0 disables them (default: {DEFAULT_NAME_CACHE_SIZE})"
+    )
+    parser.add_argument(
+        "--raw-store",
+        type=str,
+        default=None,
+        help="Keep a content-addressed copy of every fetched document in this directory"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help=f"Serve every request from the raw store instead of the network (default store: {DEFAULT_RAW_STORE_DIR}); "
+             "documents are parsed in full, without discovery cache, tailing or digest gate"
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_day",
+        type=str,
+        default=None,
+        help="Backfill the sessions held from this date (YYYY-MM-DD) instead of polling the latest one"
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_day",
+        type=str,
+        default=None,
+        help="Last date of the backfill, inclusive (YYYY-MM-DD, default: today)"
+    )
+    parser.add_argument(
+        "--backfill-workers",
+        type=int,
+        default=DEFAULT_BACKFILL_WORKERS,
+        help=f"Documents fetched at the same time during a backfill (default: {DEFAULT_BACKFILL_WORKERS})"
+    )
+    parser.add_argument(
+        "--request-delay",
+        type=float,
+        default=DEFAULT_REQUEST_DELAY_S,
+        help=f"Pause in seconds of each backfill worker after a document (default: {DEFAULT_REQUEST_DELAY_S})"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Backfill checkpoint file (default: public/data/backfill_checkpoint.json)"
+    )
     
     args = parser.parse_args()
     
     # Validate date format
-    try:
-        datetime.strptime(args.day, "%Y-%m-%d")
-    except ValueError:
-        print(f"Error: Invalid date format '{args.day}'. Use YYYY-MM-DD format.")
-        sys.exit(1)
+    for value in (args.day, args.from_day, args.to_day):
+        if value is None:
+            continue
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            print(f"Error: Invalid date format '{value}'. Use YYYY-MM-DD format.")
+            sys.exit(1)
     
     # Setup logging
     setup_logging(args.verbose)
     
+    # Limit concurrent requests per host
+    set_per_host_concurrency(args.per_host)
+    
+    # Bound the process-wide name normalization caches
+    configure_name_cache(args.name_cache_size)
+    
+    # Write responses through to the raw store, or replay them from it
+    if args.raw_store or args.replay:
+        set_raw_store(RawStore(args.raw_store or DEFAULT_RAW_STORE_DIR), replay=args.replay)
+    if args.replay:
+        # Stored documents are complete and local: parse them in full, without pauses
+        args.discovery_ttl = 0
+        args.no_tail = True
+        args.request_delay = 0
+    
+    if args.from_day:
+        start = date.fromisoformat(args.from_day)
+        end = date.fromisoformat(args.to_day) if args.to_day else date.today()
+        if end < start:
+            print(f"Error: --to {end} is before --from {start}")
+            sys.exit(1)
+        success = backfill(
+            start, end,
+            workers=args.backfill_workers,
+            request_delay=args.request_delay,
+            checkpoint_path=args.checkpoint,
+            dry_run=args.dry_run,
+            compact_every=args.compact_every,
+            camera_parser=args.camera_parser,
+            compression_level=args.zstd_level,
+            row_group_size=args.row_group_size,
+            emit_sentences=args.emit_sentences
+        )
+        print("Backfill completed" if success else "Backfill incomplete, run again to resume")
+        sys.exit(0 if success else 1)
+    
     # Run ingest
-    success = run_ingest(args.day, args.verbose, args.dry_run)
+    success = run_ingest(
+        args.day, args.verbose, args.dry_run,
+        sequential=args.sequential,
+        max_workers=args.max_workers,
+        deadline=args.deadline if args.deadline > 0 else None,
+        discovery_ttl=args.discovery_ttl,
+        compact_every=args.compact_every,
+        tail=not args.no_tail,
+        camera_parser=args.camera_parser,
+        compression_level=args.zstd_level,
+        row_group_size=args.row_group_size,
+        digest_gate=not args.replay,
+        emit_sentences=args.emit_sentences
+    )
     
     if success:
         print("Ingest pipeline completed")
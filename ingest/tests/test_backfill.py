@@ -0,0 +1,240 @@
+"""Tests for the historical backfill runner."""
+import json
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.adapters.camera_html import CameraHTMLAdapter  # noqa: E402
+from ingest.backfill import run_backfill  # noqa: E402
+from ingest.utils.schema import INTERVENTIONS_SCHEMA  # noqa: E402
+
+
+class FakeAdapter:
+    """Adapter listing canned documents, one intervention each."""
+
+    def __init__(self, source, days, failing=()):
+        self.source = source
+        self.days = days
+        self.failing = set(failing)
+        self.fetched = []
+
+    def list_sessions(self, session, start, end):
+        return [
+            {"key": f"{self.source}:{day}", "date": day}
+            for day in self.days
+            if start.isoformat() <= day <= end.isoformat()
+        ]
+
+    def fetch_document(self, session, document):
+        self.fetched.append(document["key"])
+        if document["key"] in self.failing:
+            raise RuntimeError("boom")
+        return {
+            "html": "<html></html>",
+            "etag": None,
+            "last_modified": None,
+            "url": f"https://{self.source}.example/{document['date']}",
+        }
+
+    def parse_interventions(self, html, source_url, session_date=None):
+        text = f"Intervento {self.source}."
+        return [
+            {
+                "id": f"{self.source}-{session_date}",
+                "source": self.source,
+                "seduta": "Seduta Assemblea",
+                "ts_start": f"{session_date}T10:00:00",
+                "oratore": "Rossi",
+                "gruppo": "",
+                "text": text,
+                "spans_frasi": [{"start": 0, "end": len(text)}],
+                "source_url": source_url,
+                "ingested_at": "2025-01-27T10:00:00",
+            }
+        ]
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+
+
+class FakeSession:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse(self.text)
+
+
+class FakePagedSession:
+    """Session serving listing pages by URL, recording the URLs fetched."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.fetched.append(url)
+        return FakeResponse(self.pages[url])
+
+
+class TestBackfill(unittest.TestCase):
+    """Test cases for date-range backfills."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.checkpoint = str(Path(self.test_dir) / "checkpoint.json")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def backfill(self, sources, start="2025-01-01", end="2025-01-31", **options):
+        return run_backfill(
+            date.fromisoformat(start),
+            date.fromisoformat(end),
+            sources,
+            data_dir=self.test_dir,
+            workers=2,
+            request_delay=0,
+            checkpoint_path=self.checkpoint,
+            schema=INTERVENTIONS_SCHEMA,
+            **options,
+        )
+
+    def test_one_partition_per_day(self):
+        """Documents of the same day from different sources share one partition."""
+        camera = FakeAdapter("camera", ["2025-01-14", "2025-01-15", "2025-02-01"])
+        senato = FakeAdapter("senato", ["2025-01-15"])
+
+        summary = self.backfill([("camera", camera), ("senato", senato)])
+
+        self.assertEqual(summary["documents"], 3)
+        self.assertEqual(summary["days"], ["2025-01-14", "2025-01-15"])
+        df = pd.read_parquet(Path(self.test_dir) / "interventions-2025-01-15.parquet")
+        self.assertEqual(sorted(df["source"]), ["camera", "senato"])
+        self.assertEqual(list(Path(self.test_dir).glob("*.delta-*.parquet")), [])
+
+    def test_sentences_follow_partitions(self):
+        """With emit_sentences every written day gets its sentences file."""
+        camera = FakeAdapter("camera", ["2025-01-14", "2025-01-15"])
+
+        self.backfill([("camera", camera)], emit_sentences=True)
+
+        sentences = pd.read_parquet(
+            Path(self.test_dir) / "sentences-2025-01-15.parquet"
+        )
+        self.assertEqual(list(sentences["intervention_id"]), ["camera-2025-01-15"])
+        self.assertEqual(list(sentences["text"]), ["Intervento camera."])
+        self.assertTrue((Path(self.test_dir) / "sentences-2025-01-14.parquet").exists())
+
+    def test_enrich_is_applied_before_writing(self):
+        """The enrich hook sees each document's written rows; its columns are kept."""
+        camera = FakeAdapter("camera", ["2025-01-14", "2025-01-15"])
+
+        self.backfill(
+            [("camera", camera)], enrich=lambda df: df.assign(person_id="P000001")
+        )
+
+        df = pd.read_parquet(Path(self.test_dir) / "interventions-2025-01-14.parquet")
+        self.assertEqual(list(df["person_id"]), ["P000001"])
+
+    def test_resume_skips_done_and_retries_failed(self):
+        """A second run fetches only the documents that failed."""
+        camera = FakeAdapter(
+            "camera", ["2025-01-14", "2025-01-15"], failing=["camera:2025-01-15"]
+        )
+        summary = self.backfill([("camera", camera)])
+        self.assertEqual(summary["failed"], ["camera:2025-01-15"])
+        with open(self.checkpoint, encoding="utf-8") as f:
+            self.assertEqual(list(json.load(f)["done"]), ["camera:2025-01-14"])
+
+        camera = FakeAdapter("camera", ["2025-01-14", "2025-01-15"])
+        summary = self.backfill([("camera", camera)])
+        self.assertEqual(camera.fetched, ["camera:2025-01-15"])
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["failed"], [])
+
+    def test_camera_listing_is_filtered_by_date(self):
+        """Camera sessions are dated from their listing rows."""
+        listing = """<html><body><ul>
+            <li>
+              <a href="/leg19/207?idSeduta=410">Seduta n. 410 del 16 gennaio 2025</a>
+            </li>
+            <li><a href="/leg19/207?idSeduta=409">Seduta n. 409</a> - 15/01/2025</li>
+            <li>
+              <a href="/leg19/207?idSeduta=380">Seduta n. 380 del 3 dicembre 2024</a>
+            </li>
+        </ul></body></html>"""
+
+        sessions = CameraHTMLAdapter().list_sessions(
+            FakeSession(listing), date(2025, 1, 1), date(2025, 1, 31)
+        )
+
+        self.assertEqual(
+            [(s["id_seduta"], s["date"]) for s in sessions],
+            [("409", "2025-01-15"), ("410", "2025-01-16")],
+        )
+        self.assertEqual(sessions[0]["key"], "camera:409")
+
+    def test_listing_pages_are_followed_back_to_start(self):
+        """Older sessions on later listing pages are listed, up to the start only."""
+        session = FakePagedSession(
+            {
+                "https://www.camera.it/leg19/207": """<html><body><ul>
+                <li>
+                <a href="/leg19/207?idSeduta=410">Seduta n. 410 del 16 gennaio 2025</a>
+                </li>
+            </ul><a href="/leg19/207?pagina=2">Successiva »</a></body></html>""",
+                "https://www.camera.it/leg19/207?pagina=2": """<html><body><ul>
+                <li>
+                <a href="/leg19/207?idSeduta=395">Seduta n. 395 del 20 dicembre 2024</a>
+                </li>
+            </ul><a rel="next" href="/leg19/207?pagina=3">›</a></body></html>""",
+            }
+        )
+
+        sessions = CameraHTMLAdapter().list_sessions(
+            session, date(2024, 12, 20), date(2025, 1, 31)
+        )
+
+        self.assertEqual([s["id_seduta"] for s in sessions], ["395", "410"])
+        self.assertEqual(len(session.fetched), 2)
+
+    def test_listing_not_reaching_start_fails_the_source(self):
+        """A range before the oldest listed session fails its source, unsaved."""
+        listing = """<html><body><ul>
+            <li>
+              <a href="/leg19/207?idSeduta=410">Seduta n. 410 del 16 gennaio 2025</a>
+            </li>
+        </ul></body></html>"""
+        with self.assertRaises(ValueError):
+            CameraHTMLAdapter().list_sessions(
+                FakeSession(listing), date(2025, 1, 1), date(2025, 1, 31)
+            )
+
+        class ShortListing(FakeAdapter):
+            def list_sessions(self, session, start, end):
+                return CameraHTMLAdapter().list_sessions(
+                    FakeSession(listing), start, end
+                )
+
+        summary = self.backfill([("camera", ShortListing("camera", []))])
+        self.assertEqual(summary["failed_sources"], ["camera"])
+        self.assertEqual(summary["written"], 0)
+        self.assertFalse(Path(self.checkpoint).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
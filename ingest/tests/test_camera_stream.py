@@ -0,0 +1,70 @@
+"""Tests for the single-pass Camera parsing engine."""
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.adapters.camera_html import CameraHTMLAdapter  # noqa: E402
+from ingest.adapters.camera_stream import parse_document  # noqa: E402
+
+MARKED_DOCUMENT = """<html><head><title>Seduta del 15 gennaio 2025</title></head><body>
+<div class="content">
+    <p class="oratore">Interviene ROSSI (PD-IDP)</p>
+    <p>Ore 14:30 - Signor Presidente, intervengo <b>sul</b> provvedimento.</p>
+    <!-- nota redazionale -->
+    <div>Chiedo un voto favorevole.</div>
+    <p class="oratore">Interviene  BIANCHI (FDI)</p>
+    <p>Ore 14:45 - Dichiaro il voto contrario.</p>
+    <p></p>
+</div>
+<p class="oratore">Interviene VERDI (M5S)</p>
+</body></html>"""
+
+
+class TestCameraStreamEngine(unittest.TestCase):
+    """Test cases for parity between the soup and stream engines."""
+
+    def setUp(self):
+        self.soup = CameraHTMLAdapter(parser_engine="soup")
+        self.stream = CameraHTMLAdapter(parser_engine="stream")
+        self.fixtures_dir = Path(__file__).parent / "fixtures"
+
+    def assert_same_interventions(self, html):
+        def strip(items):
+            return [{k: v for k, v in i.items() if k != "ingested_at"} for i in items]
+
+        url = "https://www.camera.it/test"
+        expected = self.soup.parse_interventions(html, url)
+        actual = self.stream.parse_interventions(html, url)
+        self.assertEqual(strip(actual), strip(expected))
+        return actual
+
+    def test_marked_document(self):
+        """Marker blocks overlap and skip empty siblings like the soup engine."""
+        interventions = self.assert_same_interventions(MARKED_DOCUMENT)
+        self.assertEqual([i["oratore"] for i in interventions], ["ROSSI", "BIANCHI"])
+
+    def test_fixtures(self):
+        """Both engines agree on the test fixtures (line-based fallback)."""
+        for path in sorted(self.fixtures_dir.glob("*.html")):
+            with self.subTest(fixture=path.name):
+                self.assert_same_interventions(path.read_text(encoding="utf-8"))
+
+    def test_document_title(self):
+        """The first h1 wins over the title element."""
+        self.assertEqual(
+            parse_document("<title>A</title><h1>B<h1>C</h1></h1>")["title"], "BC"
+        )
+        self.assertEqual(parse_document("<title>A</title><p>x</p>")["title"], "A")
+        self.assertIsNone(parse_document("")["title"])
+
+    def test_unknown_engine(self):
+        """Unknown engines are rejected."""
+        with self.assertRaises(ValueError):
+            CameraHTMLAdapter(parser_engine="regex")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for the discovery cache."""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.adapters.camera_html import CameraHTMLAdapter  # noqa: E402
+from ingest.utils.discovery_cache import DiscoveryCache  # noqa: E402
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeCameraSite:
+    """Serves the Camera discovery chain and honours If-None-Match."""
+
+    def __init__(self, id_seduta="555", etag='"v1"'):
+        self.id_seduta = id_seduta
+        self.etag = etag
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requested.append(url)
+        headers = headers or {}
+        if url.endswith("/leg19/207"):
+            if self.etag and headers.get("If-None-Match") == self.etag:
+                return FakeResponse(304)
+            html = f'<a href="/leg19/410?idSeduta={self.id_seduta}">Seduta</a>'
+            return FakeResponse(200, html, {"ETag": self.etag} if self.etag else {})
+        if "idSeduta=" in url and "/leg19/410" in url:
+            return FakeResponse(200, '<a href="/leg19/resoconto">Vai al resoconto</a>')
+        if url.endswith("/leg19/resoconto"):
+            return FakeResponse(200, '<a href="/leg19/sommario">Sommario</a>')
+        return FakeResponse(404)
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    """Test cases for cached adapter discovery."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = Path(self.test_dir) / "discovery_cache.json"
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def test_not_modified_listing_skips_deeper_hops(self):
+        """A 304 on the listing page reuses the cached result."""
+        site = FakeCameraSite()
+        adapter = CameraHTMLAdapter(
+            discovery_cache=DiscoveryCache(str(self.cache_path))
+        )
+
+        first = adapter.discover_latest(site)
+        self.assertEqual(first["id_seduta"], "555")
+        self.assertEqual(len(site.requested), 3)
+
+        site.requested.clear()
+        second = adapter.discover_latest(site)
+        self.assertEqual(second, first)
+        self.assertEqual(len(site.requested), 1)
+
+    def test_unchanged_top_link_skips_deeper_hops(self):
+        """Without validators, an unchanged top link still reuses the cache."""
+        site = FakeCameraSite(etag=None)
+        adapter = CameraHTMLAdapter(
+            discovery_cache=DiscoveryCache(str(self.cache_path))
+        )
+
+        adapter.discover_latest(site)
+        site.requested.clear()
+        adapter.discover_latest(site)
+        self.assertEqual(len(site.requested), 1)
+
+        # A new session on the listing page triggers a full discovery
+        site.id_seduta = "556"
+        site.requested.clear()
+        result = adapter.discover_latest(site)
+        self.assertEqual(result["id_seduta"], "556")
+        self.assertEqual(len(site.requested), 3)
+
+    def test_cache_persists_and_expires(self):
+        """Saved entries are reused by a new process until the TTL expires."""
+        site = FakeCameraSite()
+        cache = DiscoveryCache(str(self.cache_path))
+        CameraHTMLAdapter(discovery_cache=cache).discover_latest(site)
+        cache.save()
+
+        reloaded = DiscoveryCache(str(self.cache_path))
+        self.assertEqual(reloaded.get_fresh("camera")["result"]["id_seduta"], "555")
+
+        expired = DiscoveryCache(str(self.cache_path), ttl_seconds=0)
+        self.assertIsNone(expired.get_fresh("camera"))
+
+
+if __name__ == "__main__":
+    unittest.main()
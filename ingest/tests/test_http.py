@@ -0,0 +1,163 @@
+"""Tests for HTTP utilities."""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils.http import (  # noqa: E402
+    RawStoreMiss,
+    ValidatorStore,
+    fetch_with_etag,
+    set_raw_store,
+)
+from ingest.utils.io import create_default_manifest, update_manifest  # noqa: E402
+from ingest.utils.raw_store import RawStore  # noqa: E402
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.encoding = "utf-8"
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeServer:
+    """Serves one document per URL and honours If-None-Match."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.sent_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        self.sent_headers.append(headers)
+        etag = f'"{len(self.documents[url])}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.documents[url], {"ETag": etag})
+
+
+class TestValidatorStore(unittest.TestCase):
+    """Test cases for per-URL conditional GET validators."""
+
+    def test_validators_are_tracked_per_url(self):
+        """Each URL is revalidated with its own ETag."""
+        server = FakeServer(
+            {"https://a.example/1": "uno", "https://a.example/2": "due due"}
+        )
+        store = ValidatorStore()
+
+        first = fetch_with_etag(server, "https://a.example/1", validators=store)
+        fetch_with_etag(server, "https://a.example/2", validators=store)
+        self.assertEqual(first["status_code"], 200)
+        self.assertEqual(store.get("https://a.example/1")["etag"], '"3"')
+        self.assertEqual(store.get("https://a.example/2")["etag"], '"7"')
+        self.assertEqual(len(store.get("https://a.example/1")["digest"]), 64)
+
+        second = fetch_with_etag(server, "https://a.example/1", validators=store)
+        self.assertEqual(second["status_code"], 304)
+        self.assertEqual(server.sent_headers[-1]["If-None-Match"], '"3"')
+        self.assertEqual(second["digest"], first["digest"])
+
+    def test_unconditional_fetch_still_records(self):
+        """conditional=False always downloads but keeps the store current."""
+        server = FakeServer({"https://a.example/1": "uno"})
+        store = ValidatorStore({"https://a.example/1": {"etag": '"3"'}})
+
+        result = fetch_with_etag(
+            server, "https://a.example/1", validators=store, conditional=False
+        )
+
+        self.assertEqual(result["status_code"], 200)
+        self.assertNotIn("If-None-Match", server.sent_headers[-1])
+        self.assertIsNotNone(store.get("https://a.example/1")["checked_at"])
+
+    def test_validators_persist_in_manifest(self):
+        """Validators are written to the manifest without touching sources."""
+        test_dir = tempfile.mkdtemp()
+        manifest_path = Path(test_dir) / "manifest.json"
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(create_default_manifest(), f)
+
+        store = ValidatorStore()
+        store.record("https://a.example/1", '"3"', None, "0" * 64)
+        update_manifest(
+            str(manifest_path),
+            status="no_data",
+            sources={"camera": "https://a.example/1"},
+            validators=store.to_dict(),
+        )
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["sources"]["camera"], "https://a.example/1")
+        reloaded = ValidatorStore(manifest["validators"])
+        self.assertEqual(reloaded.get("https://a.example/1")["etag"], '"3"')
+
+        import shutil
+
+        shutil.rmtree(test_dir)
+
+
+class TestRawStore(unittest.TestCase):
+    """Test cases for the raw response store and replay mode."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        set_raw_store(None)
+        shutil.rmtree(self.test_dir)
+
+    def test_bodies_are_stored_once_per_digest(self):
+        """Identical bodies share one object; unchanged puts do not grow the index."""
+        store = RawStore(self.test_dir)
+        first = store.put("https://a.example/1", "Intervento".encode("utf-8"), "utf-8")
+        store.put("https://a.example/1", "Intervento".encode("utf-8"), "utf-8")
+        second = store.put("https://a.example/2", "Intervento".encode("utf-8"), "utf-8")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(list(Path(self.test_dir, "objects").rglob("*.gz"))), 1)
+        with open(store.index_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(
+            RawStore(self.test_dir).get("https://a.example/1")["content"],
+            "Intervento".encode("utf-8"),
+        )
+
+    def test_replay_serves_fetched_documents_offline(self):
+        """Write-through responses are replayed without touching the network."""
+        server = FakeServer({"https://a.example/1": "Seduta del 15 gennaio 2025"})
+        set_raw_store(RawStore(self.test_dir))
+        live = fetch_with_etag(server, "https://a.example/1")
+
+        set_raw_store(RawStore(self.test_dir), replay=True)
+        requests_before = len(server.sent_headers)
+        replayed = fetch_with_etag(
+            server, "https://a.example/1", last_etag=live["etag"]
+        )
+
+        self.assertEqual(len(server.sent_headers), requests_before)
+        self.assertEqual(replayed["status_code"], 200)
+        self.assertEqual(replayed["content"], live["content"])
+        self.assertEqual(replayed["etag"], live["etag"])
+        with self.assertRaises(RawStoreMiss):
+            fetch_with_etag(server, "https://a.example/2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for stable intervention IDs."""
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils.ids import (  # noqa: E402
+    canonical_timestamp,
+    content_fingerprint,
+    intervention_id,
+)
+from ingest.utils.schema import INTERVENTIONS_SCHEMA, conform_table  # noqa: E402
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+class TestStableIds(unittest.TestCase):
+    """Test cases for process-independent IDs."""
+
+    def test_fingerprint_is_the_same_in_every_process(self):
+        """Fingerprints do not depend on the per-process hash seed."""
+        code = (
+            "from ingest.utils.ids import content_fingerprint; "
+            "print(content_fingerprint('Signor Presidente, colleghi.'))"
+        )
+        outputs = set()
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.add(
+                subprocess.run(
+                    [sys.executable, "-c", code],
+                    cwd=REPO_ROOT,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+            )
+        self.assertEqual(
+            outputs, {content_fingerprint("Signor Presidente,  colleghi.\n")}
+        )
+
+    def test_id_can_be_recomputed_from_stored_row(self):
+        """The typed ts_start read back from Parquet gives the ID of the parser."""
+        text = "Intervengo sul provvedimento."
+        parsed = {
+            "source": "camera",
+            "seduta": "Seduta Assemblea",
+            "ts_start": "2025-01-27T14:30:00",
+            "oratore": "ROSSI Mario",
+            "text": text,
+        }
+        parsed["id"] = intervention_id(
+            parsed["source"],
+            parsed["seduta"],
+            parsed["ts_start"],
+            parsed["oratore"],
+            content_fingerprint(text),
+        )
+
+        stored = (
+            conform_table(pd.DataFrame([parsed]), INTERVENTIONS_SCHEMA)
+            .to_pandas()
+            .iloc[0]
+        )
+
+        self.assertEqual(
+            canonical_timestamp(stored["ts_start"]), "2025-01-27T13:30:00Z"
+        )
+        self.assertEqual(
+            intervention_id(
+                stored["source"],
+                stored["seduta"],
+                stored["ts_start"],
+                stored["oratore"],
+                content_fingerprint(stored["text"]),
+            ),
+            parsed["id"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,320 @@
+"""Tests for incremental Parquet writing."""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils.io import (  # noqa: E402
+    append_parquet_delta,
+    compact_parquet_deltas,
+    delta_paths,
+    file_checksum,
+    load_existing_ids,
+    read_manifest,
+    update_manifest,
+)
+from ingest.utils.schema import INTERVENTIONS_SCHEMA, spans_frasi  # noqa: E402
+
+
+def make_frame(rows):
+    """Build an interventions frame from (id, text) pairs"""
+    return pd.DataFrame(
+        [
+            {
+                "id": id_,
+                "ts_start": "",
+                "oratore": "Rossi",
+                "gruppo": "",
+                "text": text,
+                "ingested_at": "2025-01-27T10:00:00",
+            }
+            for id_, text in rows
+        ]
+    )
+
+
+class TestIncrementalParquet(unittest.TestCase):
+    """Test cases for append-only daily Parquet files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_path = str(Path(self.test_dir) / "interventions-2025-01-27.parquet")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def test_only_new_rows_are_appended(self):
+        """Rows already written are skipped by key, new rows go to a delta."""
+        first = append_parquet_delta(
+            make_frame([("a", "uno"), ("b", "due")]), self.output_path
+        )
+        self.assertEqual(first["appended"], 2)
+        self.assertIsNone(first["delta"])
+
+        # Same rows with a different ingested_at: nothing to write
+        second = append_parquet_delta(
+            make_frame([("a", "uno"), ("b", "due")]), self.output_path
+        )
+        self.assertEqual(second["appended"], 0)
+        self.assertEqual(delta_paths(self.output_path), [])
+
+        # Ids hash the text: a changed row has a new id
+        third = append_parquet_delta(
+            make_frame([("b", "due"), ("b2", "due e tre"), ("c", "tre")]),
+            self.output_path,
+        )
+        self.assertEqual(third["appended"], 2)
+        self.assertEqual(
+            third["deltas"], ["interventions-2025-01-27.delta-0001.parquet"]
+        )
+        self.assertEqual(third["file"]["record_count"], 4)
+        self.assertEqual(load_existing_ids(self.output_path), {"a", "b", "b2", "c"})
+
+    def test_compaction_keeps_order_and_missing_rows(self):
+        """Compaction folds deltas in, keeping rows missing from later fetches."""
+        append_parquet_delta(make_frame([("a", "uno"), ("b", "due")]), self.output_path)
+        append_parquet_delta(
+            make_frame([("b", "due"), ("b2", "due bis")]), self.output_path
+        )
+        append_parquet_delta(make_frame([("c", "tre")]), self.output_path)
+
+        self.assertEqual(compact_parquet_deltas(self.output_path)["record_count"], 4)
+        self.assertEqual(delta_paths(self.output_path), [])
+
+        df = pd.read_parquet(self.output_path)
+        self.assertEqual(list(df["id"]), ["a", "b", "b2", "c"])
+        self.assertEqual(df.set_index("id").loc["b2", "text"], "due bis")
+
+    def test_threshold_triggers_compaction(self):
+        """Reaching the threshold compacts automatically."""
+        append_parquet_delta(
+            make_frame([("a", "uno")]), self.output_path, compact_threshold=2
+        )
+        result = append_parquet_delta(
+            make_frame([("b", "due")]), self.output_path, compact_threshold=2
+        )
+        self.assertFalse(result["compacted"])
+
+        result = append_parquet_delta(
+            make_frame([("c", "tre")]), self.output_path, compact_threshold=2
+        )
+        self.assertTrue(result["compacted"])
+        self.assertEqual(result["deltas"], [])
+        self.assertEqual(len(pd.read_parquet(self.output_path)), 3)
+
+    def test_prepare_sees_only_written_rows(self):
+        """The prepare hook runs on the rows written, never on rows already on disk."""
+        seen = []
+
+        def prepare(rows):
+            seen.append(list(rows["id"]))
+            return rows.assign(person_id="P000001")
+
+        append_parquet_delta(
+            make_frame([("a", "uno")]), self.output_path, prepare=prepare
+        )
+        append_parquet_delta(
+            make_frame([("a", "uno")]), self.output_path, prepare=prepare
+        )
+        append_parquet_delta(
+            make_frame([("a", "uno"), ("b", "due")]), self.output_path, prepare=prepare
+        )
+
+        self.assertEqual(seen, [["a"], ["b"]])
+        compact_parquet_deltas(self.output_path)
+        self.assertEqual(
+            list(pd.read_parquet(self.output_path)["person_id"]), ["P000001"] * 2
+        )
+
+    def test_file_stats_match_written_file(self):
+        """Writer stats match the file on disk and feed the manifest unread."""
+        first = append_parquet_delta(
+            make_frame([("a", "uno"), ("b", "due")]), self.output_path
+        )
+        self.assertEqual(first["file"]["checksum"], file_checksum(self.output_path))
+        self.assertEqual(first["file"]["record_count"], 2)
+        self.assertEqual(first["file"]["bytes"], Path(self.output_path).stat().st_size)
+
+        manifest_path = str(Path(self.test_dir) / "manifest.json")
+        update_manifest(
+            manifest_path,
+            interventions_file=f"public/data/{Path(self.output_path).name}",
+            status="ok",
+            file_stats=first["file"],
+        )
+
+        # A delta leaves the daily file as it is: same checksum, rows counted across
+        # files
+        second = append_parquet_delta(
+            make_frame([("b", "due bis"), ("c", "tre")]), self.output_path
+        )
+        self.assertIsNone(second["file"]["checksum"])
+        self.assertEqual(second["file"]["record_count"], 3)
+        update_manifest(
+            manifest_path,
+            interventions_file=f"public/data/{Path(self.output_path).name}",
+            status="ok",
+            deltas=second["deltas"],
+            file_stats=second["file"],
+        )
+
+        entry = read_manifest(manifest_path)["files"]["interventions"]
+        self.assertEqual(entry["checksum"], first["file"]["checksum"])
+        self.assertEqual(entry["record_count"], 3)
+
+    def test_grown_speech_replaces_truncated_row(self):
+        """A speech cut short by a poll is replaced by the row flagged as its sequel."""
+
+        def poll(rows):
+            return pd.DataFrame(
+                [
+                    {
+                        "id": id_,
+                        "source": "senato",
+                        "seduta": "Seduta n. 1",
+                        "ts_start": "",
+                        "oratore": oratore,
+                        "gruppo": "",
+                        "text": text,
+                        "ingested_at": "2025-01-27T10:00:00",
+                        "supersedes": supersedes,
+                    }
+                    for id_, oratore, text, supersedes in rows
+                ]
+            )
+
+        append_parquet_delta(
+            poll(
+                [
+                    (
+                        "p1",
+                        "PRESIDENTE",
+                        "Ha facoltà di parlare il senatore Rossi.",
+                        None,
+                    ),
+                    ("r1", "ROSSI", "Signor Presidente,", None),
+                ]
+            ),
+            self.output_path,
+        )
+        second = append_parquet_delta(
+            poll(
+                [
+                    ("r2", "ROSSI", "Signor Presidente, intervengo.", "r1"),
+                    ("p2", "PRESIDENTE", "Ne ha facoltà.", None),
+                ]
+            ),
+            self.output_path,
+        )
+        self.assertEqual(second["file"]["record_count"], 3)
+
+        compact_parquet_deltas(self.output_path)
+        df = pd.read_parquet(self.output_path)
+        self.assertEqual(list(df["id"]), ["p1", "r2", "p2"])
+        self.assertEqual(
+            df.set_index("id").loc["r2", "text"], "Signor Presidente, intervengo."
+        )
+
+    def test_unflagged_turn_is_kept(self):
+        """A later turn of the same speaker extending the previous text is kept."""
+        rows = [
+            ("p1", "Ha facoltà di parlare."),
+            ("r1", "Grazie."),
+            ("r2", "Grazie. Concludo."),
+        ]
+        append_parquet_delta(make_frame(rows[:2]), self.output_path)
+        result = append_parquet_delta(make_frame(rows[2:]), self.output_path)
+        self.assertEqual(result["file"]["record_count"], 3)
+
+        compact_parquet_deltas(self.output_path)
+        self.assertEqual(
+            list(pd.read_parquet(self.output_path)["id"]), ["p1", "r1", "r2"]
+        )
+
+
+class TestInterventionsSchema(unittest.TestCase):
+    """Test cases for schema-conformed interventions files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_path = str(Path(self.test_dir) / "interventions-2025-01-27.parquet")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def test_rows_are_stored_with_schema_types(self):
+        """Strings are dictionary-encoded, timestamps UTC, spans int32 lists."""
+        df = make_frame([("a", "Uno. Due.")])
+        df["ts_start"] = "2025-01-27T10:30:00+01:00"
+        df["spans_frasi"] = [[{"start": 0, "end": 4}, {"start": 5, "end": 9}]]
+        append_parquet_delta(df, self.output_path, schema=INTERVENTIONS_SCHEMA)
+
+        table = pq.read_table(self.output_path)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("oratore").type))
+        self.assertEqual(
+            table.schema.field("ts_start").type, pa.timestamp("us", tz="UTC")
+        )
+        self.assertNotIn("spans_frasi", table.schema.names)
+
+        row = table.to_pylist()[0]
+        self.assertEqual(row["ts_start"].isoformat(), "2025-01-27T09:30:00+00:00")
+        self.assertEqual(
+            spans_frasi(row["spans_start"], row["spans_end"]),
+            [{"start": 0, "end": 4}, {"start": 5, "end": 9}],
+        )
+
+        # Same rows again: nothing to write
+        again = append_parquet_delta(df, self.output_path, schema=INTERVENTIONS_SCHEMA)
+        self.assertEqual(again["appended"], 0)
+
+    def test_naive_start_times_are_rome_local(self):
+        """Naive ts_start values are Europe/Rome times; naive ingested_at stays UTC."""
+        df = make_frame([("winter", "uno"), ("summer", "due")])
+        df["ts_start"] = ["2025-01-27T14:30:00", "2025-07-15T14:30:00"]
+        append_parquet_delta(df, self.output_path, schema=INTERVENTIONS_SCHEMA)
+
+        rows = pq.read_table(self.output_path).to_pylist()
+        self.assertEqual(
+            [row["ts_start"].isoformat() for row in rows],
+            ["2025-01-27T13:30:00+00:00", "2025-07-15T12:30:00+00:00"],
+        )
+        self.assertEqual(
+            rows[0]["ingested_at"].isoformat(), "2025-01-27T10:00:00+00:00"
+        )
+
+    def test_legacy_file_is_conformed_on_compaction(self):
+        """Files written before the schema compact into the typed layout."""
+        legacy = make_frame([("a", "uno")])
+        legacy["spans_frasi"] = [[{"start": 0, "end": 3}]]
+        legacy.to_parquet(self.output_path, index=False)
+
+        append_parquet_delta(
+            make_frame([("b", "due")]), self.output_path, schema=INTERVENTIONS_SCHEMA
+        )
+        self.assertEqual(
+            compact_parquet_deltas(self.output_path, "id", schema=INTERVENTIONS_SCHEMA)[
+                "record_count"
+            ],
+            2,
+        )
+
+        table = pq.read_table(self.output_path)
+        self.assertEqual(
+            table.schema.names[: len(INTERVENTIONS_SCHEMA)], INTERVENTIONS_SCHEMA.names
+        )
+        self.assertEqual(table.column("spans_start").to_pylist(), [[0], None])
+
+
+if __name__ == "__main__":
+    unittest.main()
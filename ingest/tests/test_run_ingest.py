@@ -0,0 +1,226 @@
+"""Tests for the ingest pipeline runner."""
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from identities.registry_snapshot import RegistrySnapshot  # noqa: E402
+from identities.utils import NAME_CACHES, name_cache_stats  # noqa: E402
+from ingest.identity_matcher import IdentityMatcher  # noqa: E402
+from ingest.run_ingest import (  # noqa: E402
+    collect_sources,
+    enrich_identities,
+    merge_outcomes,
+    process_source,
+)
+from ingest.utils.http import ValidatorStore  # noqa: E402
+
+
+class FakeAdapter:
+    """Adapter returning canned interventions after a delay."""
+
+    def __init__(self, source, delay=0.0, fail=False):
+        self.source = source
+        self.delay = delay
+        self.fail = fail
+
+    def fetch_latest(self, session, last_etag=None, last_modified=None):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        url = f"https://{self.source}.example/doc"
+        return {
+            "html": "<html></html>",
+            "etag": None,
+            "last_modified": None,
+            "url": url,
+        }
+
+    def parse_interventions(self, html, source_url):
+        return [
+            {"id": f"{self.source}-1", "source": self.source, "source_url": source_url}
+        ]
+
+
+class TestCollectSources(unittest.TestCase):
+    """Test cases for concurrent source collection."""
+
+    def test_sources_run_concurrently(self):
+        """Wall time is bounded by the slowest source, not the sum."""
+        sources = [
+            ("camera", FakeAdapter("camera", 0.3)),
+            ("senato", FakeAdapter("senato", 0.3)),
+        ]
+
+        start = time.monotonic()
+        outcomes = collect_sources({}, sources=sources)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(outcomes["camera"]["status"], "ok")
+        self.assertEqual(outcomes["senato"]["status"], "ok")
+
+    def test_sequential_mode(self):
+        """Sequential mode produces the same outcomes."""
+        sources = [("camera", FakeAdapter("camera")), ("senato", FakeAdapter("senato"))]
+
+        outcomes = collect_sources({}, sequential=True, sources=sources)
+
+        self.assertEqual(outcomes["camera"]["interventions"][0]["id"], "camera-1")
+        self.assertEqual(outcomes["senato"]["interventions"][0]["id"], "senato-1")
+
+    def test_deadline_marks_slow_source(self):
+        """Sources still running at the deadline are reported as timeout."""
+        sources = [
+            ("camera", FakeAdapter("camera")),
+            ("senato", FakeAdapter("senato", 1.0)),
+        ]
+
+        outcomes = collect_sources({}, deadline=0.2, sources=sources)
+
+        self.assertEqual(outcomes["camera"]["status"], "ok")
+        self.assertEqual(outcomes["senato"]["status"], "timeout")
+        self.assertEqual(outcomes["senato"]["interventions"], [])
+
+    def test_error_is_isolated(self):
+        """A failing source does not affect the other one."""
+        sources = [
+            ("camera", FakeAdapter("camera", fail=True)),
+            ("senato", FakeAdapter("senato")),
+        ]
+
+        outcomes = collect_sources({}, sources=sources)
+
+        self.assertEqual(outcomes["camera"]["status"], "error")
+        self.assertEqual(outcomes["senato"]["status"], "ok")
+
+
+class CountingAdapter(FakeAdapter):
+    """Adapter serving a fixed body without validators, counting parses."""
+
+    def __init__(self, html):
+        super().__init__("camera")
+        self.html = html
+        self.validators = ValidatorStore()
+        self.parses = 0
+
+    def fetch_latest(self, session, last_etag=None, last_modified=None):
+        return {
+            "html": self.html,
+            "etag": None,
+            "last_modified": None,
+            "url": "https://camera.example/doc",
+        }
+
+    def parse_interventions(self, html, source_url):
+        self.parses += 1
+        return super().parse_interventions(html, source_url)
+
+
+class TestDigestGate(unittest.TestCase):
+    """Test cases for skipping bodies identical to the last one parsed."""
+
+    def test_identical_body_is_not_parsed_again(self):
+        """A 200 with the same body is reported unchanged without parsing."""
+        adapter = CountingAdapter("<html><body><p>Seduta</p></body></html>")
+
+        first = process_source(adapter, None, {}, "camera")
+        second = process_source(adapter, None, {}, "camera")
+
+        self.assertEqual(first["status"], "ok")
+        self.assertEqual(second["status"], "unchanged")
+        self.assertEqual(adapter.parses, 1)
+
+        adapter.html = "<html><body><p>Seduta</p><p>Interviene ROSSI</p></body></html>"
+        self.assertEqual(process_source(adapter, None, {}, "camera")["status"], "ok")
+        self.assertEqual(
+            process_source(adapter, None, {}, "camera", digest_gate=False)["status"],
+            "ok",
+        )
+        self.assertEqual(adapter.parses, 3)
+
+
+class TestMergeOutcomes(unittest.TestCase):
+    """Test cases for the per-source summary recorded in the manifest."""
+
+    def test_unchanged_source_keeps_its_url(self):
+        """An unchanged source records its document URL and source_status state."""
+        outcomes = {
+            "camera": {
+                "status": "unchanged",
+                "url": "https://camera.example/doc",
+                "interventions": [],
+            },
+            "senato": {"status": "not_modified", "url": None, "interventions": []},
+        }
+
+        interventions, sources, status = merge_outcomes(
+            outcomes, {"senato": "https://senato.example/doc"}
+        )
+
+        self.assertEqual(interventions, [])
+        self.assertEqual(
+            sources,
+            {
+                "camera": "https://camera.example/doc",
+                "senato": "https://senato.example/doc",
+            },
+        )
+        self.assertEqual(status, {"camera": "unchanged", "senato": "unchanged"})
+
+
+class TestEnrichIdentities(unittest.TestCase):
+    """Test cases for identity enrichment of the run's interventions."""
+
+    def test_unmatched_speakers_go_to_inbox(self):
+        """Every row gets the identity columns; unmatched rows count in the inbox."""
+        data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, data_dir)
+        df = pd.DataFrame(
+            {
+                "oratore": ["Mario Verdi", "Mario Verdi"],
+                "ts_start": ["2025-01-27T10:00:00"] * 2,
+                "source_url": ["https://camera.example/doc"] * 2,
+                "text": ["Uno.", "Due."],
+            }
+        )
+
+        enriched = enrich_identities(df, data_dir)
+
+        self.assertEqual(list(enriched["person_id"]), [None, None])
+        self.assertIn("party_id_at_ts", enriched.columns)
+        self.assertEqual(
+            [(e["norm_name"], e["hits"]) for e in RegistrySnapshot(data_dir).inbox],
+            [("mario verdi", 2)],
+        )
+
+    def test_names_go_through_the_name_cache(self):
+        """Speaker normalization shows in the name cache statistics of the run."""
+        data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, data_dir)
+        NAME_CACHES["normalize_name"].clear()
+        df = pd.DataFrame(
+            {
+                "oratore": ["Mario Verdi", "Anna Neri", "Mario Verdi"],
+                "source_url": [""] * 3,
+                "text": [""] * 3,
+            }
+        )
+        matcher = IdentityMatcher(str(data_dir))
+
+        enrich_identities(df, data_dir, matcher)
+        enrich_identities(df, data_dir, matcher)
+
+        stats = name_cache_stats()["normalize_name"]
+        self.assertEqual((stats["misses"], stats["hits"]), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
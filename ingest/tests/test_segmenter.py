@@ -0,0 +1,72 @@
+"""Tests for the Italian sentence segmenter."""
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils import text as text_utils  # noqa: E402
+from ingest.utils.segmenter import segment, segment_batch  # noqa: E402
+
+
+def sentences(text):
+    return [text[start:end] for start, end in segment(text)]
+
+
+class TestSegmenter(unittest.TestCase):
+    """Test cases for sentence segmentation."""
+
+    def test_abbreviations_do_not_split(self):
+        """Titles, references, initials and decimals stay inside their sentence."""
+        text = (
+            "L'On. Rossi cita l'art. 5, comma 2, del d.lgs. n. 150 del 2009 "
+            "e il c.d. decreto. "
+            "Il Sen. M. Bianchi chiede il 3.5 per cento (cfr. pag. 12)! Va bene? Sì."
+        )
+
+        self.assertEqual(
+            sentences(text),
+            [
+                "L'On. Rossi cita l'art. 5, comma 2, del d.lgs. n. 150 del 2009 "
+                "e il c.d. decreto. ",
+                "Il Sen. M. Bianchi chiede il 3.5 per cento (cfr. pag. 12)! ",
+                "Va bene? ",
+                "Sì.",
+            ],
+        )
+
+    def test_boundaries(self):
+        """Closing brackets stay with their sentence; lowercase goes on; ecc. ends."""
+        self.assertEqual(sentences("(Applausi). Grazie."), ["(Applausi). ", "Grazie."])
+        self.assertEqual(
+            sentences("Regioni, comuni ecc. Vedremo."),
+            ["Regioni, comuni ecc. ", "Vedremo."],
+        )
+        self.assertEqual(
+            sentences("Regioni, comuni ecc. e province."),
+            ["Regioni, comuni ecc. e province."],
+        )
+        self.assertEqual(sentences("Chiara... e lo resta."), ["Chiara... e lo resta."])
+
+    def test_spans_cover_text(self):
+        """Spans are coherent, leading and trailing whitespace included."""
+        texts = [
+            "  Primo periodo. Secondo periodo!\n\nTerzo  ",
+            "Senza punto finale",
+            "   ",
+            "",
+            None,
+        ]
+
+        batch = segment_batch(texts)
+
+        self.assertEqual(batch[0], [(2, 17), (17, 35), (35, 42)])
+        self.assertEqual(batch[1], [(0, 18)])
+        self.assertEqual(batch[2:], [[], [], []])
+        for text, spans in zip(texts, batch):
+            self.assertTrue(text_utils.test_span_coherence(text or "", spans))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for Senato speaker-block segmentation."""
+import sys
+import unittest
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.adapters.senato_html import SenatoHTMLAdapter  # noqa: E402
+
+
+def segment(html):
+    """Return (speaker, [content texts]) pairs for a document"""
+    adapter = SenatoHTMLAdapter()
+    blocks = adapter._find_intervention_blocks(BeautifulSoup(html, "lxml"))
+    return [
+        (
+            block["heading"].get_text(strip=True),
+            [c.get_text(strip=True) for c in block["content"]],
+        )
+        for block in blocks
+    ]
+
+
+class TestSenatoSegmentation(unittest.TestCase):
+    """Test cases for linear speaker segmentation."""
+
+    def test_sibling_headings(self):
+        """Paragraphs following a heading belong to it until the next heading."""
+        html = (
+            "<body><p>Preambolo</p><h3>PRESIDENTE</h3><p>Uno.</p><p>Due.</p>"
+            "<h3>MARIO ROSSI (PD)</h3><div>Tre.</div><p> </p></body>"
+        )
+        self.assertEqual(
+            segment(html),
+            [("PRESIDENTE", ["Uno.", "Due."]), ("MARIO ROSSI (PD)", ["Tre."])],
+        )
+
+    def test_mixed_nesting(self):
+        """Headings nested in paragraphs do not swallow the rest of the document."""
+        html = (
+            "<body><h3>PRESIDENTE</h3><p>Apertura.</p>"
+            "<p><strong>MARIO ROSSI (PD)</strong></p><p>Intervento.</p>"
+            "<h3>PRESIDENTE</h3><section><p>Chiusura.</p></section></body>"
+        )
+        self.assertEqual(
+            segment(html),
+            [
+                ("PRESIDENTE", ["Apertura."]),
+                ("MARIO ROSSI (PD)", ["Intervento."]),
+                ("PRESIDENTE", ["Chiusura."]),
+            ],
+        )
+
+    def test_identical_headings_are_distinct(self):
+        """Repeated PRESIDENTE headings each keep their own content."""
+        html = (
+            "<body>"
+            + "".join(f"<h3>PRESIDENTE</h3><p>Turno {i}.</p>" for i in range(3))
+            + "</body>"
+        )
+        self.assertEqual(
+            [content for _, content in segment(html)],
+            [["Turno 0."], ["Turno 1."], ["Turno 2."]],
+        )
+
+    def test_page_footer_is_not_content(self):
+        """Elements after the heading's container (footer, navigation) are left out."""
+        html = (
+            '<body><div class="resoconto"><h3>PRESIDENTE</h3><p>Apertura.</p>'
+            "<p><strong>MARIO ROSSI (PD)</strong></p><p>Intervengo.</p></div>"
+            "<div><p>Senato della Repubblica - Piazza Madama, 00186 Roma</p>"
+            "<div>Privacy | Cookie</div></div></body>"
+        )
+        self.assertEqual(
+            segment(html),
+            [("PRESIDENTE", ["Apertura."]), ("MARIO ROSSI (PD)", ["Intervengo."])],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
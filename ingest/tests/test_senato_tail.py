@@ -0,0 +1,159 @@
+"""Tests for Senato live document tailing."""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.adapters.senato_html import SenatoHTMLAdapter  # noqa: E402
+from ingest.utils.http import ValidatorStore  # noqa: E402
+from ingest.utils.tail_state import TailState  # noqa: E402
+
+HOT_URL = "https://www.senato.it/hotresaula"
+
+
+def live_document(turns):
+    """Build a live resoconto with the given (speaker, text) turns"""
+    body = "".join(f"<h3>{speaker}</h3><p>{text}</p>\n" for speaker, text in turns)
+    head = "<head><title>Seduta del 27 gennaio 2025</title></head>"
+    return f"<html>{head}<body>{body}</body></html>"
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.encoding = "utf-8"
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeLiveSite:
+    """Serves a growing live document, optionally honouring Range."""
+
+    def __init__(self, honour_range=True):
+        self.honour_range = honour_range
+        self.document = b""
+        self.sent_bytes = 0
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        etag = f'"{len(self.document)}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        range_header = headers.get("Range")
+        if range_header and self.honour_range:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(self.document):
+                return FakeResponse(416)
+            content = self.document[start:]
+            end = len(self.document) - 1
+            self.sent_bytes += len(content)
+            return FakeResponse(
+                206,
+                content,
+                {
+                    "ETag": etag,
+                    "Content-Range": f"bytes {start}-{end}/{len(self.document)}",
+                },
+            )
+        self.sent_bytes += len(self.document)
+        return FakeResponse(200, self.document, {"ETag": etag})
+
+
+class TestSenatoTail(unittest.TestCase):
+    """Test cases for incremental parsing of hotresaula."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.state_path = str(Path(self.test_dir) / "tail_state.json")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def poll(self, site, adapter):
+        """Run one fetch + parse cycle on the live URL"""
+        result = adapter._fetch_tail(site, HOT_URL)
+        if result.get("not_modified"):
+            return None
+        return adapter.parse_interventions(
+            result["html"], result["url"], tail=result["tail"]
+        )
+
+    def check_tailing(self, honour_range):
+        site = FakeLiveSite(honour_range)
+        adapter = SenatoHTMLAdapter(
+            validators=ValidatorStore(), tail_state=TailState(self.state_path)
+        )
+        turns = [
+            ("PRESIDENTE", "Dichiaro aperta la seduta."),
+            ("MARIO ROSSI (PD)", "Grazie Presidente."),
+        ]
+
+        site.document = live_document(turns).encode("utf-8")
+        first = self.poll(site, adapter)
+        self.assertEqual([i["oratore"] for i in first], ["PRESIDENTE", "MARIO ROSSI"])
+
+        # Unchanged document: 304
+        self.assertIsNone(self.poll(site, adapter))
+
+        # The last turn grows and a new one is appended
+        turns[1] = (
+            "MARIO ROSSI (PD)",
+            "Grazie Presidente. Intervengo sul provvedimento.",
+        )
+        turns.append(("ANNA BIANCHI (FdI)", "Chiedo la parola."))
+        site.document = live_document(turns).encode("utf-8")
+        second = self.poll(site, adapter)
+
+        self.assertEqual(
+            [i["oratore"] for i in second], ["MARIO ROSSI", "ANNA BIANCHI"]
+        )
+        self.assertIn("Intervengo sul provvedimento.", second[0]["text"])
+        self.assertEqual(second[0]["seduta"], first[0]["seduta"])
+
+        # Only the grown speech is flagged as the longer version of the truncated one
+        self.assertEqual(second[0]["supersedes"], first[1]["id"])
+        self.assertNotIn("supersedes", second[1])
+        return site
+
+    def test_range_requests(self):
+        """With Range support only the tail is downloaded and parsed."""
+        site = self.check_tailing(honour_range=True)
+        self.assertLess(site.sent_bytes, 2 * len(site.document))
+
+    def test_local_diffing(self):
+        """Servers ignoring Range are diffed against the parsed prefix."""
+        self.check_tailing(honour_range=False)
+
+    def test_rewritten_document_is_parsed_fully(self):
+        """A change before the tail offset triggers a full parse."""
+        site = FakeLiveSite()
+        adapter = SenatoHTMLAdapter(
+            validators=ValidatorStore(), tail_state=TailState(self.state_path)
+        )
+        site.document = live_document(
+            [("PRESIDENTE", "Apertura."), ("MARIO ROSSI (PD)", "Primo.")]
+        ).encode("utf-8")
+        self.poll(site, adapter)
+
+        site.document = live_document(
+            [("PRESIDENTE", "Riapertura."), ("LUCA VERDI (M5S)", "Secondo.")]
+        ).encode("utf-8")
+        result = self.poll(site, adapter)
+        self.assertEqual([i["oratore"] for i in result], ["PRESIDENTE", "LUCA VERDI"])
+        self.assertFalse(any("supersedes" in i for i in result))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the sentence table."""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils.ids import content_fingerprint  # noqa: E402
+from ingest.utils.io import append_parquet_delta  # noqa: E402
+from ingest.utils.schema import INTERVENTIONS_SCHEMA, SENTENCES_SCHEMA  # noqa: E402
+from ingest.utils.sentences import sentence_table, write_sentences  # noqa: E402
+from ingest.utils.text import split_sentences  # noqa: E402
+
+
+def interventions(texts):
+    return pd.DataFrame(
+        [
+            {
+                "id": f"int-{i}",
+                "source": "camera",
+                "seduta": "Seduta n. 1",
+                "ts_start": "2025-01-27T10:00:00",
+                "oratore": "Rossi",
+                "gruppo": "PD",
+                "text": text,
+                "spans_frasi": [
+                    {"start": start, "end": end} for start, end in split_sentences(text)
+                ],
+                "source_url": "https://example.it",
+                "ingested_at": "2025-01-27T10:00:00",
+            }
+            for i, text in enumerate(texts)
+        ]
+    )
+
+
+class TestSentenceTable(unittest.TestCase):
+    """Test cases for sentence table materialization."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.test_dir)
+
+    def test_explode(self):
+        """One row per span, with offsets, position, text and stable hash."""
+        df = interventions(["Il Sen. Rossi interviene. Grazie!", "Una sola frase.", ""])
+
+        table = sentence_table(df)
+
+        self.assertEqual(table.schema, SENTENCES_SCHEMA)
+        rows = table.to_pylist()
+        self.assertEqual(
+            [
+                (r["intervention_id"], r["sentence_idx"], r["start"], r["end"])
+                for r in rows
+            ],
+            [("int-0", 0, 0, 26), ("int-0", 1, 26, 33), ("int-1", 0, 0, 15)],
+        )
+        self.assertEqual(
+            [r["text"] for r in rows],
+            ["Il Sen. Rossi interviene.", "Grazie!", "Una sola frase."],
+        )
+        self.assertEqual(
+            rows[0]["sentence_hash"], content_fingerprint("Il Sen. Rossi interviene.")
+        )
+        self.assertEqual(sentence_table(df.iloc[:0]).num_rows, 0)
+
+    def test_write_follows_deltas(self):
+        """The sentences file reflects the latest content across delta files."""
+        path = Path(self.test_dir) / "interventions-2025-01-27.parquet"
+        # The grown speech has a new id, as ids hash the text, and names the
+        # truncated row
+        previous = None
+        for text in ["Prima versione.", "Prima versione. Aggiornata."]:
+            rows = interventions([text]).assign(
+                id=content_fingerprint(text), supersedes=previous
+            )
+            append_parquet_delta(rows, str(path), schema=INTERVENTIONS_SCHEMA)
+            previous = content_fingerprint(text)
+
+        stats = write_sentences(str(path))
+
+        self.assertEqual(stats["filename"], "sentences-2025-01-27.parquet")
+        table = pq.read_table(Path(self.test_dir) / stats["filename"])
+        self.assertEqual(
+            table.column("text").to_pylist(), ["Prima versione.", "Aggiornata."]
+        )
+        self.assertEqual(stats["record_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
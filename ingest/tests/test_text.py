@@ -0,0 +1,68 @@
+"""Tests for sentence span validation."""
+import sys
+import unittest
+from pathlib import Path
+
+import pyarrow as pa
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.utils import text as text_utils  # noqa: E402
+from ingest.utils.text import span_coherence_mask, split_sentences  # noqa: E402
+
+# (text, spans, coherent)
+CASES = [
+    ("Uno. Due! Tre?", [(0, 4), (4, 9), (9, 14)], True),
+    ("Uno. Due. ", [(0, 4), (4, 10)], True),
+    ("Uno. Due.", [(0, 4), (5, 9)], False),  # gap
+    ("Uno. Due.", [(0, 5), (4, 9)], False),  # overlap
+    ("  Uno.", [(0, 6)], False),  # leading blank
+    ("Uno. Due.", [(0, 4)], False),  # text not covered
+    ("Uno.", [(0, 5)], False),  # out of bounds
+    ("   ", [], True),
+    ("Uno.", [], False),
+]
+
+
+class TestSpanCoherence(unittest.TestCase):
+    """Test cases for the linear and batch span validators."""
+
+    def test_linear_check(self):
+        """Spans must be contiguous and cover the non-blank text."""
+        for text, spans, expected in CASES:
+            with self.subTest(text=text, spans=spans):
+                self.assertEqual(text_utils.test_span_coherence(text, spans), expected)
+                dict_spans = [{"start": start, "end": end} for start, end in spans]
+                self.assertEqual(
+                    text_utils.test_span_coherence(text, dict_spans), expected
+                )
+
+        speech = (
+            "Signor Presidente, colleghi.\nIntervengo sul provvedimento! È seria? Sì"
+            * 50
+        )
+        self.assertTrue(text_utils.test_span_coherence(speech, split_sentences(speech)))
+
+    def test_batch_matches_linear_check(self):
+        """The vectorized mask gives the per-row result, nulls included."""
+        texts = [text for text, _, _ in CASES] + [None, "Uno."]
+        starts = [[s for s, _ in spans] for _, spans, _ in CASES] + [None, None]
+        ends = [[e for _, e in spans] for _, spans, _ in CASES] + [None, None]
+        table = pa.table(
+            {
+                "text": pa.array(texts, pa.string()),
+                "spans_start": pa.array(starts, pa.list_(pa.int32())),
+                "spans_end": pa.array(ends, pa.list_(pa.int32())),
+            }
+        )
+
+        mask = span_coherence_mask(table)
+
+        self.assertEqual(
+            list(mask), [expected for _, _, expected in CASES] + [True, False]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
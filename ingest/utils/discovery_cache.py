@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Discovery cache for PP100 ingest pipeline
+Persists adapter discovery results (session id and derived URLs) between runs
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Discovery results older than this are rebuilt from scratch
+DEFAULT_DISCOVERY_TTL_S = 3600
+
+class DiscoveryCache:
+    """
+    JSON-backed cache of discovery results, one entry per source
+    
+    Each entry stores the listing page validators (ETag/Last-Modified), the
+    top session link seen on the listing page and the discovery result built
+    from it. While an entry is fresh, adapters revalidate the listing page
+    with a conditional GET and skip the deeper discovery hops when the top
+    link is unchanged.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_DISCOVERY_TTL_S):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load cache entries from disk, ignoring unreadable files"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("entries", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable discovery cache {self.path}: {e}")
+            return {}
+    
+    def get_fresh(self, source: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached entry for a source if it is within the TTL
+        
+        Args:
+            source: Source name ("camera" or "senato")
+        
+        Returns:
+            Copy of the cache entry, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(source)
+            if not entry:
+                return None
+            try:
+                cached_at = datetime.fromisoformat(entry["cached_at"])
+            except (KeyError, ValueError):
+                return None
+            age = (datetime.now(timezone.utc) - cached_at).total_seconds()
+            if age < 0 or age >= self.ttl_seconds:
+                return None
+            return dict(entry)
+    
+    def put(self, source: str, listing_url: str, top_href: str, result: Dict[str, Any],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store a successful discovery result for a source
+        
+        Args:
+            source: Source name
+            listing_url: URL of the listing page discovery started from
+            top_href: Most recent session link found on the listing page
+            result: Discovery result returned by the adapter
+            etag: ETag of the listing page
+            last_modified: Last-Modified of the listing page
+        """
+        with self._lock:
+            self._entries[source] = {
+                "listing_url": listing_url,
+                "top_href": top_href,
+                "etag": etag,
+                "last_modified": last_modified,
+                "result": result,
+                "cached_at": datetime.now(timezone.utc).isoformat()
+            }
+            self._dirty = True
+    
+    def touch(self, source: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """
+        Update listing validators of a still valid entry, keeping its age
+        
+        Args:
+            source: Source name
+            etag: New ETag of the listing page
+            last_modified: New Last-Modified of the listing page
+        """
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is None:
+                return
+            if (entry.get("etag"), entry.get("last_modified")) != (etag, last_modified):
+                entry["etag"] = etag
+                entry["last_modified"] = last_modified
+                self._dirty = True
+    
+    def save(self) -> None:
+        """Write the cache to disk atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_file = self.path.parent / f".tmp_{self.path.name}"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self._entries}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.path)
+            self._dirty = False
@@ -3,14 +3,265 @@
 HTTP utilities for PP100 ingest pipeline
 """
 
+import hashlib
 import logging
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from ingest.utils.ids import content_fingerprint
+from ingest.utils.patterns import CONTENT_RANGE_RE
+from ingest.utils.raw_store import RawStore
 
 logger = logging.getLogger(__name__)
 
+# Max in-flight requests per host when adapters run concurrently
+DEFAULT_PER_HOST_CONCURRENCY = 2
+
+_per_host_limit = DEFAULT_PER_HOST_CONCURRENCY
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+def set_per_host_concurrency(limit: int) -> None:
+    """
+    Set the maximum number of concurrent requests per host
+    
+    Args:
+        limit: Max in-flight requests per host (>= 1)
+    """
+    global _per_host_limit
+    if limit < 1:
+        raise ValueError(f"Per-host concurrency must be >= 1, got {limit}")
+    with _host_semaphores_lock:
+        _per_host_limit = limit
+        _host_semaphores.clear()
+
+@contextmanager
+def host_slot(url: str) -> Iterator[None]:
+    """
+    Hold one of the per-host request slots for the duration of a request
+    
+    Args:
+        url: URL about to be requested
+    """
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_per_host_limit)
+            _host_semaphores[host] = semaphore
+    with semaphore:
+        yield
+
+# Raw response store written through by every fetch, and whether requests
+# are served from it instead of the network (see set_raw_store)
+_raw_store: Optional[RawStore] = None
+_replay = False
+
+class RawStoreMiss(requests.exceptions.RequestException):
+    """URL requested in replay mode that is not in the raw store"""
+
+class _StoredResponse:
+    """Response served from the raw store: always a 200 with the whole body"""
+    
+    def __init__(self, entry: Dict[str, Any]):
+        self.status_code = 200
+        self.content = entry["content"]
+        self.encoding = entry.get("encoding")
+        self.headers = {}
+        if entry.get("etag"):
+            self.headers['ETag'] = entry["etag"]
+        if entry.get("last_modified"):
+            self.headers['Last-Modified'] = entry["last_modified"]
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+    
+    def raise_for_status(self) -> None:
+        pass
+
+def set_raw_store(store: Optional[RawStore], replay: bool = False) -> None:
+    """
+    Write every full response through to a raw store, or serve requests from it
+    
+    In replay mode no request reaches the network: each URL gets its latest
+    stored body as a 200 response (conditional and Range headers are
+    ignored) and URLs never stored raise RawStoreMiss.
+    
+    Args:
+        store: Raw response store (None disables it)
+        replay: Serve requests from the store
+    """
+    global _raw_store, _replay
+    if replay and store is None:
+        raise ValueError("Replay mode needs a raw store")
+    _raw_store = store
+    _replay = replay
+
+def _get(session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None):
+    """
+    GET a URL through the per-host slots and the raw store
+    
+    Args:
+        session: Requests session
+        url: URL to fetch
+        headers: Request headers
+    
+    Returns:
+        requests.Response, or a stored response in replay mode
+    """
+    if _replay:
+        entry = _raw_store.get(url)
+        if entry is None:
+            raise RawStoreMiss(f"{url} is not in the raw store")
+        return _StoredResponse(entry)
+    
+    with host_slot(url):
+        response = session.get(url, headers=headers, timeout=30)
+    
+    # Partial (206) bodies are not documents: only full bodies are stored
+    if _raw_store is not None and response.status_code == 200:
+        _raw_store.put(url, response.content, response.encoding,
+                       response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return response
+
+class ValidatorStore:
+    """
+    Conditional-GET validators keyed by URL
+    
+    Holds the ETag, Last-Modified and content digest of every URL fetched
+    through fetch_with_etag, so each URL (discovery pages, documents,
+    fallbacks) is revalidated with its own validators. Persisted in the
+    manifest under "validators".
+    """
+    
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._entries = {
+            url: dict(entry) for url, entry in (entries or {}).items()
+            if isinstance(entry, dict)
+        }
+        self._lock = threading.Lock()
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored validators for a URL
+        
+        Args:
+            url: Fetched URL
+            
+        Returns:
+            Copy of the entry (etag, last_modified, digest, checked_at) or None
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+    
+    def record(self, url: str, etag: Optional[str], last_modified: Optional[str],
+               digest: Optional[str]) -> None:
+        """
+        Record validators from a 200 response
+        
+        Args:
+            url: Fetched URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            digest: SHA256 of the response body
+        """
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry.update({
+                "etag": etag,
+                "last_modified": last_modified,
+                "digest": digest,
+                "checked_at": datetime.now(timezone.utc).isoformat()
+            })
+    
+    def parsed_digest(self, url: str) -> Optional[str]:
+        """
+        Get the document digest of the last body of a URL that was parsed
+        
+        Args:
+            url: Fetched URL
+            
+        Returns:
+            Digest recorded by mark_parsed, or None
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            return entry.get("parsed_digest") if entry else None
+    
+    def mark_parsed(self, url: str, digest: str) -> None:
+        """
+        Record the document digest of a body that was parsed
+        
+        Args:
+            url: Fetched URL
+            digest: Document digest (see document_digest)
+        """
+        with self._lock:
+            self._entries.setdefault(url, {})["parsed_digest"] = digest
+    
+    def touch(self, url: str) -> None:
+        """
+        Mark a URL as revalidated (304 Not Modified)
+        
+        Args:
+            url: Fetched URL
+        """
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]["checked_at"] = datetime.now(timezone.utc).isoformat()
+    
+    def prune(self, max_age_days: float = 7) -> int:
+        """
+        Drop entries not checked in the last max_age_days
+        
+        Args:
+            max_age_days: Max age of kept entries
+            
+        Returns:
+            Number of removed entries
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        with self._lock:
+            stale = []
+            for url, entry in self._entries.items():
+                try:
+                    checked_at = datetime.fromisoformat(entry.get("checked_at", ""))
+                except ValueError:
+                    stale.append(url)
+                    continue
+                if checked_at < cutoff:
+                    stale.append(url)
+            for url in stale:
+                del self._entries[url]
+            return len(stale)
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Serializable copy of all entries"""
+        with self._lock:
+            return {url: dict(entry) for url, entry in self._entries.items()}
+
+def document_digest(html: str) -> str:
+    """
+    Digest of a document body, insensitive to whitespace-only changes
+    
+    Used to skip parsing bodies identical to the last parsed one when the
+    server answers 200 without validators.
+    
+    Args:
+        html: Document body
+        
+    Returns:
+        Content fingerprint of the body
+    """
+    return content_fingerprint(html)
+
 def create_session() -> requests.Session:
     """Create a requests session with proper headers"""
     session = requests.Session()
@@ -27,13 +278,16 @@ def create_session() -> requests.Session:
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
+    retry=retry_if_not_exception_type(RawStoreMiss),
     reraise=True
 )
 def fetch_with_etag(
     session: requests.Session,
     url: str,
     last_etag: Optional[str] = None,
-    last_modified: Optional[str] = None
+    last_modified: Optional[str] = None,
+    validators: Optional[ValidatorStore] = None,
+    conditional: bool = True
 ) -> Dict[str, any]:
     """
     Fetch URL with ETag/If-Modified-Since support and exponential backoff
@@ -43,12 +297,26 @@ def fetch_with_etag(
         url: URL to fetch
         last_etag: Last known ETag
         last_modified: Last known Last-Modified header
+        validators: Per-URL validator store, read when no explicit validators
+            are given and updated with the response
+        conditional: Send conditional headers (False always fetches the body)
         
     Returns:
-        Dictionary with: content, status_code, etag, last_modified, url
+        Dictionary with: content, status_code, etag, last_modified, digest, url
     """
     headers = {}
     
+    # Fall back to the validators stored for this URL
+    if conditional and validators is not None and not (last_etag or last_modified):
+        stored = validators.get(url)
+        if stored:
+            last_etag = stored.get("etag")
+            last_modified = stored.get("last_modified")
+    
+    if not conditional:
+        last_etag = None
+        last_modified = None
+    
     # Add conditional headers if we have them
     if last_etag:
         headers['If-None-Match'] = last_etag
@@ -58,28 +326,39 @@ def fetch_with_etag(
     try:
         logger.debug(f"Fetching {url} with headers: {headers}")
         
-        response = session.get(url, headers=headers, timeout=30)
+        response = _get(session, url, headers)
         
         # Log response info
         logger.info(f"Fetched {url} - Status: {response.status_code}, ETag: {response.headers.get('ETag')}")
         
         # Handle 304 Not Modified
         if response.status_code == 304:
+            if validators is not None:
+                validators.touch(url)
+            stored = validators.get(url) if validators is not None else None
             return {
                 "content": None,
                 "status_code": 304,
                 "etag": last_etag,
                 "last_modified": last_modified,
+                "digest": stored.get("digest") if stored else None,
                 "url": url
             }
         
         # Handle successful responses
         if response.status_code == 200:
+            content = response.text
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if validators is not None:
+                validators.record(url, etag, modified, digest)
             return {
-                "content": response.text,
+                "content": content,
                 "status_code": 200,
-                "etag": response.headers.get('ETag'),
-                "last_modified": response.headers.get('Last-Modified'),
+                "etag": etag,
+                "last_modified": modified,
+                "digest": digest,
                 "url": url
             }
         
@@ -90,6 +369,94 @@ def fetch_with_etag(
         logger.error(f"Error fetching {url}: {e}")
         raise
 
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    retry=retry_if_not_exception_type(RawStoreMiss),
+    reraise=True
+)
+def fetch_range(
+    session: requests.Session,
+    url: str,
+    start: int = 0,
+    validators: Optional[ValidatorStore] = None
+) -> Dict[str, any]:
+    """
+    Fetch the raw bytes of a URL from a byte offset with conditional headers
+    
+    Sends "Range: bytes=<start>-" with an identity encoding so offsets refer
+    to the document bytes. Servers that ignore Range answer 200 with the
+    whole document: callers must check status_code and range_start.
+    
+    Args:
+        session: Requests session
+        url: URL to fetch
+        start: First byte wanted (0 fetches the whole document)
+        validators: Per-URL validator store, read and updated
+        
+    Returns:
+        Dictionary with: content (bytes), status_code (200, 206, 304, 416),
+        range_start, encoding, etag, last_modified, url
+    """
+    headers = {'Accept-Encoding': 'identity'}
+    if start > 0:
+        headers['Range'] = f"bytes={start}-"
+    
+    stored = validators.get(url) if validators is not None else None
+    if stored:
+        if stored.get("etag"):
+            headers['If-None-Match'] = stored["etag"]
+        if stored.get("last_modified"):
+            headers['If-Modified-Since'] = stored["last_modified"]
+    
+    try:
+        logger.debug(f"Fetching {url} with headers: {headers}")
+        
+        response = _get(session, url, headers)
+        
+        logger.info(f"Fetched {url} - Status: {response.status_code}, ETag: {response.headers.get('ETag')}")
+        
+        result = {
+            "content": None,
+            "status_code": response.status_code,
+            "range_start": 0,
+            "encoding": response.encoding or 'utf-8',
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "url": url
+        }
+        
+        if response.status_code == 304:
+            if validators is not None:
+                validators.touch(url)
+            return result
+        
+        # Offset past the end of the document (e.g. the document was replaced)
+        if response.status_code == 416:
+            return result
+        
+        if response.status_code == 206:
+            match = CONTENT_RANGE_RE.match(response.headers.get('Content-Range', ''))
+            result["range_start"] = int(match.group(1)) if match else -1
+            result["content"] = response.content
+            # The digest of a partial body says nothing about the document
+            if validators is not None:
+                validators.record(url, result["etag"], result["last_modified"], None)
+            return result
+        
+        if response.status_code == 200:
+            result["content"] = response.content
+            if validators is not None:
+                digest = hashlib.sha256(response.text.encode('utf-8')).hexdigest()
+                validators.record(url, result["etag"], result["last_modified"], digest)
+            return result
+        
+        response.raise_for_status()
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching {url}: {e}")
+        raise
+
 def fetch_with_content_hash(
     session: requests.Session,
     url: str,
@@ -101,17 +468,17 @@ def fetch_with_content_hash(
     Args:
         session: Requests session
         url: URL to fetch
-        last_content_hash: Last known content hash
+        last_content_hash: Last known content hash (see content_fingerprint)
         
     Returns:
         Dictionary with: content, status_code, content_hash, url
     """
     try:
-        response = session.get(url, timeout=30)
+        response = _get(session, url)
         response.raise_for_status()
         
         content = response.text
-        content_hash = str(hash(content))
+        content_hash = content_fingerprint(content)
         
         # Check if content has changed
         if last_content_hash and content_hash == last_content_hash:
@@ -4,7 +4,14 @@ ID utilities for PP100 ingest pipeline
 """
 
 import hashlib
-from typing import Any
+import unicodedata
+from datetime import datetime
+from typing import Any, Optional, Union
+from ingest.utils.patterns import WHITESPACE_RE
+from ingest.utils.time import local_to_utc
+
+# Bytes of a content fingerprint (16 hex characters)
+FINGERPRINT_BYTES = 8
 
 def stable_id(*components: Any) -> str:
     """
@@ -25,16 +32,61 @@ def stable_id(*components: Any) -> str:
     # Return first 16 characters
     return hash_obj.hexdigest()[:16]
 
-def intervention_id(source: str, seduta: str, ts_start: str, oratore: str, text_hash: int = None) -> str:
+def content_fingerprint(text: Optional[str]) -> str:
+    """
+    Fingerprint of a text, identical across processes and runs
+    
+    The text is NFC-normalized and its whitespace collapsed first, so
+    re-renderings of the same speech get the same fingerprint. Unlike
+    hash(), which is salted per process, the result can be stored and
+    compared between runs.
+    
+    Args:
+        text: Text to fingerprint (None is treated as empty)
+    
+    Returns:
+        16-character BLAKE2b hash
+    """
+    normalized = WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=FINGERPRINT_BYTES).hexdigest()
+
+def canonical_timestamp(ts: Union[str, datetime, None]) -> str:
+    """
+    Canonical UTC form of a timestamp, as used in IDs
+    
+    ISO strings and datetimes (naive ones taken as Europe/Rome local times,
+    as the adapters produce them) give the same result as the typed ts_start
+    column they are stored in, so IDs can be recomputed from stored rows.
+    
+    Args:
+        ts: ISO string, datetime, or None/empty
+    
+    Returns:
+        "YYYY-MM-DDTHH:MM:SSZ", "" if missing, or the stripped string if unparseable
+    """
+    if ts is None or ts == "":
+        return ""
+    if not isinstance(ts, datetime):
+        try:
+            ts = datetime.fromisoformat(str(ts).strip())
+        except ValueError:
+            return str(ts).strip()
+    # NaT is a datetime subclass whose fields cannot be read
+    if ts != ts:
+        return ""
+    return local_to_utc(ts).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def intervention_id(source: str, seduta: str, ts_start: Union[str, datetime, None], oratore: str,
+                    text_hash: Optional[str] = None) -> str:
     """
     Generate a stable ID for an intervention
     
     Args:
         source: Source chamber ("camera" or "senato")
         seduta: Session identifier
-        ts_start: Start timestamp
+        ts_start: Start timestamp (canonicalized, see canonical_timestamp)
         oratore: Speaker name
-        text_hash: Hash of the intervention text (optional)
+        text_hash: content_fingerprint of the intervention text (optional)
         
     Returns:
         16-character SHA256 hash
@@ -42,7 +94,7 @@ def intervention_id(source: str, seduta: str, ts_start: str, oratore: str, text_
     if text_hash is None:
         text_hash = 0
     
-    return stable_id(source, seduta, ts_start, oratore, text_hash)
+    return stable_id(source, seduta, canonical_timestamp(ts_start), oratore, text_hash)
 
 def validate_id(id_str: str) -> bool:
     """
@@ -3,44 +3,347 @@
 I/O utilities for PP100 ingest pipeline
 """
 
+import hashlib
 import json
 import os
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+from ingest.utils.schema import conform_table
 
-def safe_write_parquet(df: pd.DataFrame, output_path: str) -> bool:
+# Parquet encoding defaults: zstd at a level that still writes a day's file
+# in milliseconds
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_COMPRESSION_LEVEL = 9
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+# Block size when hashing a file already on disk
+CHECKSUM_CHUNK_BYTES = 1 << 20
+
+class HashingWriter:
+    """Binary file wrapper computing the SHA256 of the bytes written through it"""
+    
+    def __init__(self, f):
+        self._file = f
+        self._sha256 = hashlib.sha256()
+        self.bytes_written = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self._sha256.update(data)
+        self.bytes_written += len(data)
+        return self._file.write(data)
+    
+    def tell(self) -> int:
+        return self.bytes_written
+    
+    def flush(self) -> None:
+        self._file.flush()
+    
+    def close(self) -> None:
+        # The wrapped file is closed by its owner
+        self.closed = True
+    
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+def file_checksum(file_path: str) -> str:
+    """
+    SHA256 of a file, read in blocks
+    
+    Args:
+        file_path: Path to file
+    
+    Returns:
+        Hex digest
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_BYTES), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def safe_write_parquet(df: Union[pd.DataFrame, pa.Table], output_path: str, schema: Optional[pa.Schema] = None,
+                       compression: str = DEFAULT_COMPRESSION,
+                       compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                       row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> Dict[str, Any]:
     """
     Safely write DataFrame to Parquet file using atomic write
     
+    The checksum is computed on the bytes as they are streamed to the
+    temporary file, so the written file never has to be read back.
+    
     Args:
-        df: DataFrame to write
+        df: DataFrame to write, or an Arrow table already in its final layout
         output_path: Output file path
+        schema: Arrow schema the columns are converted to (see ingest.utils.schema);
+            None infers types from df
+        compression: Parquet compression codec
+        compression_level: Codec level (None = codec default)
+        row_group_size: Max rows per row group
         
     Returns:
-        True if successful
+        File stats: checksum (SHA256), record_count, bytes
     """
     try:
         # Create temporary file
         temp_dir = Path(output_path).parent
         temp_file = temp_dir / f".tmp_{Path(output_path).name}"
         
+        if isinstance(df, pa.Table):
+            table = df if schema is None else df.select(schema.names).cast(schema)
+        elif schema is not None:
+            table = conform_table(df, schema)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        
         # Write to temporary file
-        df.to_parquet(temp_file, engine='pyarrow', index=False)
+        with open(temp_file, 'wb') as f:
+            sink = HashingWriter(f)
+            pq.write_table(
+                table, sink,
+                compression=compression,
+                compression_level=compression_level,
+                row_group_size=row_group_size
+            )
         
         # Atomic move
         os.replace(temp_file, output_path)
         
-        return True
+        return {
+            "checksum": sink.hexdigest(),
+            "record_count": table.num_rows,
+            "bytes": sink.bytes_written
+        }
     except Exception as e:
         # Clean up temp file if it exists
         if temp_file.exists():
             temp_file.unlink()
         raise e
 
+# Delta files accumulated before they are folded into the daily file
+DEFAULT_COMPACT_THRESHOLD = 6
+
+# Column naming the row cut short by a live poll that a row replaces
+# (see INTERVENTIONS_SCHEMA)
+SUPERSEDES_COLUMN = "supersedes"
+
+def delta_paths(output_path: str) -> List[Path]:
+    """
+    List the delta files of a daily Parquet file, oldest first
+    
+    Args:
+        output_path: Path of the daily file (e.g. interventions-2025-01-27.parquet)
+        
+    Returns:
+        Sorted list of delta file paths
+    """
+    path = Path(output_path)
+    return sorted(path.parent.glob(f"{path.stem}.delta-*.parquet"))
+
+def _read_files(output_path: str, columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+    """Read the daily file and its deltas, oldest first, with the available columns"""
+    frames = []
+    for path in [Path(output_path)] + delta_paths(output_path):
+        if not path.exists():
+            continue
+        available = None if columns is None else [c for c in columns if c in pq.read_schema(path).names]
+        frames.append(pd.read_parquet(path, columns=available))
+    return frames
+
+def _superseded_keys(frames: List[pd.DataFrame]) -> Set[str]:
+    """
+    Keys of rows cut short by a live poll and written again, longer, by a later one
+    
+    Only rows flagged by the adapter count: the grown speech gets a new key,
+    as its content changed, and names the truncated row in SUPERSEDES_COLUMN.
+    
+    Args:
+        frames: Daily file and deltas
+    
+    Returns:
+        Set of superseded row keys
+    """
+    superseded = set()
+    for frame in frames:
+        if SUPERSEDES_COLUMN in frame.columns:
+            superseded.update(frame[SUPERSEDES_COLUMN].dropna())
+    return superseded
+
+def _load_keys(output_path: str, key: str = "id") -> Tuple[Set[str], Set[str]]:
+    """Row keys and superseded keys of a day, read from those two columns only"""
+    frames = _read_files(output_path, [key, SUPERSEDES_COLUMN])
+    ids = set()
+    for frame in frames:
+        ids.update(frame[key])
+    return ids, _superseded_keys(frames)
+
+def load_existing_ids(output_path: str, key: str = "id") -> Set[str]:
+    """
+    Load the set of row keys already written for a day
+    
+    Args:
+        output_path: Path of the daily file
+        key: Column identifying a row
+        
+    Returns:
+        Set of row keys in the daily file and its deltas
+    """
+    return _load_keys(output_path, key)[0]
+
+def append_parquet_delta(df: pd.DataFrame, output_path: str, key: str = "id",
+                         compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                         schema: Optional[pa.Schema] = None,
+                         write_options: Optional[Dict[str, Any]] = None,
+                         prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> Dict[str, Any]:
+    """
+    Append new rows to a daily Parquet file
+    
+    The daily file is written once and then only grows through delta files
+    (<stem>.delta-NNNN.parquet) holding rows whose key is new: keys hash
+    the content (see ingest.utils.ids), so a changed row comes with a new
+    key and rows already written are recognized by key alone. Rows missing
+    from a later fetch are never dropped, except a speech cut short at the
+    end of a live poll once a row flagged as its longer version arrives (see
+    _superseded_keys). Deltas are folded into the daily file once
+    compact_threshold of them have accumulated.
+    
+    Args:
+        df: DataFrame with the rows from the latest fetch
+        output_path: Path of the daily file
+        key: Column identifying a row
+        compact_threshold: Deltas kept before compaction (<= 1 compacts every write)
+        schema: Arrow schema of the files (None infers types)
+        write_options: Extra keyword arguments for safe_write_parquet
+            (compression, compression_level, row_group_size)
+        prepare: Applied to the rows about to be written, and only to them
+            (e.g. identity enrichment), so rows already on disk are not
+            processed again at every poll
+        
+    Returns:
+        Dictionary with: appended (rows written), delta (file written or None),
+        compacted (bool), deltas (remaining delta filenames), file (stats of
+        the daily file for update_manifest: checksum, None if the daily file
+        was not rewritten, record_count across deltas, bytes)
+    """
+    write_options = dict(write_options or {}, schema=schema)
+    df = df.drop_duplicates(subset=[key], keep="last")
+    if schema is not None:
+        # Write the same types whether rows go to the daily file or a delta
+        df = conform_table(df, schema).to_pandas()
+    path = Path(output_path)
+    existing_deltas = delta_paths(output_path)
+    
+    # First write of the day: no deltas needed
+    if not path.exists() and not existing_deltas:
+        if prepare is not None:
+            df = prepare(df)
+        stats = safe_write_parquet(df, output_path, **write_options)
+        return {"appended": len(df), "delta": None, "compacted": False, "deltas": [], "file": stats}
+    
+    existing, superseded = _load_keys(output_path, key)
+    new_rows = df[~df[key].isin(existing)]
+    
+    delta = None
+    if len(new_rows) > 0:
+        if prepare is not None:
+            new_rows = prepare(new_rows)
+        index = int(existing_deltas[-1].stem.rsplit("-", 1)[1]) + 1 if existing_deltas else 1
+        delta = path.parent / f"{path.stem}.delta-{index:04d}.parquet"
+        safe_write_parquet(new_rows, str(delta), **write_options)
+        existing_deltas.append(delta)
+    
+    compacted = False
+    if existing_deltas and len(existing_deltas) >= max(compact_threshold, 1):
+        stats = compact_parquet_deltas(output_path, key, schema=schema, write_options=write_options)
+        existing_deltas = []
+        compacted = True
+    else:
+        # Daily file untouched: rows are the keys already read plus the new ones
+        superseded |= _superseded_keys([new_rows])
+        stats = {
+            "checksum": None,
+            "record_count": len((existing | set(new_rows[key])) - superseded),
+            "bytes": path.stat().st_size if path.exists() else 0
+        }
+    
+    return {
+        "appended": len(new_rows),
+        "delta": delta.name if delta else None,
+        "compacted": compacted,
+        "deltas": [p.name for p in existing_deltas],
+        "file": stats
+    }
+
+def read_daily_frame(output_path: str, key: str = "id") -> pd.DataFrame:
+    """
+    Read the rows of a daily Parquet file together with its deltas
+    
+    Rows keep the position of their first appearance and the content of
+    their last one, as they would after compaction. Truncated speeches
+    superseded by a longer version are left out.
+    
+    Args:
+        output_path: Path of the daily file
+        key: Column identifying a row
+    
+    Returns:
+        DataFrame with one row per key (empty if nothing was written)
+    """
+    frames = _read_files(output_path)
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
+    superseded = _superseded_keys(frames)
+    if superseded:
+        combined = combined[~combined[key].isin(superseded)]
+    order = combined[key].drop_duplicates(keep="first")
+    latest = combined.drop_duplicates(subset=[key], keep="last").set_index(key)
+    return latest.loc[order].reset_index()
+
+def compact_parquet_deltas(output_path: str, key: str = "id", schema: Optional[pa.Schema] = None,
+                           write_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fold delta files into the daily Parquet file
+    
+    Rows keep the position of their first appearance and the content of
+    their last one, without superseded truncated speeches. The daily file is
+    replaced atomically before the deltas are removed, so an interrupted
+    compaction is simply repeated.
+    
+    Args:
+        output_path: Path of the daily file
+        key: Column identifying a row
+        schema: Arrow schema of the compacted file (None infers types); files
+            written before it are converted
+        write_options: Extra keyword arguments for safe_write_parquet
+        
+    Returns:
+        Stats of the daily file (see safe_write_parquet); checksum is None
+        if there was nothing to compact and the file was left as it is
+    """
+    write_options = dict(write_options or {}, schema=schema)
+    path = Path(output_path)
+    deltas = delta_paths(output_path)
+    if not deltas:
+        if not path.exists():
+            return {"checksum": None, "record_count": 0, "bytes": 0}
+        return {
+            "checksum": None,
+            "record_count": pq.read_metadata(path).num_rows,
+            "bytes": path.stat().st_size
+        }
+    
+    compacted = read_daily_frame(output_path, key)
+    stats = safe_write_parquet(compacted, output_path, **write_options)
+    for delta in deltas:
+        delta.unlink()
+    
+    return stats
+
 def read_manifest(manifest_path: str) -> Dict[str, Any]:
     """
     Read manifest file
@@ -73,16 +376,55 @@ def create_default_manifest() -> Dict[str, Any]:
         "sources": {}
     }
 
+def _read_file_stats(file_path: Path, deltas: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Stats of a data file on disk: streamed checksum, rows from the Parquet footer"""
+    if not file_path.exists():
+        return {"checksum": "", "record_count": 0, "bytes": 0}
+    record_count = 0
+    if file_path.suffix == '.parquet':
+        try:
+            if deltas:
+                ids, superseded = _load_keys(str(file_path))
+                record_count = len(ids - superseded)
+            else:
+                record_count = pq.read_metadata(file_path).num_rows
+        except Exception:
+            record_count = 0
+    return {
+        "checksum": file_checksum(str(file_path)),
+        "record_count": record_count,
+        "bytes": file_path.stat().st_size
+    }
+
 def update_manifest(manifest_path: str, interventions_file: Optional[str] = None, 
-                   status: str = "unknown", sources: Optional[Dict[str, str]] = None) -> None:
+                   status: str = "unknown", sources: Optional[Dict[str, str]] = None,
+                   source_status: Optional[Dict[str, str]] = None,
+                   validators: Optional[Dict[str, Dict[str, Any]]] = None,
+                   deltas: Optional[List[str]] = None,
+                   metrics: Optional[Dict[str, Any]] = None,
+                   file_stats: Optional[Dict[str, Any]] = None,
+                   sentences_file: Optional[str] = None,
+                   sentences_stats: Optional[Dict[str, Any]] = None) -> None:
     """
     Update manifest file with new information
     
     Args:
         manifest_path: Path to manifest file
         interventions_file: Path to interventions file (relative to public/data/)
-        status: Ingest status ("ok", "error", "no_data", "unknown")
+        status: Ingest status ("ok", "error", "no_data", "unchanged", "unknown")
         sources: Dictionary of source URLs used
+        source_status: State of each source in the run ("ok", "unchanged",
+            "no_data", "error"), kept apart from its URL in sources
+        validators: Conditional-GET validators keyed by URL (see ValidatorStore)
+        deltas: Delta filenames not yet compacted into the interventions file
+        metrics: Run metrics (e.g. name cache statistics), replacing the previous run's
+        file_stats: Stats of the interventions file from the writer (checksum,
+            record_count, bytes); a None checksum keeps the previous one if the
+            file is unchanged. Without stats they are read from the file
+        sentences_file: Path to the sentences file of the same day (relative
+            to public/data/)
+        sentences_stats: Stats of the sentences file from the writer (read from
+            the file if missing)
     """
     try:
         # Read existing manifest or create new one
@@ -93,7 +435,6 @@ def update_manifest(manifest_path: str, interventions_file: Optional[str] = None
         
         # Update fields
         from datetime import datetime
-        import hashlib
         
         current_time = datetime.utcnow().isoformat()
         manifest["generated_at"] = current_time
@@ -107,38 +448,56 @@ def update_manifest(manifest_path: str, interventions_file: Optional[str] = None
             if "files" not in manifest:
                 manifest["files"] = {}
             
-            # Calculate checksum if file exists
             file_path = Path(manifest_path).parent / Path(interventions_file).name
-            checksum = ""
-            record_count = 0
-            
-            if file_path.exists():
-                # Calculate SHA256 checksum
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-                    checksum = hashlib.sha256(file_content).hexdigest()
-                
-                # Count records if it's a parquet file
-                if file_path.suffix == '.parquet':
-                    try:
-                        df = pd.read_parquet(file_path)
-                        record_count = len(df)
-                    except Exception:
-                        record_count = 0
+            previous = manifest["files"].get("interventions") or {}
+            stats = dict(file_stats) if file_stats else _read_file_stats(file_path, deltas)
+            if stats.get("checksum") is None:
+                # Daily file not rewritten by this run: its checksum is the one
+                # recorded when it was written
+                if previous.get("filename") == file_path.name and previous.get("checksum"):
+                    stats["checksum"] = previous["checksum"]
+                elif file_path.exists():
+                    stats["checksum"] = file_checksum(str(file_path))
+                else:
+                    stats["checksum"] = ""
             
             # Update interventions file info
             manifest["files"]["interventions"] = {
                 "filename": Path(interventions_file).name,
                 "version": manifest.get("version", "0.1.0"),
                 "generated_at": current_time,
-                "checksum": checksum,
-                "record_count": record_count,
-                "status": "active" if status == "ok" else "error"
+                "checksum": stats["checksum"],
+                "record_count": stats.get("record_count", 0),
+                "bytes": stats.get("bytes", 0),
+                "status": "active" if status == "ok" else "error",
+                "deltas": deltas or []
+            }
+        
+        if sentences_file:
+            file_path = Path(manifest_path).parent / Path(sentences_file).name
+            stats = sentences_stats or _read_file_stats(file_path)
+            manifest.setdefault("files", {})["sentences"] = {
+                "filename": file_path.name,
+                "version": manifest.get("version", "0.1.0"),
+                "generated_at": current_time,
+                "checksum": stats["checksum"],
+                "record_count": stats.get("record_count", 0),
+                "bytes": stats.get("bytes", 0),
+                "status": "active"
             }
         
         if sources:
             manifest["sources"] = sources
         
+        if source_status:
+            manifest["source_status"] = source_status
+        
+        if validators is not None:
+            manifest["validators"] = validators
+        
+        if metrics is not None:
+            manifest["metrics"] = metrics
+        
         # Write updated manifest
         with open(manifest_path, 'w', encoding='utf-8') as f:
             json.dump(manifest, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Paginated listing pages for PP100 ingest pipeline
+Walks the session archives of the sources (newest sessions first) page by
+page, for backfills reaching further back than the first page
+"""
+
+import logging
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from ingest.utils import patterns
+from ingest.utils.http import fetch_with_etag
+
+logger = logging.getLogger(__name__)
+
+# Listing pages followed at most in one walk
+MAX_LISTING_PAGES = 100
+
+def next_page_url(soup: BeautifulSoup, url: str) -> Optional[str]:
+    """
+    URL of the next page of a listing
+    
+    Args:
+        soup: Parsed listing page
+        url: URL of the page, for relative links
+    
+    Returns:
+        Absolute URL of the rel="next" or "Successiva" link, None on the last page
+    """
+    link = soup.find('a', rel='next', href=True) or soup.find('a', string=patterns.LISTING_NEXT_RE, href=True)
+    return urljoin(url, link['href']) if link else None
+
+def iter_listing_pages(session, url: str,
+                       max_pages: int = MAX_LISTING_PAGES) -> Iterator[Tuple[str, BeautifulSoup]]:
+    """
+    Fetch the pages of a listing, following its next links
+    
+    The caller stops the walk (breaks out of the loop) once the pages
+    reach back far enough.
+    
+    Args:
+        session: HTTP session
+        url: URL of the first page
+        max_pages: Pages fetched at most
+    
+    Yields:
+        (url, soup) of each page, first page first
+    """
+    seen = set()
+    while url and url not in seen:
+        if len(seen) >= max_pages:
+            logger.warning(f"Stopping listing walk after {max_pages} pages at {url}")
+            return
+        seen.add(url)
+        listing = fetch_with_etag(session, url, conditional=False)
+        soup = BeautifulSoup(listing["content"], 'lxml')
+        yield url, soup
+        url = next_page_url(soup, url)
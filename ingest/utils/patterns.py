@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Precompiled regular expressions for PP100 ingest pipeline
+Shared by the adapters and the time/text utilities so hot paths never
+compile or look up a pattern per call
+"""
+
+import re
+
+# Italian month names, in calendar order
+MONTHS = (
+    'gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
+    'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre'
+)
+MONTH_NUMBERS = {name: number for number, name in enumerate(MONTHS, 1)}
+_MONTHS_ALT = '|'.join(MONTHS)
+
+# --- Dates and times ---
+
+# "15 gennaio 2025" anywhere in a title (whole match in group 1)
+TITLE_DATE_RE = re.compile(rf'(\d{{1,2}}\s+(?:{_MONTHS_ALT})\s+\d{{4}})', re.IGNORECASE)
+
+# Time-of-day formats tried in order by parse_italian_timestamp
+TIME_PATTERNS = (
+    # "ore 14:30" or "14:30"
+    re.compile(r'(?:ore\s+)?(\d{1,2}):(\d{2})'),
+    # "14.30" (Italian format)
+    re.compile(r'(\d{1,2})\.(\d{2})'),
+    # "14,30" (alternative Italian format)
+    re.compile(r'(\d{1,2}),(\d{2})'),
+)
+
+# Date formats tried in order by extract_session_date (day, month, year groups)
+DATE_PATTERNS = (
+    # "seduta del 15 gennaio 2025"
+    re.compile(rf'seduta\s+del\s+(\d{{1,2}})\s+({_MONTHS_ALT})\s+(\d{{4}})', re.IGNORECASE),
+    # "15 gennaio 2025"
+    re.compile(rf'(\d{{1,2}})\s+({_MONTHS_ALT})\s+(\d{{4}})', re.IGNORECASE),
+    # "15/01/2025" or "15-01-2025"
+    re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})', re.IGNORECASE),
+)
+
+# "Ore 16:30" inside an intervention
+ORE_TIME_RE = re.compile(r'Ore\s+(\d{1,2}:\d{2})')
+
+# --- Text ---
+
+# Candidate sentence ends for the segmenter: . ! ? or an ellipsis, plus any
+# closing quotes or brackets, followed by whitespace or the end of the text;
+# group next is the first character of the following sentence, if any
+SENTENCE_BOUNDARY_RE = re.compile(
+    r'(?P<end>[.!?\u2026]+[)\]"\'\u00bb\u201d\u2019]*)(?=\s|\Z)(?=\s*(?P<next>\S)?)'
+)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Title prefixes before a speaker name
+SPEAKER_PREFIX_RE = re.compile(r'^(On\.|Onorevole|Sen\.|Senatore)\s+')
+
+# --- Speakers ---
+
+# Parliamentary group in parentheses: "ROSSI (PD)"
+GROUP_RE = re.compile(r'\(([^)]+)\)')
+GROUP_STRIP_RE = re.compile(r'\s*\([^)]+\)\s*')
+
+# Camera intervention markers and line-based fallback speakers
+CAMERA_MARKER_RE = re.compile(r'Interviene\s+', re.IGNORECASE)
+CAMERA_LINE_SPEAKER_RE = re.compile(r'^(?:Interviene\s+)?([A-Z][A-Z\s]+?)(?:\s+\(([^)]+)\))?')
+
+# Senato speaker headings and line-based fallback speakers
+SENATO_HEADING_RE = re.compile(r'^(PRESIDENTE|ZEDDA|relatore|[A-Z]+\s+[A-Z]+)', re.IGNORECASE)
+SENATO_LINE_SPEAKER_RE = re.compile(r'^([A-Z][A-Z\s]+?)(?:\s+\(([^)]+)\))?')
+
+# Raw heading candidates in document bytes, used to locate tail offsets
+SENATO_HEADING_TAG_RE = re.compile(rb'<(?:h[234]|strong)\b[^>]*>(?P<text>[^<]*)<', re.IGNORECASE)
+
+# --- Discovery ---
+
+CAMERA_SESSION_HREF_RE = re.compile(r'idSeduta=\d+')
+CAMERA_SESSION_ID_RE = re.compile(r'idSeduta=(\d+)')
+CAMERA_RESOCONTO_LINK_RE = re.compile(r'Vai al resoconto', re.IGNORECASE)
+CAMERA_SOMMARIO_LINK_RE = re.compile(r'Sommario', re.IGNORECASE)
+
+SENATO_HTML_HREF_RE = re.compile(r'show-doc.*tipodoc=Resaula')
+SENATO_HOT_LINK_RE = re.compile(r'Resoconto in corso di seduta', re.IGNORECASE)
+SENATO_XML_HREF_RE = re.compile(r'show-doc.*tipodoc=.*xml')
+
+# "Successiva", "Pagina successiva »", "›": link to the next page of a listing
+LISTING_NEXT_RE = re.compile(r'^\s*(?:(?:pagina\s+)?(?:successiv[ao]|avanti|next)\s*[»›>]*|[»›>])\s*$', re.IGNORECASE)
+
+# --- HTTP ---
+
+CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-')
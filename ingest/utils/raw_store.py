@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Raw response store for PP100 ingest pipeline
+Content-addressed copy of every document fetched, used to replay the
+adapters offline (run_ingest --replay)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directory of the store when --replay is given without --raw-store
+DEFAULT_RAW_STORE_DIR = "raw_store"
+
+class RawStore:
+    """
+    Response bodies keyed by SHA256, with a URL -> digest index
+    
+    Bodies are stored once per digest, gzip-compressed, under
+    objects/<first 2 hex digits>/<digest>.gz. The index is an append-only
+    journal (index.jsonl) with one line per new body of a URL: the last
+    line of a URL wins, so re-fetching an unchanged document costs nothing.
+    """
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_file = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+        self._index = self._load()
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the URL index, skipping unreadable lines"""
+        index = {}
+        if not self.index_file.exists():
+            return index
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    index[entry["url"]] = entry
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping unreadable raw store index line in {self.index_file}")
+        return index
+    
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+    
+    def put(self, url: str, content: bytes, encoding: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> str:
+        """
+        Store a response body and point its URL at it
+        
+        Args:
+            url: Fetched URL
+            content: Raw response body
+            encoding: Encoding the body is decoded with
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        
+        Returns:
+            SHA256 of the body
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = path.parent / f".tmp_{path.name}"
+                with open(temp_file, 'wb') as f:
+                    f.write(gzip.compress(content, mtime=0))
+                os.replace(temp_file, path)
+            
+            previous = self._index.get(url)
+            if (previous and previous["digest"] == digest and previous.get("encoding") == encoding
+                    and previous.get("etag") == etag and previous.get("last_modified") == last_modified):
+                return digest
+            
+            entry = {
+                "url": url,
+                "digest": digest,
+                "encoding": encoding,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": datetime.now(timezone.utc).isoformat()
+            }
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._index[url] = entry
+        return digest
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest stored response of a URL
+        
+        Args:
+            url: Fetched URL
+        
+        Returns:
+            Index entry (digest, encoding, etag, last_modified, fetched_at)
+            with content (bytes), or None if the URL was never stored
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        if entry is None:
+            return None
+        return dict(entry, content=self.read(entry["digest"]))
+    
+    def read(self, digest: str) -> bytes:
+        """
+        Read a stored body
+        
+        Args:
+            digest: SHA256 of the body
+        
+        Returns:
+            Raw body
+        """
+        with open(self._object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+    
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Latest index entry of every stored URL (without content)"""
+        with self._lock:
+            entries = list(self._index.values())
+        return iter(entries)
+    
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._index
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
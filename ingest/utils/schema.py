@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Arrow schemas of the interventions and sentences Parquet files for PP100 ingest pipeline
+Logical record: schemas/interventions.schema.json. Physical layout: repeated
+strings dictionary-encoded, timestamps typed, sentence spans as two int32 lists
+"""
+
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from ingest.utils.time import ROME_TZ
+
+# Repeated strings (sources, sessions, speakers, groups, URLs) are stored once per row group
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP_UTC = pa.timestamp('us', tz='UTC')
+
+INTERVENTIONS_SCHEMA = pa.schema([
+    pa.field('id', pa.string()),
+    pa.field('source', DICTIONARY_STRING),
+    pa.field('seduta', DICTIONARY_STRING),
+    pa.field('ts_start', TIMESTAMP_UTC),
+    pa.field('oratore', DICTIONARY_STRING),
+    pa.field('gruppo', DICTIONARY_STRING),
+    pa.field('text', pa.string()),
+    # spans_frasi[i] = {"start": spans_start[i], "end": spans_end[i]}
+    pa.field('spans_start', pa.list_(pa.int32())),
+    pa.field('spans_end', pa.list_(pa.int32())),
+    pa.field('source_url', DICTIONARY_STRING),
+    pa.field('fetch_etag', pa.string()),
+    pa.field('fetch_last_modified', pa.string()),
+    pa.field('ingested_at', TIMESTAMP_UTC),
+    # Registry identity of the speaker (null if unmatched), see IdentityMatcher.enrich_frame
+    pa.field('person_id', DICTIONARY_STRING),
+    pa.field('party_id_at_ts', DICTIONARY_STRING),
+    pa.field('group_id_aula_at_ts', DICTIONARY_STRING),
+    # Id of the row cut short by the previous poll of a live document that this
+    # row continues (see SenatoHTMLAdapter tailing), null otherwise
+    pa.field('supersedes', pa.string()),
+])
+
+# One row per sentence of an intervention (sentences-YYYY-MM-DD.parquet, see
+# ingest.utils.sentences); start/end are offsets in the intervention text
+SENTENCES_SCHEMA = pa.schema([
+    pa.field('intervention_id', DICTIONARY_STRING),
+    pa.field('sentence_idx', pa.int32()),
+    pa.field('start', pa.int32()),
+    pa.field('end', pa.int32()),
+    # content_fingerprint of the sentence text: stable across runs, usable as a cache key
+    pa.field('sentence_hash', pa.string()),
+    pa.field('text', pa.string()),
+])
+
+# Timestamp columns whose naive values are local times rather than UTC:
+# adapters read ts_start from the resoconti, while ingested_at is utcnow()
+NAIVE_TIMEZONES = {
+    'ts_start': ROME_TZ,
+}
+
+def _span_bounds(bound: str) -> Callable[[pd.DataFrame], pd.Series]:
+    """Derive spans_<bound> from spans_frasi lists of {"start", "end"} dicts"""
+    def derive(df: pd.DataFrame) -> pd.Series:
+        return df['spans_frasi'].map(
+            lambda spans: None if spans is None or not hasattr(spans, '__iter__')
+            else [int(span[bound]) for span in spans]
+        )
+    return derive
+
+# Columns of the schema that rows written before it carry in another form:
+# column -> (legacy source column, derivation)
+DERIVED_COLUMNS = {
+    'spans_start': ('spans_frasi', _span_bounds('start')),
+    'spans_end': ('spans_frasi', _span_bounds('end')),
+}
+
+def _column_values(df: pd.DataFrame, name: str) -> Optional[pd.Series]:
+    """Values for a schema column, derived from legacy columns where missing"""
+    values = df[name] if name in df.columns else None
+    derived = DERIVED_COLUMNS.get(name)
+    if derived and derived[0] in df.columns:
+        legacy = derived[1](df)
+        values = legacy if values is None else values.where(values.notna(), legacy)
+    return values
+
+def _is_naive(value) -> bool:
+    """Whether a timestamp value parses to a time without UTC offset"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return False
+    try:
+        return pd.Timestamp(value).tzinfo is None
+    except (ValueError, TypeError):
+        return False
+
+def to_utc_timestamps(values: pd.Series, naive_tz=None) -> pd.Series:
+    """
+    Parse ISO strings, datetimes or empty values to UTC timestamps
+    
+    Args:
+        values: Column values
+        naive_tz: Time zone of naive values (None = UTC)
+    
+    Returns:
+        datetime64 UTC series (NaT where missing or unparseable)
+    """
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert('UTC')
+    if values.dtype == object:
+        values = values.where(values != '', None)
+    stamps = pd.to_datetime(values, utc=True, errors='coerce', format='ISO8601')
+    if naive_tz is None or stamps.isna().all():
+        return stamps
+    
+    naive = values.map(_is_naive).astype(bool)
+    if naive.any():
+        local = pd.to_datetime(values[naive], errors='coerce', format='ISO8601')
+        # Repeated hour at the end of DST: summer time; skipped hour: shifted forward
+        stamps[naive] = local.dt.tz_localize(
+            naive_tz, ambiguous=np.ones(len(local), dtype=bool), nonexistent=pd.Timedelta(hours=1)
+        ).dt.tz_convert('UTC')
+    return stamps
+
+def _to_array(values: pd.Series, data_type: pa.DataType, naive_tz=None) -> pa.Array:
+    """Convert a column to an Arrow array of the given type"""
+    if pa.types.is_timestamp(data_type):
+        # ISO strings (naive ones in naive_tz, UTC by default), datetimes or empty values
+        return pa.array(to_utc_timestamps(values, naive_tz), type=data_type, from_pandas=True)
+    if pa.types.is_dictionary(data_type):
+        strings = values.astype(object).where(values.notna(), None)
+        return pa.array(strings, type=pa.string(), from_pandas=True).dictionary_encode()
+    if pa.types.is_list(data_type):
+        lists = [None if v is None or (not hasattr(v, '__iter__') and pd.isna(v)) else list(v) for v in values]
+        return pa.array(lists, type=data_type)
+    return pa.array(values.astype(object).where(values.notna(), None), type=data_type, from_pandas=True)
+
+def conform_table(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """
+    Build an Arrow table with the given schema from a DataFrame
+    
+    Schema columns missing from df are derived from legacy columns (see
+    DERIVED_COLUMNS) or filled with nulls; columns of df outside the schema
+    and not consumed by a derivation are kept after them, with inferred types.
+    
+    Args:
+        df: DataFrame in any supported layout
+        schema: Target schema
+    
+    Returns:
+        Arrow table whose leading columns follow schema
+    """
+    arrays: List[pa.Array] = []
+    fields: List[pa.Field] = []
+    for field in schema:
+        values = _column_values(df, field.name)
+        if values is None:
+            array = pa.nulls(len(df), type=field.type)
+        else:
+            array = _to_array(values.reset_index(drop=True), field.type, NAIVE_TIMEZONES.get(field.name))
+        arrays.append(array)
+        fields.append(field)
+    
+    consumed = {source for source, _ in DERIVED_COLUMNS.values()}
+    for name in df.columns:
+        if name in schema.names or name in consumed:
+            continue
+        array = pa.array(df[name].reset_index(drop=True), from_pandas=True)
+        arrays.append(array)
+        fields.append(pa.field(name, array.type))
+    
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+def spans_frasi(spans_start: Optional[List[int]], spans_end: Optional[List[int]]) -> List[Dict[str, int]]:
+    """
+    Rebuild spans_frasi from the two span columns of a stored row
+    
+    Args:
+        spans_start: Sentence start offsets
+        spans_end: Sentence end offsets
+    
+    Returns:
+        List of {"start", "end"} dicts
+    """
+    if spans_start is None or spans_end is None:
+        return []
+    return [{"start": int(start), "end": int(end)} for start, end in zip(spans_start, spans_end)]
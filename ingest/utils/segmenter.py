@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Italian sentence segmenter for PP100 ingest pipeline
+Single regex pass over the candidate sentence ends, with an abbreviation
+table for the parliamentary register ("On.", "Sen.", "art.", "n.", "c.d.",
+...); spans are computed from the match offsets, never searched back in the
+text
+"""
+
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from ingest.utils.patterns import SENTENCE_BOUNDARY_RE
+
+# Lowercased abbreviations, without the final dot, that do not end a sentence
+ABBREVIATIONS: FrozenSet[str] = frozenset({
+    # Titles and forms of address
+    'on', 'onn', 'on.le', 'sen', 'sig', 'sigg', 'sig.ra', 'dott', 'dott.ssa', 'prof', 'prof.ssa',
+    'avv', 'ing', 'arch', 'rag', 'geom', 'mons', 'gen', 'col', 'magg', 'pres', 'min', 'sott', 'egr',
+    # Laws, acts and their parts
+    'art', 'artt', 'co', 'comm', 'lett', 'n', 'nn', 'num', 'par', 'parr', 'cap', 'capp', 'all',
+    'doc', 'reg', 'cost', 'sent', 'ord', 'tit', 'sez', 'prot', 'rif', 'd.l', 'd.lgs', 'd.p.r',
+    'd.m', 'd.p.c.m', 'l', 'c.c', 'c.p', 'c.p.c', 'c.p.p', 'a.c', 'a.s',
+    # References and common Latin/Italian short forms
+    'cfr', 'pag', 'pagg', 'p', 'pp', 'vol', 'tab', 'fig', 'ss', 'seg', 'segg', 'es', 'ecc', 'etc',
+    'cd', 'c.d', 'ca', 'vs', 'ecc.mo', 'ill.mo', 'spett',
+})
+
+# Abbreviations that may also close a sentence: they split before a capital letter
+TERMINAL_ABBREVIATIONS: FrozenSet[str] = frozenset({'ecc', 'etc', 'ss', 'segg'})
+
+# Opening punctuation stripped from the start of a token before the lookup
+_OPENING = '([{"\'«“‘'
+
+# Characters looked back from a dot for the token before it; longer tokens are
+# never abbreviations (the longest, with an elided article, is "dell'on.le")
+_TOKEN_WINDOW = 16
+
+def _abbreviation_key(token: str) -> str:
+    """Lookup form of the token before a dot: no opening punctuation or elided article."""
+    token = token.lstrip(_OPENING)
+    for apostrophe in ("'", '’'):
+        if apostrophe in token:
+            token = token.rsplit(apostrophe, 1)[1]
+    return token.lower()
+
+def _is_abbreviation(window: str, next_char: str, abbreviations: FrozenSet[str]) -> bool:
+    """
+    Whether the dot after window closes an abbreviation rather than a sentence.
+    
+    Args:
+        window: Text just before the dot (up to _TOKEN_WINDOW characters)
+        next_char: First character after the dot and its whitespace
+        abbreviations: Lowercased abbreviations without the final dot
+    
+    Returns:
+        True if the sentence goes on after the dot
+    """
+    words = window.split()
+    if not words or (len(words) == 1 and len(window) == _TOKEN_WINDOW):
+        # Nothing before the dot, or a token too long to be an abbreviation
+        return False
+    key = _abbreviation_key(words[-1])
+    if key in abbreviations:
+        return key not in TERMINAL_ABBREVIATIONS or not next_char.isupper()
+    # Initials ("M. Rossi") and dotted short forms ("S.p.A.", "U.E.")
+    if len(key) == 1:
+        return key.isalpha()
+    return '.' in key and all(0 < len(part) <= 2 and part.isalpha() for part in key.split('.'))
+
+def segment(text: Optional[str], abbreviations: FrozenSet[str] = ABBREVIATIONS) -> List[Tuple[int, int]]:
+    """
+    Split text into sentences.
+    
+    Spans are contiguous and cover the text from its first non-blank
+    character to the end: each sentence starts at its first character and
+    keeps the whitespace that follows it. Blank text has no sentences.
+    
+    Args:
+        text: Text to split
+        abbreviations: Lowercased abbreviations without the final dot
+    
+    Returns:
+        List of (start, end) character offsets
+    """
+    if not text:
+        return []
+    start = len(text) - len(text.lstrip())
+    if start == len(text):
+        return []
+    
+    spans = []
+    for match in SENTENCE_BOUNDARY_RE.finditer(text, start):
+        following = match.start('next')
+        if following < 0:
+            # Only whitespace left: it belongs to the last sentence
+            break
+        end, next_char = match.group('end', 'next')
+        if '!' not in end and '?' not in end:
+            # "ecc. e poi", "... e così via": the sentence goes on
+            if next_char.islower():
+                continue
+            dot = match.start()
+            if end == '.' and _is_abbreviation(text[max(start, dot - _TOKEN_WINDOW):dot], next_char, abbreviations):
+                continue
+        spans.append((start, following))
+        start = following
+    spans.append((start, len(text)))
+    return spans
+
+def segment_batch(texts: Iterable[Optional[str]],
+                  abbreviations: FrozenSet[str] = ABBREVIATIONS) -> List[List[Tuple[int, int]]]:
+    """
+    Split many texts into sentences.
+    
+    Args:
+        texts: Texts to split (None counts as blank)
+        abbreviations: Lowercased abbreviations without the final dot
+    
+    Returns:
+        Spans of every text, in order (see segment)
+    """
+    return [segment(text, abbreviations) for text in texts]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Sentence table for PP100 ingest pipeline
+One row per sentence of the interventions of a day, materialized from their
+text and spans so sentence-level stages scan a flat table instead of
+re-slicing every text
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ingest.utils.ids import content_fingerprint
+from ingest.utils.io import read_daily_frame, safe_write_parquet
+from ingest.utils.schema import INTERVENTIONS_SCHEMA, SENTENCES_SCHEMA, conform_table
+
+logger = logging.getLogger(__name__)
+
+# Interventions columns the sentences are built from
+_SOURCE_SCHEMA = pa.schema([INTERVENTIONS_SCHEMA.field(name) for name in ('id', 'text', 'spans_start', 'spans_end')])
+
+def sentences_path(interventions_path: str) -> Path:
+    """
+    Sentences file of a daily interventions file
+    
+    Args:
+        interventions_path: Path of the daily file (interventions-YYYY-MM-DD.parquet)
+    
+    Returns:
+        Path of sentences-YYYY-MM-DD.parquet in the same directory
+    """
+    path = Path(interventions_path)
+    return path.parent / path.name.replace("interventions-", "sentences-", 1)
+
+def sentence_table(interventions: pd.DataFrame) -> pa.Table:
+    """
+    Explode interventions into one row per sentence
+    
+    Span lists are flattened in one pass over the Arrow columns; only the
+    text slices and their hashes are computed per sentence. Rows whose span
+    lists differ in length are skipped.
+    
+    Args:
+        interventions: Interventions with id, text and either spans_start/spans_end
+            or legacy spans_frasi
+    
+    Returns:
+        Table with SENTENCES_SCHEMA, in intervention then sentence order
+    """
+    if interventions.empty:
+        return SENTENCES_SCHEMA.empty_table()
+    columns = [c for c in ('id', 'text', 'spans_start', 'spans_end', 'spans_frasi') if c in interventions.columns]
+    table = conform_table(interventions[columns], _SOURCE_SCHEMA).select(_SOURCE_SCHEMA.names)
+    
+    starts_lists = table.column('spans_start').combine_chunks()
+    ends_lists = table.column('spans_end').combine_chunks()
+    counts = pc.fill_null(pc.list_value_length(starts_lists), 0).to_numpy()
+    matched = counts == pc.fill_null(pc.list_value_length(ends_lists), 0).to_numpy()
+    if not matched.all():
+        logger.warning(f"Skipping {int((~matched).sum())} interventions with mismatched span lists")
+        table = table.filter(pa.array(matched))
+        starts_lists = table.column('spans_start').combine_chunks()
+        ends_lists = table.column('spans_end').combine_chunks()
+        counts = counts[matched]
+    
+    parents = pc.list_parent_indices(starts_lists)
+    starts = pc.list_flatten(starts_lists)
+    ends = pc.list_flatten(ends_lists)
+    # Position of each sentence in its intervention
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    sentence_idx = np.arange(len(starts), dtype=np.int32) - first.astype(np.int32)
+    
+    texts = pc.fill_null(table.column('text'), '').to_pylist()
+    sentence_texts = [
+        texts[parent][start:end].strip()
+        for parent, start, end in zip(parents.to_pylist(), starts.to_pylist(), ends.to_pylist())
+    ]
+    
+    return pa.Table.from_arrays([
+        pc.take(table.column('id'), parents).combine_chunks().dictionary_encode(),
+        pa.array(sentence_idx, pa.int32()),
+        starts.cast(pa.int32()),
+        ends.cast(pa.int32()),
+        pa.array([content_fingerprint(text) for text in sentence_texts], pa.string()),
+        pa.array(sentence_texts, pa.string()),
+    ], schema=SENTENCES_SCHEMA)
+
+def write_sentences(interventions_path: str,
+                    write_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Rebuild the sentences file of a day from its interventions
+    
+    The interventions are read with their uncompacted deltas, so the
+    sentences always match the latest content of every intervention.
+    
+    Args:
+        interventions_path: Path of the daily interventions file
+        write_options: Extra keyword arguments for safe_write_parquet
+    
+    Returns:
+        Stats of the sentences file (see safe_write_parquet) with its filename
+    """
+    output_path = sentences_path(interventions_path)
+    table = sentence_table(read_daily_frame(interventions_path))
+    stats = safe_write_parquet(table, str(output_path), schema=SENTENCES_SCHEMA, **(write_options or {}))
+    return dict(stats, filename=output_path.name)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tail state for PP100 ingest pipeline
+Remembers how far growing live documents (Senato hotresaula) were parsed
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tail positions older than this are ignored (a live session lasts hours)
+DEFAULT_TAIL_TTL_S = 12 * 3600
+
+class TailState:
+    """
+    JSON-backed tail positions, one entry per live document URL
+    
+    Each entry stores the byte offset of the last speaker heading parsed,
+    an anchor (the heading bytes at that offset) and a digest of the bytes
+    before it, used to check that the document only grew since the last
+    poll. The next poll parses from the offset onwards, so the last
+    intervention (which may still be growing) is always parsed again; its
+    id and speaker are kept to flag the longer version that replaces it.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TAIL_TTL_S):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load tail entries from disk, ignoring unreadable files"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("entries", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tail state {self.path}: {e}")
+            return {}
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the tail position of a document if it is within the TTL
+        
+        Args:
+            url: Live document URL
+        
+        Returns:
+            Copy of the entry (offset, anchor, prefix_digest, encoding,
+            session_info, last_intervention), or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return None
+            try:
+                updated_at = datetime.fromisoformat(entry["updated_at"])
+            except (KeyError, ValueError):
+                return None
+            age = (datetime.now(timezone.utc) - updated_at).total_seconds()
+            if age < 0 or age >= self.ttl_seconds:
+                return None
+            return dict(entry)
+    
+    def put(self, url: str, offset: int, anchor: str, prefix_digest: Optional[str],
+            encoding: str, session_info: Dict[str, Any],
+            last_intervention: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store the tail position of a document
+        
+        Args:
+            url: Live document URL
+            offset: Byte offset of the last speaker heading
+            anchor: Hex of the bytes starting at offset
+            prefix_digest: SHA256 of the bytes before offset (None if unknown)
+            encoding: Document encoding
+            session_info: Session info extracted from the document head
+            last_intervention: id and oratore of the intervention starting
+                at offset (None if it was not parsed)
+        """
+        with self._lock:
+            self._entries[url] = {
+                "offset": offset,
+                "anchor": anchor,
+                "prefix_digest": prefix_digest,
+                "encoding": encoding,
+                "session_info": session_info,
+                "last_intervention": last_intervention,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }
+            self._dirty = True
+    
+    def discard(self, url: str) -> None:
+        """
+        Forget the tail position of a document (next poll parses it fully)
+        
+        Args:
+            url: Live document URL
+        """
+        with self._lock:
+            if self._entries.pop(url, None) is not None:
+                self._dirty = True
+    
+    def save(self) -> None:
+        """Write the tail state to disk atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_file = self.path.parent / f".tmp_{self.path.name}"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self._entries}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.path)
+            self._dirty = False
@@ -1,7 +1,11 @@
 """Text utilities for sentence splitting and span management."""
-import re
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import logging
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from ingest.utils.patterns import WHITESPACE_RE, SPEAKER_PREFIX_RE
+from ingest.utils.segmenter import segment
 
 logger = logging.getLogger(__name__)
 
@@ -9,70 +13,29 @@ def split_sentences(text: str) -> List[Tuple[int, int]]:
     """
     Split text into sentences and return spans (start, end).
     
-    Uses regex for simple cases, syntok for complex ones.
+    Uses the Italian segmenter (see ingest.utils.segmenter), which knows the
+    parliamentary abbreviations and computes offsets in a single pass.
     Returns list of (start, end) character positions.
     """
-    # For simple text, use regex which is more reliable
-    if len(text) < 500:  # Simple text threshold
-        return _split_with_regex(text)
-    
-    # For now, always use regex as syntok has issues with Italian text
-    return _split_with_regex(text)
-
-def _split_with_syntok(text: str) -> List[Tuple[int, int]]:
-    """Split using syntok library for better Italian language support."""
-    from syntok import segmenter, tokenizer
-    
-    spans = []
-    current_start = 0
-    
-    # Create tokenizer instance and tokenize the text
-    tok = tokenizer.Tokenizer()
-    tokens = tok.tokenize(text)
-    
-    # Use syntok segmenter to split into sentences
-    sentences = segmenter.split(tokens)
-    
-    for sentence_tokens in sentences:
-        # Convert tokens back to text
-        sentence_text = ' '.join(str(token) for token in sentence_tokens)
-        start = text.find(sentence_text, current_start)
-        if start == -1:
-            # Fallback: approximate position
-            start = current_start
-        
-        end = start + len(sentence_text)
-        # Ensure end doesn't exceed text length
-        end = min(end, len(text))
-        spans.append((start, end))
-        current_start = end
-    
-    return spans
+    return segment(text)
 
-def _split_with_regex(text: str) -> List[Tuple[int, int]]:
-    """Fallback regex-based sentence splitting for Italian."""
-    # Italian sentence endings: . ! ? followed by whitespace (including newlines)
-    sentence_pattern = r'[.!?]\s*'
-    
-    spans = []
-    current_start = 0
-    
-    for match in re.finditer(sentence_pattern, text):
-        # Find the actual sentence boundary (period, exclamation, question mark)
-        sentence_end = match.start() + 1  # Just after the punctuation
-        spans.append((current_start, sentence_end))
-        current_start = sentence_end
-    
-    # Add the last sentence if there's remaining text
-    if current_start < len(text):
-        spans.append((current_start, len(text)))
-    
-    return spans
+def _span_bounds(span) -> Optional[Tuple[int, int]]:
+    """(start, end) of a span given as a tuple or a {'start', 'end'} dict, None otherwise."""
+    if isinstance(span, dict):
+        return span['start'], span['end']
+    if isinstance(span, tuple):
+        return span
+    return None
 
 def test_span_coherence(text: str, spans) -> bool:
     """
     Test if spans can reconstruct the original text.
     
+    Spans are coherent when they are contiguous (each starts where the
+    previous one ends), the first starts at the first non-blank character
+    and the last ends between the last non-blank character and the end of
+    the text. Checked arithmetically in O(spans), without building strings.
+    
     Args:
         text: The original text
         spans: List of spans, either as tuples (start, end) or dicts {'start': start, 'end': end}
@@ -82,31 +45,112 @@ def test_span_coherence(text: str, spans) -> bool:
     if not spans:
         return len(text.strip()) == 0
     
-    reconstructed = ""
+    length = len(text)
+    first = len(text) - len(text.lstrip())
+    last = len(text.rstrip())
+    
+    previous_end = None
     for span in spans:
-        if isinstance(span, dict):
-            start, end = span['start'], span['end']
-        elif isinstance(span, tuple):
-            start, end = span
-        else:
+        bounds = _span_bounds(span)
+        if bounds is None:
             return False
-            
-        if start < 0 or end > len(text) or start >= end:
+        start, end = bounds
+        if start < 0 or end > length or start >= end:
             return False
-        reconstructed += text[start:end]
+        if previous_end is not None and start != previous_end:
+            return False
+        previous_end = end
+    
+    # Blank text: any in-bounds contiguous spans cover it
+    if last == 0:
+        return True
+    return _span_bounds(spans[0])[0] == first and previous_end >= last
+
+def span_coherence_mask(table: pa.Table, text_column: str = 'text',
+                        start_column: str = 'spans_start', end_column: str = 'spans_end') -> np.ndarray:
+    """
+    Span coherence of every row of an interventions table, in one vectorized pass.
     
-    # Remove trailing space and compare
-    reconstructed = reconstructed.rstrip()
-    original_clean = text.strip()
+    Same rules as test_span_coherence, applied to the Arrow list columns of
+    the stored layout (see ingest.utils.schema). Null texts count as empty
+    and null span lists as no spans.
     
+    Args:
+        table: Table with a text column and two list<int> span columns
+        text_column: Name of the text column
+        start_column: Name of the span starts column
+        end_column: Name of the span ends column
+    
+    Returns:
+        Boolean array, True for coherent rows
+    """
+    rows = table.num_rows
+    texts = pc.fill_null(table.column(text_column), '')
+    length = pc.utf8_length(texts).to_numpy().astype(np.int64)
+    first = length - pc.utf8_length(pc.utf8_ltrim_whitespace(texts)).to_numpy()
+    last = pc.utf8_length(pc.utf8_rtrim_whitespace(texts)).to_numpy().astype(np.int64)
+    
+    starts_lists = table.column(start_column).combine_chunks()
+    ends_lists = table.column(end_column).combine_chunks()
+    counts = pc.fill_null(pc.list_value_length(starts_lists), 0).to_numpy().astype(np.int64)
+    end_counts = pc.fill_null(pc.list_value_length(ends_lists), 0).to_numpy().astype(np.int64)
+    starts = pc.list_flatten(starts_lists).to_numpy(zero_copy_only=False).astype(np.int64)
+    ends = pc.list_flatten(ends_lists).to_numpy(zero_copy_only=False).astype(np.int64)
+    
+    # Rows without spans are coherent only if their text is blank
+    valid = np.where(counts == 0, last == 0, True) & (counts == end_counts)
+    if len(starts) != len(ends):
+        # Mismatched span lists somewhere: only rows with matching counts can be checked
+        return valid & (counts == 0)
+    if len(starts) == 0:
+        return valid
+    
+    row = np.repeat(np.arange(rows), counts)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    is_first = np.zeros(len(starts), dtype=bool)
+    is_first[offsets[:-1][counts > 0]] = True
+    is_last = np.zeros(len(starts), dtype=bool)
+    is_last[offsets[1:][counts > 0] - 1] = True
+    
+    bad = (starts < 0) | (ends > length[row]) | (starts >= ends)
+    # Contiguity: every span but the first of its row starts at the previous end
+    bad[1:] |= ~is_first[1:] & (starts[1:] != ends[:-1])
+    # Coverage of the non-blank text (blank texts only need in-bounds spans)
+    nonblank = last[row] > 0
+    bad |= is_first & nonblank & (starts != first[row])
+    bad |= is_last & nonblank & (ends < last[row])
+    
+    return valid & (np.bincount(row, weights=bad, minlength=rows) == 0)
 
+def coherent_interventions(interventions: List[Dict]) -> List[Dict]:
+    """
+    Keep the interventions whose spans reconstruct their text.
+    
+    Interventions that cannot be checked are kept.
     
-    return reconstructed == original_clean
+    Args:
+        interventions: Intervention dicts with text and spans_frasi
+    
+    Returns:
+        Interventions passing test_span_coherence, in order
+    """
+    valid = []
+    for intervention in interventions:
+        try:
+            if test_span_coherence(intervention["text"], intervention["spans_frasi"]):
+                valid.append(intervention)
+            else:
+                logger.warning(f"Span coherence failed for intervention {intervention['id']}")
+        except Exception as e:
+            logger.warning(f"Error testing span coherence: {e}")
+            # Keep the intervention anyway
+            valid.append(intervention)
+    return valid
 
 def normalize_text(text: str) -> str:
     """Basic text normalization for consistency."""
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     # Remove leading/trailing whitespace
     text = text.strip()
     return text
@@ -123,7 +167,7 @@ def extract_speaker_info(text: str) -> Tuple[str, str]:
     if lines:
         first_line = lines[0].strip()
         # Remove common prefixes
-        speaker = re.sub(r'^(On\.|Onorevole|Sen\.|Senatore)\s+', '', first_line)
+        speaker = SPEAKER_PREFIX_RE.sub('', first_line)
         return speaker, "Gruppo Misto"  # Default fallback
     
     return "Oratore Sconosciuto", "Gruppo Misto"
@@ -1,11 +1,32 @@
 """Time utilities for parsing Italian parliamentary timestamps."""
-import re
 from datetime import datetime, timezone, timedelta
 from typing import Optional
+from zoneinfo import ZoneInfo
 import logging
+from ingest.utils.patterns import TIME_PATTERNS, DATE_PATTERNS, MONTH_NUMBERS
 
 logger = logging.getLogger(__name__)
 
+# Time zone of the chambers: naive times read from the resoconti are local times
+ROME_TZ = ZoneInfo("Europe/Rome")
+
+def local_to_utc(dt: datetime) -> datetime:
+    """
+    Convert a datetime to UTC, taking naive values as Europe/Rome local times.
+    
+    Ambiguous local times (the repeated hour when DST ends) are taken as
+    summer time (fold=0).
+    
+    Args:
+        dt: Naive (Rome local) or timezone-aware datetime
+    
+    Returns:
+        datetime in UTC
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ROME_TZ)
+    return dt.astimezone(timezone.utc)
+
 def parse_italian_timestamp(timestamp_str: str) -> Optional[datetime]:
     """
     Parse Italian parliamentary timestamp formats.
@@ -22,18 +43,9 @@ def parse_italian_timestamp(timestamp_str: str) -> Optional[datetime]:
     # Remove common prefixes and normalize
     timestamp_str = timestamp_str.strip()
     
-    # Common patterns in Italian parliamentary transcripts
-    patterns = [
-        # "ore 14:30" or "14:30"
-        r'(?:ore\s+)?(\d{1,2}):(\d{2})',
-        # "14.30" (Italian format)
-        r'(\d{1,2})\.(\d{2})',
-        # "14,30" (alternative Italian format)
-        r'(\d{1,2}),(\d{2})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, timestamp_str)
+    # Common patterns in Italian parliamentary transcripts (see TIME_PATTERNS)
+    for pattern in TIME_PATTERNS:
+        match = pattern.search(timestamp_str)
         if match:
             try:
                 hour = int(match.group(1))
@@ -79,24 +91,9 @@ def extract_session_date(text: str) -> Optional[datetime]:
     if not text:
         return None
     
-    # Common Italian date patterns
-    date_patterns = [
-        # "seduta del 15 gennaio 2025"
-        r'seduta\s+del\s+(\d{1,2})\s+(gennaio|febbraio|marzo|aprile|maggio|giugno|luglio|agosto|settembre|ottobre|novembre|dicembre)\s+(\d{4})',
-        # "15 gennaio 2025"
-        r'(\d{1,2})\s+(gennaio|febbraio|marzo|aprile|maggio|giugno|luglio|agosto|settembre|ottobre|novembre|dicembre)\s+(\d{4})',
-        # "15/01/2025" or "15-01-2025"
-        r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-    ]
-    
-    month_names = {
-        'gennaio': 1, 'febbraio': 2, 'marzo': 3, 'aprile': 4,
-        'maggio': 5, 'giugno': 6, 'luglio': 7, 'agosto': 8,
-        'settembre': 9, 'ottobre': 10, 'novembre': 11, 'dicembre': 12
-    }
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    # Common Italian date patterns (see DATE_PATTERNS)
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 if len(match.groups()) == 3:
@@ -108,7 +105,7 @@ def extract_session_date(text: str) -> Optional[datetime]:
                     else:
                         # Text format (DD Month YYYY)
                         day = int(match.group(1))
-                        month = month_names[match.group(2).lower()]
+                        month = MONTH_NUMBERS[match.group(2).lower()]
                         year = int(match.group(3))
                     
                     # Validate date components
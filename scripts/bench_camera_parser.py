@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+PP100 Camera Parser Benchmark
+
+Compares the BeautifulSoup and single-pass ("stream") parsing engines of
+the Camera adapter on the test fixtures and on synthetic full-day
+resoconti, checking that both produce the same interventions.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest.adapters.camera_html import CameraHTMLAdapter
+
+FIXTURES_DIR = Path(__file__).parent.parent / "ingest" / "tests" / "fixtures"
+
+# Fields that depend on the parse time, not on the document
+VOLATILE_FIELDS = ("ingested_at",)
+
+
+def synthetic_resoconto(turns: int) -> str:
+    """Build a stenographic report with the given number of speaker turns."""
+    speakers = ["ROSSI (PD-IDP)", "BIANCHI (FDI)", "VERDI (M5S)", "PRESIDENTE"]
+    body = []
+    for i in range(turns):
+        body.append(
+            f'<p class="oratore">Interviene {speakers[i % len(speakers)]}</p>'
+            f'<p>Ore {9 + (i // 60) % 12}:{i % 60:02d} - Signor Presidente, intervengo sul punto {i}. '
+            f'Il provvedimento in esame richiede una valutazione attenta.</p>'
+            f'<p>Concludo ribadendo la posizione del gruppo sul punto {i}.</p>'
+        )
+    return (
+        '<html><head><title>Resoconto stenografico - Seduta del 15 gennaio 2025</title></head>'
+        f'<body><h1>Seduta del 15 gennaio 2025</h1><div class="content">{"".join(body)}</div></body></html>'
+    )
+
+
+def time_engine(parse: Callable[[], List], repeat: int) -> float:
+    """Best wall time in seconds over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def strip_volatile(interventions: List[dict]) -> List[dict]:
+    """Drop fields that legitimately differ between two runs."""
+    return [{k: v for k, v in i.items() if k not in VOLATILE_FIELDS} for i in interventions]
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Benchmark Camera parsing engines")
+    parser.add_argument("--turns", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="Speaker turns of the synthetic documents (default: 100 1000 5000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measure (default: 3)")
+    args = parser.parse_args()
+    
+    # Parse warnings would swamp the table
+    logging.disable(logging.WARNING)
+    
+    soup_adapter = CameraHTMLAdapter(parser_engine="soup")
+    stream_adapter = CameraHTMLAdapter(parser_engine="stream")
+    
+    documents = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    documents += [(f"synthetic-{turns}", synthetic_resoconto(turns)) for turns in args.turns]
+    
+    print(f"{'document':<24} {'size':>9} {'items':>6} {'soup s':>9} {'stream s':>9} {'speedup':>8}")
+    ok = True
+    for name, html in documents:
+        url = f"https://www.camera.it/{name}"
+        soup_items = soup_adapter.parse_interventions(html, url)
+        stream_items = stream_adapter.parse_interventions(html, url)
+        if strip_volatile(soup_items) != strip_volatile(stream_items):
+            print(f"❌ {name}: engines disagree")
+            ok = False
+            continue
+        
+        soup_s = time_engine(lambda: soup_adapter.parse_interventions(html, url), args.repeat)
+        stream_s = time_engine(lambda: stream_adapter.parse_interventions(html, url), args.repeat)
+        print(f"{name:<24} {len(html):>9} {len(soup_items):>6} {soup_s:>9.4f} {stream_s:>9.4f} {soup_s / stream_s:>7.1f}x")
+    
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
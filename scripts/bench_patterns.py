@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+PP100 Regex Micro-benchmarks
+
+Per-call cost of the regex-heavy helpers before (patterns built or looked
+up in every call, one substitution per honorific) and after the shared
+precompiled patterns. Each pair is checked to return the same result.
+"""
+
+import argparse
+import logging
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from unidecode import unidecode
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from identities.utils import HONORIFICS, normalize_name
+from ingest.adapters.camera_html import CameraHTMLAdapter
+from ingest.utils.patterns import TITLE_DATE_RE
+from ingest.utils.time import extract_session_date, parse_italian_timestamp
+
+MONTHS = r'gennaio|febbraio|marzo|aprile|maggio|giugno|luglio|agosto|settembre|ottobre|novembre|dicembre'
+
+
+def legacy_normalize_name(raw: str) -> str:
+    """normalize_name with one re.sub per honorific."""
+    norm = unidecode(raw.lower())
+    for honorific in HONORIFICS:
+        norm = re.sub(r'\b' + re.escape(honorific) + r'\b', '', norm)
+    norm = re.sub(r'\s+', ' ', norm)
+    norm = re.sub(r'[^\w\s-]', ' ', norm)
+    norm = norm.replace('-', ' ')
+    norm = re.sub(r'\s+', ' ', norm)
+    return norm.strip().strip('-')
+
+
+def legacy_speaker_info(text: str) -> dict:
+    """Camera _extract_speaker_info with inline patterns."""
+    text = text.replace("Interviene", "").strip()
+    group_match = re.search(r'\(([^)]+)\)', text)
+    return {
+        "oratore": re.sub(r'\s*\([^)]+\)\s*', '', text).strip(),
+        "gruppo": group_match.group(1) if group_match else ""
+    }
+
+
+def legacy_title_date(title: str):
+    """Session title date lookup with an inline pattern."""
+    match = re.search(rf'(\d{{1,2}}\s+(?:{MONTHS})\s+\d{{4}})', title, re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def legacy_session_date(text: str):
+    """extract_session_date core with inline patterns and month table."""
+    month_names = {name: i for i, name in enumerate(MONTHS.split('|'), 1)}
+    for pattern in (rf'seduta\s+del\s+(\d{{1,2}})\s+({MONTHS})\s+(\d{{4}})',
+                    rf'(\d{{1,2}})\s+({MONTHS})\s+(\d{{4}})',
+                    r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})'):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            month = match.group(2)
+            return int(match.group(1)), int(month) if month.isdigit() else month_names[month.lower()], int(match.group(3))
+    return None
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for precompiled regex patterns")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measure (default: 20000)")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    camera = CameraHTMLAdapter()
+    name = "On. Dott. Maria-Elena D'Àlessandro (Vicepresidente)"
+    speaker = "Interviene ROSSI Mario (PD-IDP)"
+    title = "Resoconto stenografico - Seduta del 15 gennaio 2025"
+    
+    def session_date_after():
+        d = extract_session_date(title)
+        return (d.day, d.month, d.year) if d else None
+    
+    cases = [
+        ("normalize_name", lambda: legacy_normalize_name(name), lambda: normalize_name(name)),
+        ("speaker_info", lambda: legacy_speaker_info(speaker), lambda: camera._extract_speaker_info(speaker)),
+        ("title_date", lambda: legacy_title_date(title),
+         lambda: (lambda m: m.group(1) if m else None)(TITLE_DATE_RE.search(title))),
+        ("session_date", lambda: legacy_session_date(title), session_date_after),
+        ("timestamp", lambda: parse_italian_timestamp("ore 14.30") is not None,
+         lambda: parse_italian_timestamp("ore 14.30") is not None),
+    ]
+    
+    print(f"{'helper':<16} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    ok = True
+    for label, before, after in cases:
+        if before() != after():
+            print(f"❌ {label}: results differ ({before()!r} != {after()!r})")
+            ok = False
+            continue
+        before_us = min(timeit.repeat(before, number=args.number, repeat=3)) / args.number * 1e6
+        after_us = min(timeit.repeat(after, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{label:<16} {before_us:>10.2f} {after_us:>10.2f} {before_us / after_us:>7.1f}x")
+    
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+PP100 Registry Build Benchmark
+
+Builds the persons registry from synthetic seeds of 1,000 to 10,000
+persons and compares it with the previous builder, which scanned persons
+per seed row and concatenated a one-row DataFrame per crosswalk/alias.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from identities.build_registry import RegistryBuilder, XREF_COLUMNS, ALIAS_COLUMNS
+from identities.utils import normalize_name, slugify
+
+FIRST_NAMES = ["Mario", "Anna", "Niccolò", "Giulia", "Luca", "Chiara", "Fabrizio", "Elena"]
+LAST_NAMES = ["Rossi", "Bianchi", "D'Amico", "Verdi", "Esposito", "Gallo", "Russo", "Ferrari"]
+
+
+def synthetic_seed(persons: int) -> List[Dict[str, str]]:
+    """Seed rows with unique slugs; accented names also produce aliases."""
+    rows = []
+    for i in range(persons):
+        nome = FIRST_NAMES[i % len(FIRST_NAMES)]
+        cognome = f"{LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}{i}"
+        rows.append({
+            'person_id': f"P{i + 1:06d}",
+            'nome': nome,
+            'cognome': cognome,
+            'slug': slugify(nome, cognome),
+            'dob': f"19{50 + i % 50}-01-01",
+            'sex': "",
+            'wikidata_qid': "",
+            'source': "camera",
+            'source_id': str(100000 + i),
+            'url': f"https://www.camera.it/deputato/{i}"
+        })
+    return rows
+
+
+def write_seed(rows: List[Dict[str, str]], path: Path) -> None:
+    """Write seed rows as CSV."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def legacy_build(rows: List[Dict[str, str]]) -> int:
+    """Previous builder loop: linear person lookup and pd.concat per new row."""
+    persons = []
+    xref = pd.DataFrame(columns=XREF_COLUMNS)
+    aliases = pd.DataFrame(columns=ALIAS_COLUMNS)
+    for row in rows:
+        if any(p['slug'] == row['slug'] and p.get('dob') == row.get('dob') for p in persons):
+            continue
+        now = datetime.now(timezone.utc)
+        persons.append({'person_id': row['person_id'], 'slug': row['slug'], 'dob': row['dob']})
+        mask = (xref['person_id'] == row['person_id']) & (xref['source'] == row['source']) & (xref['source_id'] == row['source_id'])
+        if not mask.any():
+            xref = pd.concat([xref, pd.DataFrame([{
+                'person_id': row['person_id'], 'source': row['source'], 'source_id': row['source_id'],
+                'url': row['url'], 'first_seen': now, 'last_seen': now
+            }])], ignore_index=True)
+        raw_name = f"{row['nome']} {row['cognome']}"
+        norm_name = normalize_name(raw_name)
+        if norm_name != raw_name.lower():
+            mask = (aliases['person_id'] == row['person_id']) & (aliases['alias'] == norm_name)
+            if not mask.any():
+                aliases = pd.concat([aliases, pd.DataFrame([{
+                    'person_id': row['person_id'], 'alias': norm_name, 'from': now, 'to': None, 'confidence': 1.0
+                }])], ignore_index=True)
+    return len(persons)
+
+
+def indexed_build(seed_path: Path, data_dir: Path) -> int:
+    """Current builder, including materializing and saving the tables."""
+    builder = RegistryBuilder(str(data_dir))
+    builder._build_persons_from_seed(seed_path)
+    builder._save_all()
+    return len(builder.persons)
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Benchmark persons registry build")
+    parser.add_argument("--persons", type=int, nargs="+", default=[1000, 2000, 5000, 10000],
+                        help="Persons in the synthetic seeds (default: 1000 2000 5000 10000)")
+    parser.add_argument("--legacy-max", type=int, default=2000,
+                        help="Largest seed also run through the legacy builder (default: 2000)")
+    args = parser.parse_args()
+    
+    print(f"{'persons':>8} {'indexed s':>10} {'legacy s':>9} {'speedup':>8}")
+    ok = True
+    for count in args.persons:
+        rows = synthetic_seed(count)
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_path = Path(tmp) / "persons_seed.csv"
+            write_seed(rows, seed_path)
+            
+            # The builder prints one line per person
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                built = indexed_build(seed_path, Path(tmp) / "data")
+                indexed_s = time.perf_counter() - start
+            if built != count:
+                print(f"❌ {count}: built {built} persons")
+                ok = False
+                continue
+        
+        if count <= args.legacy_max:
+            start = time.perf_counter()
+            legacy_build(rows)
+            legacy_s = time.perf_counter() - start
+            print(f"{count:>8} {indexed_s:>10.3f} {legacy_s:>9.3f} {legacy_s / indexed_s:>7.1f}x")
+        else:
+            print(f"{count:>8} {indexed_s:>10.3f} {'-':>9} {'-':>8}")
+    
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
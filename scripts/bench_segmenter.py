@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+PP100 Sentence Segmenter Benchmark
+
+Throughput of the Italian segmenter (ingest.utils.segmenter) against the two
+previous split_sentences paths: the [.!?] regex split and the syntok split
+with text.find re-alignment. The corpus is the texts of the interventions
+files in --data-dir, or synthetic speeches full of parliamentary
+abbreviations. Each path also reports its sentence count and how many of its
+span lists pass test_span_coherence.
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest.utils.segmenter import segment_batch
+from ingest.utils.text import test_span_coherence
+
+SENTENCES = [
+    "Signor Presidente, colleghi, intervengo sul provvedimento in esame.",
+    "L'On. Rossi ha ricordato che l'art. 5, comma 2, del d.lgs. n. 150 del 2009 va modificato.",
+    "Il Sen. Bianchi e la Dott.ssa Verdi hanno presentato l'emendamento 3.12 alle ore 14.30.",
+    "Lo stanziamento passa da 1.500.000 a 2,5 milioni di euro, pari al 3.5 per cento.",
+    "È una questione seria?",
+    "Il c.d. decreto sostegni (cfr. pag. 12 del dossier) non basta!",
+    "Ne discuteremo con il Min. dell'economia, le regioni, i comuni ecc. Vedremo.",
+    "(Applausi dai Gruppi PD-IDP e M5S).",
+    "Ai sensi degli artt. 24 e 25 della Cost. la questione è chiara... e lo resta.",
+]
+
+
+def synthetic_corpus(texts: int, seed: int = 0) -> List[str]:
+    """Build speeches of 5 to 60 sentences from the sample sentences."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(5, 60)))
+        for _ in range(texts)
+    ]
+
+
+def data_corpus(data_dir: Path) -> List[str]:
+    """Texts of the interventions files in a data directory."""
+    texts = []
+    for path in sorted(data_dir.glob("interventions-*.parquet")):
+        texts.extend(t for t in pd.read_parquet(path, columns=["text"])["text"] if t)
+    return texts
+
+
+def legacy_regex(text: str) -> List[Tuple[int, int]]:
+    """Previous default path: split after every . ! ? (_split_with_regex)."""
+    spans = []
+    current_start = 0
+    for match in re.finditer(r'[.!?]\s*', text):
+        sentence_end = match.start() + 1
+        spans.append((current_start, sentence_end))
+        current_start = sentence_end
+    if current_start < len(text):
+        spans.append((current_start, len(text)))
+    return spans
+
+
+def legacy_syntok(text: str) -> List[Tuple[int, int]]:
+    """Previous syntok path: sentences re-found with text.find (_split_with_syntok)."""
+    from syntok import segmenter, tokenizer
+    
+    spans = []
+    current_start = 0
+    tokens = tokenizer.Tokenizer().tokenize(text)
+    for sentence_tokens in segmenter.split(tokens):
+        sentence_text = ' '.join(str(token) for token in sentence_tokens)
+        start = text.find(sentence_text, current_start)
+        if start == -1:
+            start = current_start
+        end = min(start + len(sentence_text), len(text))
+        spans.append((start, end))
+        current_start = end
+    return spans
+
+
+def run(label: str, split: Callable[[List[str]], List[List[Tuple[int, int]]]], texts: List[str]) -> None:
+    """Time one path over the corpus and print its row."""
+    start = time.perf_counter()
+    spans = split(texts)
+    elapsed = time.perf_counter() - start
+    
+    chars = sum(len(text) for text in texts)
+    sentences = sum(len(s) for s in spans)
+    coherent = sum(1 for text, s in zip(texts, spans) if test_span_coherence(text, s))
+    print(f"{label:<10} {len(texts):>7} {elapsed:>9.3f} {chars / elapsed / 1e6:>8.2f} "
+          f"{sentences:>10} {coherent / len(texts):>9.1%}")
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Benchmark the Italian sentence segmenter")
+    parser.add_argument("--data-dir", default=None, help="Use the interventions files of this directory as corpus")
+    parser.add_argument("--texts", type=int, default=20000, help="Synthetic speeches (default: 20000)")
+    parser.add_argument("--syntok-texts", type=int, default=500,
+                        help="Texts also run through the syntok path, the slowest (default: 500)")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    texts = data_corpus(Path(args.data_dir)) if args.data_dir else synthetic_corpus(args.texts)
+    if not texts:
+        print(f"❌ No texts in {args.data_dir}")
+        sys.exit(1)
+    print(f"🔍 {len(texts)} texts, {sum(len(t) for t in texts) / 1e6:.1f}M characters")
+    
+    print(f"{'path':<10} {'texts':>7} {'seconds':>9} {'MB/s':>8} {'sentences':>10} {'coherent':>9}")
+    run("segmenter", segment_batch, texts)
+    run("regex", lambda batch: [legacy_regex(t) for t in batch], texts)
+    if args.syntok_texts <= 0:
+        return
+    try:
+        import syntok  # noqa: F401
+    except ImportError:
+        print(f"{'syntok':<10} not installed")
+        return
+    run("syntok", lambda batch: [legacy_syntok(t) for t in batch], texts[:args.syntok_texts])
+
+
+if __name__ == "__main__":
+    main()
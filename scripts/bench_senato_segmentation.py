@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+PP100 Senato Segmentation Benchmark
+
+Measures speaker-block segmentation of the Senato adapter on synthetic
+resoconti of 100 to 5,000 speaker turns, mixing <h3> headings (siblings
+of the paragraphs) and <p><strong> headings (nested one level deeper),
+against the previous per-heading sibling walk.
+"""
+
+import argparse
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest.adapters.senato_html import SenatoHTMLAdapter
+
+
+def synthetic_resoconto(turns: int) -> str:
+    """Build a live report alternating h3 and p>strong speaker headings."""
+    speakers = ["PRESIDENTE", "MARIO ROSSI (PD-IDP)", "PRESIDENTE", "ANNA BIANCHI (FdI)"]
+    body = []
+    for i in range(turns):
+        speaker = speakers[i % len(speakers)]
+        if i % 2:
+            body.append(f"<p><strong>{speaker}</strong></p>")
+        else:
+            body.append(f"<h3>{speaker}</h3>")
+        body.append(f"<p>Intervento numero {i}. Signor Presidente, colleghi.</p>")
+        body.append(f"<p>Seconda parte dell'intervento {i}.</p>")
+    return (
+        "<html><head><title>Seduta del 15 gennaio 2025</title></head>"
+        f"<body><div class=\"content\">{''.join(body)}</div></body></html>"
+    )
+
+
+def legacy_blocks(soup: BeautifulSoup) -> List:
+    """Previous segmentation: sibling walk from every heading."""
+    speaker_headings = soup.find_all(['h2', 'h3', 'h4', 'strong'],
+                                     string=re.compile(r'^(PRESIDENTE|ZEDDA|relatore|[A-Z]+\s+[A-Z]+)', re.IGNORECASE))
+    blocks = []
+    for i, heading in enumerate(speaker_headings):
+        content_elements = []
+        current = heading.find_next_sibling()
+        while current and current != (speaker_headings[i + 1] if i + 1 < len(speaker_headings) else None):
+            if current.name in ['p', 'div'] and current.get_text(strip=True):
+                content_elements.append(current)
+            current = current.find_next_sibling()
+        if content_elements:
+            blocks.append({'heading': heading, 'content': content_elements})
+    return blocks
+
+
+def timed(func) -> float:
+    """Wall time in seconds of one call."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description="Benchmark Senato speaker segmentation")
+    parser.add_argument("--turns", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000],
+                        help="Speaker turns of the synthetic documents (default: 100 500 1000 2000 5000)")
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="Largest document also run through the legacy walk (default: 1000)")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    adapter = SenatoHTMLAdapter()
+    
+    print(f"{'turns':>6} {'blocks':>7} {'linear s':>9} {'legacy s':>9} {'legacy blocks':>14}")
+    for turns in args.turns:
+        soup = BeautifulSoup(synthetic_resoconto(turns), 'lxml')
+        
+        blocks = adapter._find_intervention_blocks(soup)
+        linear_s = timed(lambda: adapter._find_intervention_blocks(soup))
+        
+        if turns <= args.legacy_max:
+            legacy = legacy_blocks(soup)
+            legacy_s = timed(lambda: legacy_blocks(soup))
+            print(f"{turns:>6} {len(blocks):>7} {linear_s:>9.4f} {legacy_s:>9.4f} {len(legacy):>14}")
+        else:
+            print(f"{turns:>6} {len(blocks):>7} {linear_s:>9.4f} {'-':>9} {'-':>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+PP100 Intervention ID Migration
+
+One-time rewrite of the interventions Parquet files to the stable IDs
+(content_fingerprint of the text instead of the per-process hash()).
+Each daily file is compacted, its IDs recomputed from the stored rows and
+the rows that turn out to be the same speech merged. The old -> new map is
+written next to the files for caches keyed by the old IDs.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest.utils.ids import content_fingerprint, intervention_id
+from ingest.utils.io import compact_parquet_deltas, read_manifest, safe_write_parquet
+from ingest.utils.schema import INTERVENTIONS_SCHEMA
+
+
+def migrate_file(path: Path, dry_run: bool = False) -> Tuple[Dict[str, str], Optional[Dict]]:
+    """
+    Recompute the IDs of one daily file.
+    
+    Args:
+        path: Daily interventions file
+        dry_run: Compute the map without rewriting the file
+    
+    Returns:
+        Map of old ID -> new ID for the rows of the file, and the stats of
+        the rewritten file (None in dry-run mode)
+    """
+    if not dry_run:
+        compact_parquet_deltas(str(path), schema=INTERVENTIONS_SCHEMA)
+    df = pd.read_parquet(path)
+    if df.empty:
+        return {}, None
+    
+    new_ids = [
+        intervention_id(
+            source=row.source,
+            seduta=row.seduta,
+            ts_start=row.ts_start if pd.notna(row.ts_start) else "",
+            oratore=row.oratore,
+            text_hash=content_fingerprint(row.text)
+        )
+        for row in df[['source', 'seduta', 'ts_start', 'oratore', 'text']].itertuples(index=False)
+    ]
+    id_map = dict(zip(df['id'], new_ids))
+    
+    if not dry_run:
+        # Same speech fetched by different runs: first position, latest content (as in compaction)
+        df['id'] = new_ids
+        order = df['id'].drop_duplicates(keep="first")
+        latest = df.drop_duplicates(subset=['id'], keep="last").set_index('id')
+        migrated = latest.loc[order].reset_index()
+        stats = safe_write_parquet(migrated, str(path), schema=INTERVENTIONS_SCHEMA)
+        print(f"✅ {path.name}: {len(df)} rows -> {stats['record_count']} ({len(df) - stats['record_count']} merged)")
+        return id_map, stats
+    
+    print(f"🔍 {path.name}: {len(df)} rows -> {len(set(new_ids))} distinct IDs")
+    return id_map, None
+
+
+def update_manifest_entry(manifest_path: Path, filename: str, stats: Dict) -> None:
+    """Refresh checksum, record count and size of a rewritten file in the manifest."""
+    if not manifest_path.exists():
+        return
+    manifest = read_manifest(str(manifest_path))
+    entry = manifest.get("files", {}).get("interventions")
+    if not entry or entry.get("filename") != filename:
+        return
+    entry.update({"checksum": stats["checksum"], "record_count": stats["record_count"],
+                  "bytes": stats["bytes"], "deltas": []})
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    """Main migration function."""
+    parser = argparse.ArgumentParser(description="Rewrite interventions files with stable content-based IDs")
+    parser.add_argument("--data-dir", default="public/data", help="Directory of the interventions files (default: public/data)")
+    parser.add_argument("--map-file", default=None, help="Old -> new ID map (default: <data-dir>/id_migration.json)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute the map without rewriting files")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    data_dir = Path(args.data_dir)
+    files = sorted(p for p in data_dir.glob("interventions-*.parquet") if ".delta-" not in p.name)
+    if not files:
+        print(f"❌ No interventions files in {data_dir}")
+        sys.exit(1)
+    
+    id_map = {}
+    for path in files:
+        file_map, stats = migrate_file(path, args.dry_run)
+        id_map.update(file_map)
+        if stats:
+            update_manifest_entry(data_dir / "manifest.json", path.name, stats)
+    
+    changed = sum(1 for old, new in id_map.items() if old != new)
+    print(f"📈 {changed} of {len(id_map)} IDs changed in {len(files)} files")
+    if args.dry_run:
+        return
+    
+    map_file = Path(args.map_file) if args.map_file else data_dir / "id_migration.json"
+    with open(map_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "ids": id_map
+        }, f, indent=2, ensure_ascii=False)
+    print(f"✅ ID map written to {map_file}")
+
+
+if __name__ == "__main__":
+    main()
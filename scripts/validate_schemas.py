@@ -13,6 +13,13 @@ from pathlib import Path
 from typing import Dict, Any, List
 from jsonschema import validate, ValidationError
 from jsonschema.validators import validator_for
+import pyarrow.parquet as pq
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest.utils.schema import INTERVENTIONS_SCHEMA, conform_table
+from ingest.utils.text import span_coherence_mask
 
 
 def load_schema(schema_path: Path) -> Dict[str, Any]:
@@ -84,6 +91,29 @@ def validate_file(data_file: Path, schema: Dict[str, Any], schema_name: str) ->
         return False
 
 
+def validate_interventions_file(data_file: Path) -> bool:
+    """Check that the sentence spans of every intervention cover its text."""
+    print(f"🔍 Validating spans of {data_file.name}...")
+    
+    try:
+        # Files written before the Arrow schema are converted to its layout
+        table = conform_table(pq.read_table(data_file).to_pandas(), INTERVENTIONS_SCHEMA)
+        coherent = span_coherence_mask(table)
+    except Exception as e:
+        print(f"❌ Unexpected error validating {data_file.name}: {e}")
+        return False
+    
+    if coherent.all():
+        print(f"✅ {data_file.name} is valid ({table.num_rows} interventions)")
+        return True
+    
+    ids = table.column('id').to_pylist()
+    incoherent = [ids[i] for i in (~coherent).nonzero()[0]]
+    print(f"❌ Incoherent spans in {data_file.name}: {len(incoherent)} of {table.num_rows} interventions")
+    print(f"   IDs: {', '.join(str(i) for i in incoherent[:10])}{' ...' if len(incoherent) > 10 else ''}")
+    return False
+
+
 def get_schema_mapping() -> Dict[str, str]:
     """Define which schema to use for each data file type."""
     return {
@@ -141,6 +171,8 @@ def main():
                 validation_results.append((data_file.name, is_valid))
             else:
                 print(f"⚠️  No schema found for {data_file.name}, skipping validation")
+        elif data_file.is_file() and data_file.suffix == '.parquet' and data_file.name.startswith('interventions-'):
+            validation_results.append((data_file.name, validate_interventions_file(data_file)))
     
     # Summary
     print("\n📊 Validation Summary:")
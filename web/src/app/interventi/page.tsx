@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { ManifestData, getInterventionsInfo, formatDate, readParquetData } from '../utils/data'
+import { ManifestData, getInterventionsInfo, formatDate, readInterventions } from '../utils/data'
 
 export default function InterventiPage() {
   const [manifestData, setManifestData] = useState<ManifestData | null>(null)
@@ -33,7 +33,7 @@ export default function InterventiPage() {
                 // Se abbiamo un file Parquet, carica i dati
                 if (interventionsInfo?.source === 'parquet' && interventionsInfo.downloadUrl) {
                   try {
-                    const data = await readParquetData(interventionsInfo.downloadUrl, 20) // Primi 20 interventi
+                    const data = await readInterventions(manifest, 20) // Primi 20 interventi, delta compresi
                     setInterventionsData(data)
                   } catch (err) {
                     console.warn('Failed to load Parquet data:', err)
@@ -204,9 +204,9 @@ export default function InterventiPage() {
                   )}
                 </div>
                 
-                {intervention.spans_frasi && intervention.spans_frasi.length > 0 && (
+                {intervention.spans_start && intervention.spans_start.length > 0 && (
                   <div className="mt-2 text-xs text-gray-500">
-                    <span className="font-medium">Spans frasi:</span> {intervention.spans_frasi.length} segmenti
+                    <span className="font-medium">Spans frasi:</span> {intervention.spans_start.length} segmenti
                   </div>
                 )}
               </div>
@@ -132,8 +132,10 @@ export default function MetricsPage() {
 
   const renderSourceCard = (source: 'camera' | 'senato') => {
     const sourceInfo = manifestData?.sources?.[source]
+    const sourceStatus = manifestData?.source_status?.[source]
     const isError = sourceInfo === 'error'
     const isNoData = sourceInfo === 'no_data'
+    const isUnchanged = sourceStatus === 'unchanged'
     const isUnknown = !sourceInfo || sourceInfo === 'unknown'
     
     let statusText = 'Sconosciuto'
@@ -148,6 +150,10 @@ export default function MetricsPage() {
       statusText = 'Nessun dato'
       statusColor = 'text-yellow-600'
       icon = '⚠️'
+    } else if (isUnchanged) {
+      statusText = 'Invariato'
+      statusColor = 'text-green-600'
+      icon = '⏸️'
     } else if (sourceInfo && sourceInfo !== 'unknown') {
       statusText = 'Attivo'
       statusColor = 'text-green-600'
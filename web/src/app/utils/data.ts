@@ -4,15 +4,24 @@ export interface Intervention {
   id: string
   source: string
   seduta: string
-  ts_start: string
+  // Timestamp UTC: millisecondi da epoch nei file Parquet
+  ts_start: string | number
   oratore: string
   gruppo: string
   text: string
-  spans_frasi: Array<{ start: number; end: number }>
+  // Inizio e fine di ogni frase (spans_frasi[i] = {start: spans_start[i], end: spans_end[i]})
+  spans_start: ArrayLike<number>
+  spans_end: ArrayLike<number>
   source_url: string
   fetch_etag?: string
   fetch_last_modified?: string
-  ingested_at?: string
+  ingested_at?: string | number
+  // Identità del registro (null se l'oratore non è riconosciuto)
+  person_id?: string | null
+  party_id_at_ts?: string | null
+  group_id_aula_at_ts?: string | null
+  // Id della riga troncata da un poll della diretta che questa riga sostituisce
+  supersedes?: string | null
 }
 
 export interface Person {
@@ -45,6 +54,8 @@ export interface ManifestData {
       checksum: string
       record_count: number
       status: string
+      // Delta non ancora compattati nel file (solo interventions)
+      deltas?: string[]
     }
   }
   status: {
@@ -60,6 +71,11 @@ export interface ManifestData {
     camera: string
     senato: string
   }
+  // Stato delle fonti nell'ultimo run ('ok', 'unchanged', 'no_data', 'error')
+  source_status?: {
+    camera?: string
+    senato?: string
+  }
   registry: {
     persons: string
     person_xref: string
@@ -96,7 +112,7 @@ export function calculateNextUpdate(lastUpdate: string): { nextUpdate: string; t
 }
 
 // Funzione per formattare la data in italiano
-export function formatDate(dateString: string): string {
+export function formatDate(dateString: string | number): string {
   try {
     const date = new Date(dateString)
     return date.toLocaleString('it-IT', {
@@ -198,6 +214,40 @@ export async function readParquetData(url: string, limit: number = 50): Promise<
   }
 }
 
+// Funzione per unire le righe di un file giornaliero e dei suoi delta, come
+// read_daily_frame in ingest/utils/io.py: ogni id resta nella posizione della
+// prima comparsa con il contenuto dell'ultima, e un intervento troncato da un
+// poll della diretta sparisce quando una riga lo indica in supersedes
+export function mergeDailyRows(files: any[][]): any[] {
+  const superseded = new Set<string>()
+  for (const rows of files) {
+    for (const row of rows) {
+      if (row.supersedes) superseded.add(row.supersedes)
+    }
+  }
+  
+  // Map.set su un id esistente ne mantiene la posizione e aggiorna il contenuto
+  const merged = new Map<string, any>()
+  for (const rows of files) {
+    for (const row of rows) {
+      if (!superseded.has(row.id)) merged.set(row.id, row)
+    }
+  }
+  return Array.from(merged.values())
+}
+
+// Funzione per leggere gli interventi correnti, delta compresi
+export async function readInterventions(manifest: ManifestData, limit: number = Infinity): Promise<any[]> {
+  if (!manifest.current?.interventions) return []
+  
+  const filename = getFileName(manifest.current.interventions)
+  const deltas = manifest.files?.interventions?.deltas || []
+  const files = await Promise.all(
+    [filename, ...deltas].map(name => readParquetData(`/data/${name}`, Infinity))
+  )
+  return mergeDailyRows(files).slice(0, limit)
+}
+
 // Funzione per leggere dati JSONL
 export async function readJsonlData<T>(url: string): Promise<T[]> {
   try {
@@ -281,7 +331,11 @@ export async function getInterventionsInfo(manifest: ManifestData): Promise<{
   // Se è parquet, proviamo a leggerlo per ottenere il count
   if (filename.endsWith('.parquet')) {
     try {
-      const count = await countParquetRecords(`/data/${filename}`)
+      // Con delta non compattati il file da solo non basta
+      const deltas = manifest.files?.interventions?.deltas || []
+      const count = deltas.length > 0
+        ? (await readInterventions(manifest)).length
+        : await countParquetRecords(`/data/${filename}`)
       return {
         count,
         filename,